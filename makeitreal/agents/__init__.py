@@ -1,7 +1,24 @@
 """Agent implementations for MakeItReal."""
 
-from .base_agent import BaseAgent
-from .requirements_generator_agent import RequirementsGeneratorAgent
-from .requirements_review_agent import RequirementsReviewAgent
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .base_agent import BaseAgent
+    from .requirements_generator_agent import RequirementsGeneratorAgent
+    from .requirements_review_agent import RequirementsReviewAgent
 
 __all__ = ["BaseAgent", "RequirementsGeneratorAgent", "RequirementsReviewAgent"]
+
+# LangChain is imported on first access only
+_LAZY_ATTRIBUTES = {
+    "BaseAgent": ".base_agent",
+    "RequirementsGeneratorAgent": ".requirements_generator_agent",
+    "RequirementsReviewAgent": ".requirements_review_agent",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,21 +1,42 @@
 """Base agent class for all MakeItReal agents."""
 
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from typing import Any
 
-from makeitreal.state import Proposal
+from langchain_core.callbacks import UsageMetadataCallbackHandler
+from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.prompt_values import PromptValue
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel
+
+from makeitreal import config
+from makeitreal.cache import ResponseCache
+from makeitreal.llm import RETRYABLE_ERRORS, chat_clients
+from makeitreal.rate_limit import CHARS_PER_TOKEN, estimate_tokens
+from makeitreal.state import Proposal, WorkflowState
+from makeitreal.telemetry import Span, telemetry
 
 
 class BaseAgent(ABC):
     """Abstract agent base class for all agents in the MakeItReal system."""
 
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, cache: ResponseCache | None = None) -> None:
         """Initialize agent with a name.
 
         Args:
             name: Human-readable name for the agent
+            cache: Optional cache for structured LLM responses
         """
         self.name = name
+        self._cache = cache
+
+    @property
+    def model(self) -> str:
+        """The model this agent is routed to, see ``OPENAI_AGENT_MODELS``."""
+        return config.openai_settings.model_for(type(self))
 
     @abstractmethod
     async def process(self, idea: str, proposal: Proposal) -> dict[str, Any]:
@@ -29,6 +50,148 @@ class BaseAgent(ABC):
         """
         pass
 
+    @staticmethod
+    def _prompt_layout(
+        system_prompt: str, context_prompt: str, request_prompt: str, **partial_variables: str
+    ) -> ChatPromptTemplate:
+        """Build a prompt whose stable part forms a byte-identical prefix across requests.
+
+        Providers reuse the computation of a prompt prefix they have seen recently, so the
+        system prompt (rendered once here), then the context that is fixed within a stage
+        (idea, results of earlier stages) come first, and the parts changing with every
+        iteration (current items, change requests) last.
+
+        Args:
+            system_prompt: Instructions, formatted with ``partial_variables`` only
+            context_prompt: Template of the context that stays the same within a stage
+            request_prompt: Template of the changing part of the request
+            partial_variables: Variables fixed for the agent, e.g. ``kind``
+        """
+        return ChatPromptTemplate(
+            partial_variables=partial_variables,
+            messages=[
+                SystemMessage(system_prompt.format(**partial_variables)),
+                ("human", context_prompt),
+                ("human", request_prompt),
+            ],
+        )
+
+    @staticmethod
+    def _idea(state: WorkflowState) -> str:
+        """The idea's text, the state holds it as a message."""
+        idea = state.get("idea")
+        return idea.content if isinstance(idea, BaseMessage) else idea
+
+    async def _ainvoke_structured(
+        self,
+        prompt: ChatPromptTemplate,
+        llm: Runnable,
+        schema: type[BaseModel],
+        variables: dict[str, Any],
+        on_partial: Callable[[BaseModel], None] | None = None,
+        model: str | None = None,
+    ) -> BaseModel:
+        """Render the prompt and invoke the structured output LLM, consulting the cache.
+
+        Args:
+            prompt: Prompt template to render
+            llm: LLM runnable bound to the structured output ``schema``
+            schema: Pydantic model of the structured output
+            variables: Prompt variables
+            on_partial: Stream the response and call this with every partially parsed output
+            model: Model of ``llm`` if it is not the agent's own model
+
+        Returns:
+            The structured LLM output
+        """
+        prompt_value = await prompt.ainvoke(variables)
+        if self._cache is None:
+            return await self._arequest_llm(llm, prompt_value, on_partial)
+
+        key = ResponseCache.key(prompt_value.to_messages(), model or self.model, schema)
+        cached = self._cache.get(self.__class__.__name__, key)
+        if cached is not None:
+            with telemetry.span("llm", self.name, cache_hit=True):
+                return schema.model_validate_json(cached)
+
+        result = await self._arequest_llm(llm, prompt_value, on_partial)
+        self._cache.set(key, result.model_dump_json())
+        return result
+
+    async def _arequest_llm(
+        self,
+        llm: Runnable,
+        prompt_value: PromptValue,
+        on_partial: Callable[[BaseModel], None] | None,
+    ) -> Any:
+        if on_partial is None:
+            return await self._ainvoke_llm(llm, prompt_value)
+        try:
+            result = await self._astream_llm(llm, prompt_value, on_partial)
+        except RETRYABLE_ERRORS:
+            # Streams are not retried, fall back to the request with retry policy
+            return await self._ainvoke_llm(llm, prompt_value)
+        if result is None:
+            # Models without native streaming may not yield any parsed output
+            return await self._ainvoke_llm(llm, prompt_value)
+        return result
+
+    async def _ainvoke_llm(self, llm: Runnable, prompt_value: PromptValue) -> Any:
+        """Invoke the LLM within the shared concurrency and token rate limits."""
+        estimated_tokens = estimate_tokens(prompt_value.to_messages())
+        with telemetry.span("llm", self.name) as span:
+            usage = UsageMetadataCallbackHandler()
+            queued = time.perf_counter()
+            async with chat_clients.limit(estimated_tokens) as throttle:
+                span.queue_time = time.perf_counter() - queued
+                result = await llm.ainvoke(prompt_value, config={"callbacks": [usage, throttle]})
+            self._record_usage(span, usage, estimated_tokens, result)
+            return result
+
+    async def _astream_llm(
+        self, llm: Runnable, prompt_value: PromptValue, on_partial: Callable[[Any], None]
+    ) -> Any:
+        """Stream the LLM response within the shared limits, reporting each partial output."""
+        result = None
+        estimated_tokens = estimate_tokens(prompt_value.to_messages())
+        with telemetry.span("llm", self.name) as span:
+            usage = UsageMetadataCallbackHandler()
+            queued = time.perf_counter()
+            async with chat_clients.limit(estimated_tokens) as throttle:
+                span.queue_time = time.perf_counter() - queued
+                callbacks = [usage, throttle]
+                async for partial in llm.astream(prompt_value, config={"callbacks": callbacks}):
+                    result = partial
+                    on_partial(partial)
+            self._record_usage(span, usage, estimated_tokens, result)
+        return result
+
+    def _record_usage(
+        self,
+        span: Span,
+        usage: UsageMetadataCallbackHandler,
+        estimated_tokens: int,
+        result: Any,
+    ) -> None:
+        """Record the reported token usage on the span, or estimates if none was reported."""
+        if not telemetry.enabled:
+            return
+        for model, metadata in usage.usage_metadata.items():
+            span.record_usage(
+                model,
+                metadata.get("input_tokens", 0),
+                metadata.get("output_tokens", 0),
+                metadata.get("input_token_details", {}).get("cache_read", 0),
+            )
+        if not usage.usage_metadata:
+            output = result.model_dump_json() if isinstance(result, BaseModel) else str(result)
+            span.record_usage(
+                self.model,
+                estimated_tokens,
+                len(output) // CHARS_PER_TOKEN,
+                estimated=True,
+            )
+
     def __str__(self) -> str:
         """String representation of the agent."""
         return f"{self.__class__.__name__}(name='{self.name}')"
@@ -1,13 +1,18 @@
 """use-case/requirements generator agent."""
 
-from typing import Any
+from collections.abc import Callable
+from typing import Any, Literal
 
+from langchain_core.exceptions import OutputParserException
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
-from pydantic import BaseModel, Field
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel, Field, ValidationError
 
 from makeitreal.agents.base_agent import BaseAgent
-from makeitreal.config import openai_settings
+from makeitreal.cache import ResponseCache
+from makeitreal.config import review_settings
+from makeitreal.llm import chat_clients, pooled_runnable
+from makeitreal.rate_limit import CHARS_PER_TOKEN
 from makeitreal.state import Proposal, WorkflowState
 
 
@@ -17,42 +22,114 @@ class ProposalResult(BaseModel):
     items: list[str] = Field(..., description="Proposed items")
 
 
+class ItemOperation(BaseModel):
+    """A single change to a numbered item list."""
+
+    op: Literal["add", "remove", "modify"] = Field(..., description="Kind of change")
+    number: int | None = Field(None, description="Number of the existing item to remove or modify")
+    item: str | None = Field(None, description="Text of the added or modified item")
+
+
+class ProposalPatch(BaseModel):
+    """LLM-proposed changes to the current items."""
+
+    operations: list[ItemOperation] = Field(
+        ..., description="Changes to apply, unchanged items are not listed"
+    )
+
+    def apply(self, items: list[str]) -> list[str]:
+        """Apply the operations to the items.
+
+        Numbers refer to the items before the patch (1-based), added items are appended.
+
+        Raises:
+            ValueError: If an operation is incomplete, refers to a missing item or
+                an item is changed twice
+        """
+        patched: list[str | None] = list(items)
+        added = []
+        touched = set()
+        for operation in self.operations:
+            if operation.op == "add":
+                if not operation.item:
+                    raise ValueError("Added item has no text")
+                added.append(operation.item)
+                continue
+            if operation.number is None or not 1 <= operation.number <= len(items):
+                raise ValueError(f"Item {operation.number} does not exist")
+            if operation.number in touched:
+                raise ValueError(f"Item {operation.number} is changed twice")
+            touched.add(operation.number)
+            if operation.op == "remove":
+                patched[operation.number - 1] = None
+            elif not operation.item:
+                raise ValueError(f"Modified item {operation.number} has no text")
+            else:
+                patched[operation.number - 1] = operation.item
+
+        result = [item for item in patched if item is not None] + added
+        if not result:
+            raise ValueError("Patch removes all items")
+        return result
+
+
 class RequirementsGeneratorAgent(BaseAgent):
     """Agent responsible for generating items."""
 
-    def __init__(self, proposal_key="features", kind="use-cases") -> None:
+    def __init__(
+        self, proposal_key="features", kind="use-cases", cache: ResponseCache | None = None
+    ) -> None:
         """Initialize agent."""
-        super().__init__("RequirementsGeneratorAgent")
-        self._llm = ChatOpenAI(
-            model=openai_settings.openai_model,
-            api_key=openai_settings.openai_api_key,
-            base_url=openai_settings.openai_base_url,
-        ).with_structured_output(ProposalResult, method="function_calling")
+        super().__init__("RequirementsGeneratorAgent", cache)
         self._proposal_key = proposal_key
         self._prompt = self._build_prompt(kind)
-
-    def _build_prompt(self, kind: str) -> ChatPromptTemplate:
-        return ChatPromptTemplate(
-            partial_variables={
-                "kind": kind,
-            },
-            messages=[
-                ("system", self._build_system_prompt()),
-                ("human", self._build_human_prompt()),
-            ],
+        self._patch_prompt = self._build_prompt(kind, patch=True)
+        # Estimated output tokens saved by patching instead of regenerating proposals
+        self.saved_output_tokens = 0
+
+    @pooled_runnable
+    def _llm(self) -> Runnable:
+        return chat_clients.structured(ProposalResult, model=self.model)
+
+    @pooled_runnable
+    def _patch_llm(self) -> Runnable:
+        return chat_clients.structured(ProposalPatch, model=self.model)
+
+    def _build_prompt(self, kind: str, patch: bool = False) -> ChatPromptTemplate:
+        # Both prompts share the prefix, patches differ in the trailing instructions only
+        request_prompt = self._build_request_prompt()
+        if patch:
+            request_prompt += self._build_patch_instructions()
+        return self._prompt_layout(
+            self._build_system_prompt() + self._build_task_instructions(),
+            self._build_context_prompt(),
+            request_prompt,
+            kind=kind,
         )
 
-    def _build_human_prompt(self) -> str:
+    def _build_task_instructions(self) -> str:
+        return """
+Please list the {kind} of the user's idea!
+"""
+
+    def _build_patch_instructions(self) -> str:
+        return """
+                  Do not list all {kind} again, only return the operations needed to
+                  implement the changes: add new {kind}, remove {kind} by their number or
+                  modify {kind} by their number and new text.
+                  """
+
+    def _build_context_prompt(self) -> str:
         return """I have the following idea:
                   {idea}
+                  """
 
-                  Based on the idea, the following {kind} have been identified already:
+    def _build_request_prompt(self) -> str:
+        return """Based on the idea, the following {kind} have been identified already:
                   {items}
 
                   I want additional changes:
                   {change_request}
-
-                  Please list the {kind} of that idea!
                   """
 
     def _additional_variables(self, state: WorkflowState) -> dict[str, str]:
@@ -61,30 +138,114 @@ class RequirementsGeneratorAgent(BaseAgent):
     def _items2str(self, items: list[Proposal]) -> str:
         return "\n".join([f"{i + 1}. {x}" for i, x in enumerate(items)])
 
-    async def process(self, state: WorkflowState) -> dict[str, Any]:
+    async def process(
+        self, state: WorkflowState, on_item: Callable[[int, str], None] | None = None
+    ) -> dict[str, Any]:
         """Generates the use-cases into the proposal.
 
         Args:
             proposal: Proposal to generate
+            on_item: Stream the response and call this with the index and text of every
+                item as soon as it is complete. Items starting at index 0 again replace
+                the items reported before, e.g. after a failed stream was repeated
 
         Returns:
             Dictionary containing structured review results
         """
         proposal = state[self._proposal_key]
-        chain = self._prompt | self._llm
-        result = await chain.ainvoke(
+        result = await self._agenerate_items(
             {
                 "items": self._items2str(proposal.proposed_items),
-                "idea": state.get("idea"),
+                "idea": self._idea(state),
                 "change_request": proposal.change_request,
             }
-            | self._additional_variables(state)
+            | self._additional_variables(state),
+            on_item,
+            proposal,
         )
         print("generator results")
         print(result.model_dump())
 
         return result.model_dump()
 
+    async def _agenerate_items(
+        self,
+        variables: dict[str, Any],
+        on_item: Callable[[int, str], None] | None,
+        proposal: Proposal | None = None,
+    ) -> ProposalResult:
+        """Invoke the structured output LLM, reporting items while they are streamed.
+
+        A proposal with a change request is patched if possible, see ``_apatch_items``.
+        """
+        if (
+            proposal is not None
+            and proposal.proposed_items
+            and proposal.change_request
+            and review_settings.review_patch_regeneration
+        ):
+            result = await self._apatch_items(variables, proposal.proposed_items)
+            if result is not None:
+                for index, item in enumerate(result.items if on_item else []):
+                    on_item(index, item)
+                return result
+
+        if on_item is None:
+            return await self._ainvoke_structured(
+                self._prompt, self._llm, ProposalResult, variables
+            )
+
+        emitted: list[str] = []
+
+        def emit(items: list[str]) -> None:
+            for item in items[len(emitted) :]:
+                on_item(len(emitted), item)
+                emitted.append(item)
+
+        def on_partial(partial: ProposalResult) -> None:
+            # The last item of a partial output may still be incomplete
+            emit(partial.items[:-1])
+
+        result = await self._ainvoke_structured(
+            self._prompt, self._llm, ProposalResult, variables, on_partial
+        )
+        if result.items[: len(emitted)] != emitted:
+            # A failed stream was repeated, emit the new items from index 0 to replace them
+            emitted.clear()
+        emit(result.items)
+        return result
+
+    async def _apatch_items(
+        self, variables: dict[str, Any], items: list[str]
+    ) -> ProposalResult | None:
+        """Let the LLM change the items by add/remove/modify operations.
+
+        Returns:
+            The patched items, or None if the patch is invalid and the items need
+            to be regenerated
+        """
+        try:
+            patch = await self._ainvoke_structured(
+                self._patch_prompt, self._patch_llm, ProposalPatch, variables
+            )
+            if patch is None:
+                raise ValueError("No patch returned")
+            result = ProposalResult(items=patch.apply(items))
+        except (OutputParserException, ValidationError, ValueError) as e:
+            print(f"{self.name} patch rejected, regenerating all items: {e}")
+            return None
+
+        # Output tokens a full regeneration would have needed minus the patch's tokens
+        full_length = len(result.model_dump_json())
+        patch_length = len(patch.model_dump_json(exclude_none=True))
+        saved = max(full_length - patch_length, 0) // CHARS_PER_TOKEN
+        self.saved_output_tokens += saved
+        print(
+            f"{self.name} patched {len(items)} items with {len(patch.operations)} "
+            f"operation(s), saving ~{saved} output tokens"
+        )
+        return result
+
     def _build_system_prompt(self) -> str:
         """Build comprehensive evaluation prompt for the LLM."""
         return """
@@ -3,12 +3,16 @@
 from typing import Any
 
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
-from pydantic import BaseModel, Field
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel, Field, field_validator
 
+from makeitreal import config
 from makeitreal.agents.base_agent import BaseAgent
-from makeitreal.config import openai_settings
+from makeitreal.cache import ResponseCache
+from makeitreal.graph.review_policy import review_escalation_reason
+from makeitreal.llm import chat_clients, pooled_runnable
 from makeitreal.state import WorkflowState
+from makeitreal.telemetry import telemetry
 
 
 class ReviewResult(BaseModel):
@@ -18,50 +22,79 @@ class ReviewResult(BaseModel):
     approved: bool = Field(..., description="Set to true only when there are no changes needed")
 
 
+class RatedReviewResult(ReviewResult):
+    """The result of a review by a cheaper model, rated to decide on its escalation."""
+
+    confidence: float | None = Field(
+        None, description="How certain you are of the verdict, from 0 to 1"
+    )
+
+    @field_validator("confidence")
+    @classmethod
+    def _clamp_confidence(cls, value: float | None) -> float | None:
+        if value is None:
+            return None
+        # Models sometimes answer with a percentage
+        if value > 1:
+            value /= 100
+        return min(max(value, 0.0), 1.0)
+
+
 class RequirementsReviewAgent(BaseAgent):
     """Agent responsible for evaluating technical specifications for feasibility and risk."""
 
-    def __init__(self, proposal_key="features", kind="use-cases") -> None:
+    def __init__(
+        self, proposal_key="features", kind="use-cases", cache: ResponseCache | None = None
+    ) -> None:
         """Initialize agent."""
-        super().__init__("RequirementsReviewAgent")
-        self._llm = ChatOpenAI(
-            model=openai_settings.openai_model,
-            api_key=openai_settings.openai_api_key,
-            base_url=openai_settings.openai_base_url,
-        ).with_structured_output(ReviewResult, method="function_calling")
+        super().__init__("RequirementsReviewAgent", cache)
         self._proposal_key = proposal_key
         self._prompt = self._build_prompt(kind)
 
-    def _build_prompt(self, kind: str) -> ChatPromptTemplate:
-        return ChatPromptTemplate(
-            partial_variables={
-                "kind": kind,
-            },
-            messages=[
-                ("system", self._build_review_system_prompt()),
-                (
-                    "human",
-                    """I have the following idea:
-                 {idea}
+    @property
+    def _schema(self) -> type[ReviewResult]:
+        """Only reviews that may escalate to the default model ask for a confidence."""
+        if self.model == config.openai_settings.openai_model:
+            return ReviewResult
+        return RatedReviewResult
 
-                 Based on the idea, the following {kind} have been identified:
-                 {items}
+    @pooled_runnable
+    def _llm(self) -> Runnable:
+        return chat_clients.structured(self._schema, model=self.model)
 
-                 Please review the {kind} meticulously and ask yourself the following questions:
-                 * Are there any {kind} missing in the list that would be required
-                 to make the idea work? If so, they should be added.
-                 * Are there any {kind} in the list that are not strictly required
-                 for an MVP implementation? If so, they should be removed.
+    @pooled_runnable
+    def _escalation_llm(self) -> Runnable:
+        return chat_clients.structured(ReviewResult)
 
-                 Finally please propose changes, if necessary, or approve otherwise!
+    def _build_prompt(self, kind: str) -> ChatPromptTemplate:
+        return self._prompt_layout(
+            self._build_review_system_prompt() + self._build_review_instructions(),
+            """I have the following idea:
+                 {idea}
                  """,
-                ),
-            ],
+            """Based on the idea, the following {kind} have been identified:
+                 {items}
+                 """,
+            kind=kind,
         )
 
+    def _build_review_instructions(self) -> str:
+        return """
+Please review the {kind} meticulously and ask yourself the following questions:
+* Are there any {kind} missing in the list that would be required
+to make the idea work? If so, they should be added.
+* Are there any {kind} in the list that are not strictly required
+for an MVP implementation? If so, they should be removed.
+
+Finally please propose changes, if necessary, or approve otherwise!
+"""
+
     async def process(self, state: WorkflowState) -> dict[str, Any]:
         """Reviewes the suggested changes to the proposal.
 
+        If the agent is routed to a cheaper model than the default one, reviews with low
+        confidence or a changed verdict are repeated with the default model.
+
         Args:
             proposal: Proposal to review
 
@@ -69,15 +102,31 @@ class RequirementsReviewAgent(BaseAgent):
             Dictionary containing structured review results
         """
         proposal = state[self._proposal_key]
-        chain = self._prompt | self._llm
-        result = await chain.ainvoke(
-            {
-                "items": "\n".join(
-                    [f"{i + 1}. {x}" for i, x in enumerate(proposal.proposed_items)]
-                ),
-                "idea": state.get("idea"),
-            }
-        )
+        variables = {
+            "items": "\n".join([f"{i + 1}. {x}" for i, x in enumerate(proposal.proposed_items)]),
+            "idea": self._idea(state),
+        }
+        default_model = config.openai_settings.openai_model
+        if self.model == default_model:
+            result = await self._ainvoke_structured(
+                self._prompt, self._llm, ReviewResult, variables
+            )
+        else:
+            with telemetry.attributes(tier="primary"):
+                result = await self._ainvoke_structured(
+                    self._prompt, self._llm, RatedReviewResult, variables
+                )
+            reason = review_escalation_reason(proposal, result.approved, result.confidence)
+            if reason:
+                print(f"review escalated to {default_model}: {reason}")
+                with telemetry.attributes(tier="escalation"):
+                    result = await self._ainvoke_structured(
+                        self._prompt,
+                        self._escalation_llm,
+                        ReviewResult,
+                        variables,
+                        model=default_model,
+                    )
         print("review results")
         print(result.model_dump())
 
@@ -1,5 +1,6 @@
 """task list generator agent."""
 
+from makeitreal.cache import ResponseCache
 from makeitreal.state import WorkflowState
 
 from .requirements_generator_agent import RequirementsGeneratorAgent
@@ -8,11 +9,17 @@ from .requirements_generator_agent import RequirementsGeneratorAgent
 class TaskGeneratorAgent(RequirementsGeneratorAgent):
     """Agent responsible for generating the task list."""
 
-    def __init__(self) -> None:
+    def __init__(self, cache: ResponseCache | None = None) -> None:
         """Initialize agent."""
-        super().__init__(proposal_key="tasks", kind="tasks")
+        super().__init__(proposal_key="tasks", kind="tasks", cache=cache)
 
-    def _build_human_prompt(self) -> str:
+    def _build_task_instructions(self) -> str:
+        return """
+Please propose a list of tasks to cover all the mentioned features,
+taking the given tech stack into account!
+"""
+
+    def _build_context_prompt(self) -> str:
         return """I have the following idea:
                   {idea}
 
@@ -21,15 +28,14 @@ class TaskGeneratorAgent(RequirementsGeneratorAgent):
 
                   The project should be implemented using the following tech stack:
                   {tech_stack}
+                  """
 
-                  Based on the idea, use-cases and tech stack, the following tasks were derived:
+    def _build_request_prompt(self) -> str:
+        return """Based on the idea, use-cases and tech stack, the following tasks were derived:
                   {items}
 
                   I want to change the task list as follows:
                   {change_request}
-
-                  Please propose a list of tasks to cover all the mentioned features,
-                  taking the given tech stack into account!
                   """
 
     def _additional_variables(self, state: WorkflowState) -> dict[str, str]:
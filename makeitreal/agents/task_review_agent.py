@@ -1,11 +1,13 @@
 """task list review agent."""
 
+from makeitreal.cache import ResponseCache
+
 from .requirements_review_agent import RequirementsReviewAgent
 
 
 class TaskReviewAgent(RequirementsReviewAgent):
     """Agent responsible for reviewing the task list."""
 
-    def __init__(self) -> None:
+    def __init__(self, cache: ResponseCache | None = None) -> None:
         """Initialize agent."""
-        super().__init__(proposal_key="tasks", kind="tasks")
+        super().__init__(proposal_key="tasks", kind="tasks", cache=cache)
@@ -1,22 +1,30 @@
 """tech stack generator agent."""
 
+import asyncio
+import time
+from collections.abc import Callable
 from typing import Any
 
-from langchain_openai import ChatOpenAI
-from langgraph.prebuilt import ToolNode
+from langchain_core.messages import ToolCall, ToolMessage
+from langchain_core.runnables import Runnable
 
-from makeitreal.agents.requirements_generator_agent import RequirementsGeneratorAgent
-from makeitreal.config import openai_settings
+from makeitreal.agents.requirements_generator_agent import (
+    RequirementsGeneratorAgent,
+)
+from makeitreal.cache import ResponseCache
+from makeitreal.config import tool_settings
+from makeitreal.llm import chat_clients, pooled_runnable
 from makeitreal.state import WorkflowState
+from makeitreal.telemetry import telemetry
 from makeitreal.tools import search_library_docs, search_suitable_techstack
 
 
 class TechStackGeneratorAgent(RequirementsGeneratorAgent):
     """Agent responsible for generating tech stack."""
 
-    def __init__(self) -> None:
+    def __init__(self, cache: ResponseCache | None = None) -> None:
         """Initialize agent."""
-        super().__init__(proposal_key="tech_stack", kind="tech stack items")
+        super().__init__(proposal_key="tech_stack", kind="tech stack items", cache=cache)
         self.name = "TechStackGeneratorAgent"
 
         # Initialize tools
@@ -24,45 +32,54 @@ class TechStackGeneratorAgent(RequirementsGeneratorAgent):
             search_suitable_techstack,
             search_library_docs,
         ]
-        self.tool_node = ToolNode(self.tools)
+        self._tools_by_name = {t.name: t for t in self.tools}
 
-        # Create a separate LLM instance for tool calling (without structured output)
-        self._llm_with_tools = ChatOpenAI(
-            model=openai_settings.openai_model,
-            api_key=openai_settings.openai_api_key,
-            base_url=openai_settings.openai_base_url,
-        ).bind_tools(self.tools)
+    @pooled_runnable
+    def _llm_with_tools(self) -> Runnable:
+        # Tool calling LLM (without structured output) sharing the pooled client
+        return chat_clients.with_tools(self.tools, model=self.model)
 
-    def _build_human_prompt(self) -> str:
+    def _build_task_instructions(self) -> str:
+        return """
+Please propose a tech stack that suits the idea and use-cases well!
+"""
+
+    def _build_context_prompt(self) -> str:
         return """I have the following idea:
                   {idea}
 
                   The idea includes the following use-cases:
                   {features}
+                  """
 
-                  Based on the idea and use-cases,
+    def _build_request_prompt(self) -> str:
+        # Research results come last, the tool decision request is the prefix of the final one
+        return """Based on the idea and use-cases,
                   the following tech stack has been identified already:
                   {items}
 
                   I want to change the tech stack as follows:
                   {change_request}
+                  {research}"""
 
-                  Please propose a tech stack that suits the idea and use-cases well!
-                  """
-
-    async def process(self, state: WorkflowState) -> dict[str, Any]:
+    async def process(
+        self, state: WorkflowState, on_item: Callable[[int, str], None] | None = None
+    ) -> dict[str, Any]:
         """Generates the tech stack items into the proposal´"""
         features = state.get("features")
         tech_stack = state.get("tech_stack")
         input_data = {
             "items": self._items2str(tech_stack.proposed_items),
-            "idea": state.get("idea"),
+            "idea": self._idea(state),
             "change_request": tech_stack.change_request,
             "features": self._items2str(features.proposed_items),
+            "research": "",
         }
 
         # Decide whether to use tools
-        tool_response = await (self._prompt | self._llm_with_tools).ainvoke(input_data)
+        tool_response = await self._ainvoke_llm(
+            self._llm_with_tools, await self._prompt.ainvoke(input_data)
+        )
 
         # Prepare context for final structured output
         tool_context = ""
@@ -71,29 +88,58 @@ class TechStackGeneratorAgent(RequirementsGeneratorAgent):
         if hasattr(tool_response, "tool_calls") and tool_response.tool_calls:
             print(f"TechStackAgent calling {len(tool_response.tool_calls)} tool(s)")
 
-            # Process each tool call
-            tool_results = []
-            for tool_call in tool_response.tool_calls:
-                print(f"TechStackAgent → {tool_call['name']}")
-                tool_result = await self.tool_node.ainvoke({"messages": [tool_response]})
-                tool_results.append(tool_result)
+            started = time.perf_counter()
+            tool_results = await self._run_tool_calls(tool_response.tool_calls)
+            print(
+                f"TechStackAgent ran {len(tool_results)} tool call(s) "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
 
             # Create context from tool results for structured output
-            tool_context = (
-                "\n\nTool Research Results:\n"
-                f"{chr(10).join([str(result) for result in tool_results])}"
+            tool_context = "\n\nTool Research Results:\n" + "\n".join(
+                f"{result.name}: {result.content}" for result in tool_results
             )
 
-        # Update the input with tool context if available
-        final_input = input_data.copy()
-        if tool_context:
-            final_input["idea"] = final_input["idea"].content + tool_context
-
-        # Use structured output LLM for final result
-        result = await (self._prompt | self._llm).ainvoke(final_input)
+        # Use structured output LLM for final result, with the tool context if available
+        result = await self._agenerate_items(
+            input_data | {"research": tool_context}, on_item, tech_stack
+        )
 
         return result.model_dump()
 
+    async def _run_tool_calls(self, tool_calls: list[ToolCall]) -> list[ToolMessage]:
+        """Execute each tool call exactly once, running independent calls concurrently.
+
+        Concurrency and per-call timeout are limited by ``tool_settings``. Failing or
+        timed out calls are reported back to the LLM instead of failing the agent.
+        """
+        semaphore = asyncio.Semaphore(tool_settings.tool_max_concurrency)
+
+        async def run(tool_call: ToolCall) -> ToolMessage:
+            name = tool_call["name"]
+            queued = time.perf_counter()
+            with telemetry.span("tool", name) as span:
+                async with semaphore:
+                    started = time.perf_counter()
+                    span.queue_time = started - queued
+                    try:
+                        if name not in self._tools_by_name:
+                            raise ValueError(f"unknown tool '{name}'")
+                        output = await asyncio.wait_for(
+                            self._tools_by_name[name].ainvoke(tool_call["args"]),
+                            timeout=tool_settings.tool_timeout,
+                        )
+                    except TimeoutError as e:
+                        span.error = type(e).__name__
+                        output = f"Tool {name} timed out after {tool_settings.tool_timeout}s"
+                    except Exception as e:
+                        span.error = type(e).__name__
+                        output = f"Tool {name} failed: {e}"
+                    print(f"TechStackAgent → {name} ({time.perf_counter() - started:.2f}s)")
+            return ToolMessage(content=str(output), name=name, tool_call_id=tool_call["id"])
+
+        return await asyncio.gather(*(run(tool_call) for tool_call in tool_calls))
+
     def _build_system_prompt(self) -> str:
         """Build comprehensive evaluation prompt for the LLM."""
         return """
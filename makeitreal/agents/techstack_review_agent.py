@@ -1,11 +1,12 @@
 """tech stack review agent."""
 
 from makeitreal.agents.requirements_review_agent import RequirementsReviewAgent
+from makeitreal.cache import ResponseCache
 
 
 class TechStackReviewAgent(RequirementsReviewAgent):
     """Agent responsible for reviewing the tech stack."""
 
-    def __init__(self) -> None:
+    def __init__(self, cache: ResponseCache | None = None) -> None:
         """Initialize agent."""
-        super().__init__(proposal_key="tech_stack", kind="tech stack items")
+        super().__init__(proposal_key="tech_stack", kind="tech stack items", cache=cache)
@@ -0,0 +1,118 @@
+"""Batch processing of many ideas concurrently on one event loop."""
+
+import asyncio
+import json
+import os
+import re
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from makeitreal.rate_limit import Priority, request_priority
+
+if TYPE_CHECKING:
+    from makeitreal.graph import IdeationWorkflow
+
+# "auto" approves every human review, "queue" stops the idea at its first human review
+REVIEW_MODES = ("auto", "queue")
+PROPOSAL_KEYS = ("features", "tech_stack", "tasks")
+
+
+@dataclass
+class BatchItem:
+    """A single idea of a batch and the thread it is processed in."""
+
+    thread_id: str
+    idea: str
+
+
+def read_ideas(lines: Iterable[str]) -> list[BatchItem]:
+    """Parse JSONL ideas.
+
+    Each line is either a JSON string or an object with an ``idea`` and an optional
+    ``id`` used as thread id.
+
+    Raises:
+        ValueError: If a line holds no idea
+    """
+    items = []
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if isinstance(record, str):
+            record = {"idea": record}
+        if not isinstance(record, dict) or not record.get("idea"):
+            raise ValueError(f"Line {number} holds no idea")
+        items.append(
+            BatchItem(thread_id=str(record.get("id") or uuid.uuid4()), idea=record["idea"])
+        )
+    return items
+
+
+async def run_batch(
+    workflow: "IdeationWorkflow",
+    items: list[BatchItem],
+    output_dir: str,
+    concurrency: int = 4,
+    review: str = "auto",
+) -> list[dict[str, Any]]:
+    """Run the workflow for all ideas concurrently and write one result file per idea.
+
+    Args:
+        workflow: Initialized workflow shared by all ideas
+        items: Ideas to process
+        output_dir: Directory receiving a ``<thread_id>.json`` result file per idea
+        concurrency: Maximum number of ideas processed at the same time
+        review: One of ``REVIEW_MODES``
+
+    Returns:
+        The results in the order of the items
+    """
+    if review not in REVIEW_MODES:
+        raise ValueError(f"Unknown review mode '{review}', expected one of {REVIEW_MODES}")
+    os.makedirs(output_dir, exist_ok=True)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(item: BatchItem) -> dict[str, Any]:
+        # Interactive requests sharing this process's rate limiter go ahead of batch ideas
+        async with semaphore:
+            try:
+                with request_priority(Priority.BATCH):
+                    result = await _process_idea(workflow, item, review)
+            except Exception as e:
+                result = {"thread_id": item.thread_id, "idea": item.idea, "status": "failed"}
+                result["error"] = str(e)
+
+        filename = re.sub(r"[^\w.-]", "_", item.thread_id) + ".json"
+        with open(os.path.join(output_dir, filename), "w") as f:
+            json.dump(result, f, indent=2)
+        return result
+
+    return await asyncio.gather(*(run(item) for item in items))
+
+
+async def _process_idea(
+    workflow: "IdeationWorkflow", item: BatchItem, review: str
+) -> dict[str, Any]:
+    from langgraph.types import Command
+
+    state = await workflow.run(item.idea, item.thread_id)
+
+    while state.get("__interrupt__"):
+        if review == "queue":
+            return _result(item, state, "pending_review") | {
+                "pending_review": state["__interrupt__"][0].value["key"]
+            }
+        state = await workflow.invoke(Command(resume=""), item.thread_id)
+
+    return _result(item, state, "completed")
+
+
+def _result(item: BatchItem, state: dict[str, Any], status: str) -> dict[str, Any]:
+    return {
+        "thread_id": item.thread_id,
+        "idea": item.idea,
+        "status": status,
+    } | {key: state[key].proposed_items for key in PROPOSAL_KEYS if key in state}
@@ -0,0 +1 @@
+"""Offline, deterministic benchmarks of the workflow with scripted LLMs and tools."""
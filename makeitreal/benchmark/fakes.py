@@ -0,0 +1,171 @@
+"""Local stand-ins for the chat model, the web search tool and the Context7 MCP server."""
+
+import asyncio
+import json
+import socket
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from aiohttp import web
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable
+from langchain_core.tools import BaseTool, tool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel
+
+from makeitreal import config
+from makeitreal.rate_limit import CHARS_PER_TOKEN, estimate_tokens
+
+# Answers the rendered prompt text and the names of the bound tools with a structured
+# output, a list of tool calls or a text
+Responder = Callable[[str, list[str]], BaseModel | list[dict[str, Any]] | str]
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model answering from a script after a fixed latency, without any API calls.
+
+    Structured outputs are returned as tool calls, so the model works with
+    ``with_structured_output(method="function_calling")`` like the OpenAI client.
+    Token usage is estimated from the prompt and answer lengths and reported like the API.
+    """
+
+    respond: Responder
+    latency: float = 0.0
+    model_name: str | None = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> Runnable:
+        kwargs.pop("tool_choice", None)
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return self._answer(messages, kwargs.get("tools", []))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._answer(messages, kwargs.get("tools", []))
+
+    def _answer(self, messages: list[BaseMessage], tools: list[dict[str, Any]]) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        answer = self.respond(prompt, [t["function"]["name"] for t in tools])
+        if isinstance(answer, BaseModel):
+            tool_call = {"name": type(answer).__name__, "args": answer.model_dump(), "id": "call_0"}
+            message = AIMessage(content="", tool_calls=[tool_call])
+        elif isinstance(answer, list):
+            message = AIMessage(content="", tool_calls=answer)
+        else:
+            message = AIMessage(content=answer)
+
+        output = json.dumps(message.tool_calls) if message.tool_calls else str(answer)
+        input_tokens = estimate_tokens(messages)
+        output_tokens = len(output) // CHARS_PER_TOKEN
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+        message.response_metadata = {
+            "model_name": self.model_name or config.openai_settings.openai_model
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def stub_web_search(latency: float = 0.0, result_size: int = 2000) -> BaseTool:
+    """``search_suitable_techstack`` stand-in answering with a fixed text after a latency."""
+
+    @tool("search_suitable_techstack")
+    async def search_suitable_techstack(query: str) -> str:
+        """Search for relevant technologies for a suitable tech stack
+        to implement the defined features.
+
+        Args:
+            query: Search query for techstack research
+
+        Returns:
+            Formatted techstack research results
+        """
+        await asyncio.sleep(latency)
+        return f"Techstack research for {query}:\n" + ("x" * result_size)
+
+    return search_suitable_techstack
+
+
+class FakeMCPServer:
+    """Local Context7 MCP server answering tool calls with server-sent events.
+
+    ``resolve-library-id`` resolves every name to ``/benchmark/<name>`` and
+    ``get-library-docs`` returns a fixed-size text, each after ``latency`` seconds.
+    """
+
+    def __init__(self, latency: float = 0.0, docs_size: int = 4000) -> None:
+        """Initialize the server, ``start`` serves it on a free local port."""
+        self.latency = latency
+        self.docs_size = docs_size
+        self.requests = 0
+        self.url: str | None = None
+        self._runner: web.AppRunner | None = None
+
+    async def __aenter__(self) -> "FakeMCPServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        """Serve on a free port of the loopback interface."""
+        app = web.Application()
+        app.router.add_post("/mcp", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        await web.SockSite(self._runner, sock).start()
+        self.url = f"http://127.0.0.1:{sock.getsockname()[1]}/mcp"
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        rpc = await request.json()
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        name, arguments = rpc["params"]["name"], rpc["params"]["arguments"]
+        if name == "resolve-library-id":
+            library_id = "/benchmark/" + arguments["libraryName"].lower().replace(" ", "-")
+            text = f"- Context7-compatible library ID: {library_id}"
+        else:
+            text = f"Documentation of {arguments['context7CompatibleLibraryID']}\n"
+            text += "d" * self.docs_size
+        result = {"jsonrpc": "2.0", "id": rpc["id"], "result": {"content": [{"text": text}]}}
+        return web.Response(
+            text=f"event: message\ndata: {json.dumps(result)}\n\n", content_type="text/event-stream"
+        )
+
+
+def tool_calls(calls: int, libraries: Sequence[str] = ("fastapi", "react")) -> list[dict[str, Any]]:
+    """Alternating web search and documentation lookup tool calls."""
+    return [
+        {
+            "name": "search_library_docs",
+            "args": {"library_name": libraries[i // 2 % len(libraries)]},
+            "id": f"call_{i}",
+        }
+        if i % 2
+        else {
+            "name": "search_suitable_techstack",
+            "args": {"query": f"stack {i}"},
+            "id": f"call_{i}",
+        }
+        for i in range(calls)
+    ]
@@ -0,0 +1,371 @@
+"""Scripted multi-iteration workflow runs measuring throughput, overhead and footprint."""
+
+import asyncio
+import contextlib
+import json
+import os
+import re
+import subprocess  # nosec B404 - only used to read the current git commit
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from langchain_core.runnables import Runnable
+from langgraph.types import Command
+from pydantic import BaseModel
+
+from makeitreal.agents.requirements_generator_agent import ProposalPatch, ProposalResult
+from makeitreal.agents.requirements_review_agent import ReviewResult
+from makeitreal.agents.techstack_generator_agent import TechStackGeneratorAgent
+from makeitreal.benchmark.fakes import FakeMCPServer, ScriptedChatModel, stub_web_search, tool_calls
+from makeitreal.checkpoint import open_checkpointer
+from makeitreal.config import cache_settings, tool_settings
+from makeitreal.graph.workflow import AgentFactory, IdeationWorkflow, create_agents
+from makeitreal.llm import chat_clients
+from makeitreal.state_store import StateStore
+from makeitreal.telemetry import Span, telemetry
+
+IDEA = "task management app for developers"
+# Change requests of the scripted review agents and humans
+REVIEW_FINDING = "Address the open review finding"
+HUMAN_FINDING = "Address the human change request"
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A scripted workflow run, repeated by the benchmark.
+
+    Every stage's generator proposes ``items`` items. The review agent rejects each
+    proposal ``agent_rejections`` times and the human ``human_rejections`` times per
+    stage; every rejection is answered with a patch adding one item.
+    """
+
+    name: str
+    description: str
+    items: int = 5
+    agent_rejections: int = 0
+    human_rejections: int = 0
+    # Tool calls of every tech stack proposal, alternating web search and docs lookup
+    tool_calls: int = 0
+    # Seconds per LLM response and tool call, 0 measures the workflow's own overhead
+    latency: float = 0.0
+    tool_latency: float = 0.0
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("single-pass", "Every proposal is approved at once"),
+        Scenario(
+            "review-loop",
+            "Two agent and one human rejection per stage, answered with patches",
+            agent_rejections=2,
+            human_rejections=1,
+            tool_calls=2,
+        ),
+        Scenario("tool-heavy", "Six tool calls per tech stack proposal", tool_calls=6),
+    )
+}
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements of a scenario's runs."""
+
+    scenario: Scenario
+    runs: int
+    concurrency: int
+    wall_time: float
+    run_times: list[float]
+    llm_requests: int
+    prompt_tokens: int
+    completion_tokens: int
+    tool_calls: int
+    mcp_requests: int
+    checkpoints: int
+    checkpoint_bytes: int
+    # Mean and max seconds per node name
+    nodes: dict[str, dict[str, float]] = field(default_factory=dict)
+    # Peak bytes allocated by Python objects, None if not measured
+    peak_memory: int | None = None
+
+    @property
+    def throughput(self) -> float:
+        """Completed runs per second."""
+        return self.runs / self.wall_time if self.wall_time else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Run time below which ``percent`` percent of the runs completed."""
+        ordered = sorted(self.run_times)
+        return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+    def metrics(self) -> dict[str, Any]:
+        """Flat metrics of the result, as recorded in the history."""
+        return {
+            "throughput": self.throughput,
+            "wall_time": self.wall_time,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "llm_requests": self.llm_requests,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "tool_calls": self.tool_calls,
+            "mcp_requests": self.mcp_requests,
+            "checkpoints": self.checkpoints,
+            "checkpoint_bytes": self.checkpoint_bytes,
+            "peak_memory": self.peak_memory,
+            "nodes": self.nodes,
+        }
+
+
+async def run_scenario(
+    scenario: Scenario, runs: int = 10, concurrency: int = 4, measure_memory: bool = True
+) -> BenchmarkResult:
+    """Run the scenario for ``runs`` ideas, ``concurrency`` of them at a time.
+
+    Every benchmark uses fresh temporary checkpoint, state and cache locations. With
+    ``measure_memory`` the runs are repeated with ``tracemalloc`` to measure the peak
+    memory, so tracing does not distort the timings.
+    """
+    result = await _run(scenario, runs, concurrency)
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            await _run(scenario, runs, concurrency)
+            result.peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+async def _run(scenario: Scenario, runs: int, concurrency: int) -> BenchmarkResult:
+    enabled, trace_path = telemetry.enabled, telemetry.trace_path
+    telemetry.configure(True, trace_path)
+    first_span = len(telemetry.spans)
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            async with FakeMCPServer(latency=scenario.tool_latency) as mcp_server:
+                # The agents and nodes print their progress, which is not wanted here
+                with (
+                    _offline_settings(mcp_server.url),
+                    open(os.devnull, "w") as devnull,
+                    contextlib.redirect_stdout(devnull),
+                ):
+                    result = await _run_workflow(scenario, runs, concurrency, workdir)
+                result.mcp_requests = mcp_server.requests
+    finally:
+        await chat_clients.aclose()
+        telemetry.configure(enabled, trace_path)
+    _add_telemetry(result, telemetry.spans[first_span:])
+    del telemetry.spans[first_span:]
+    return result
+
+
+async def _run_workflow(
+    scenario: Scenario, runs: int, concurrency: int, workdir: str
+) -> BenchmarkResult:
+    async with open_checkpointer("sqlite", os.path.join(workdir, "checkpoints.sqlite")) as saver:
+        workflow = IdeationWorkflow(
+            use_cache=False, checkpointer=saver, agent_factory=scripted_agents(scenario)
+        )
+        workflow.state_store = StateStore(os.path.join(workdir, "threads"))
+        await workflow.ainit()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(number: int) -> float:
+            async with semaphore:
+                started = time.perf_counter()
+                await _run_idea(workflow, scenario, f"benchmark-{number}")
+                return time.perf_counter() - started
+
+        try:
+            started = time.perf_counter()
+            run_times = await asyncio.gather(*(run(number) for number in range(runs)))
+            wall_time = time.perf_counter() - started
+        finally:
+            await workflow.aclose()
+
+        # Measured before the checkpointer is compacted on exit
+        checkpoints, checkpoint_bytes = await _checkpoint_size(saver)
+
+    return BenchmarkResult(
+        scenario=scenario,
+        runs=runs,
+        concurrency=concurrency,
+        wall_time=wall_time,
+        run_times=list(run_times),
+        llm_requests=0,
+        prompt_tokens=0,
+        completion_tokens=0,
+        tool_calls=0,
+        mcp_requests=0,
+        checkpoints=checkpoints,
+        checkpoint_bytes=checkpoint_bytes,
+    )
+
+
+async def _run_idea(workflow: IdeationWorkflow, scenario: Scenario, thread_id: str) -> None:
+    """Run an idea to completion, answering the human reviews as scripted."""
+    state = await workflow.run(IDEA, thread_id)
+    while state.get("__interrupt__"):
+        value = state["__interrupt__"][0].value
+        marker = _marker(value["key"], "human")
+        human_fixes = sum(marker in item for item in value["proposal"].proposed_items)
+        change_request = HUMAN_FINDING if human_fixes < scenario.human_rejections else ""
+        state = await workflow.invoke(Command(resume=change_request), thread_id)
+
+
+def scripted_agents(scenario: Scenario) -> AgentFactory:
+    """Agent factory creating the regular agents with scripted models and stub tools.
+
+    Only the models and the web search are replaced, so prompt rendering, output
+    parsing, patching, rate limiting and the Context7 client run as in production.
+    """
+    web_search = stub_web_search(scenario.tool_latency)
+
+    def create(key: str, cache) -> tuple:
+        generator, reviewer = create_agents(key, cache)
+        generator._llm = _structured(
+            scenario, ProposalResult, lambda prompt: _propose(scenario, key)
+        )
+        generator._patch_llm = _structured(
+            scenario, ProposalPatch, lambda prompt: _patch(key, prompt)
+        )
+        schema = reviewer._schema
+        reviewer._llm = _structured(
+            scenario, schema, lambda prompt: _review(scenario, key, prompt, schema)
+        )
+        # Reviews routed to a cheaper model escalate to the same script
+        reviewer._escalation_llm = reviewer._llm
+        if isinstance(generator, TechStackGeneratorAgent):
+            generator._tools_by_name[web_search.name] = web_search
+            generator._llm_with_tools = ScriptedChatModel(
+                respond=lambda prompt, tools: tool_calls(scenario.tool_calls) or "No research",
+                latency=scenario.latency,
+            ).bind_tools(generator.tools)
+        return generator, reviewer
+
+    return create
+
+
+def _structured(scenario: Scenario, schema: type[BaseModel], respond) -> Runnable:
+    model = ScriptedChatModel(
+        respond=lambda prompt, tools: respond(prompt), latency=scenario.latency
+    )
+    return model.with_structured_output(schema, method="function_calling")
+
+
+def _marker(key: str, kind: str) -> str:
+    return f"[{key} {kind}-fix]"
+
+
+def _propose(scenario: Scenario, key: str) -> ProposalResult:
+    return ProposalResult(items=[f"{key} item {number + 1}" for number in range(scenario.items)])
+
+
+def _patch(key: str, prompt: str) -> ProposalPatch:
+    kind = "human" if HUMAN_FINDING in prompt else "review"
+    # Numbered, as duplicate items would not change the proposal
+    item = f"{_marker(key, kind)} Addressed change request {prompt.count(f'[{key} ') + 1}"
+    return ProposalPatch(operations=[{"op": "add", "item": item}])
+
+
+def _review(scenario: Scenario, key: str, prompt: str, schema: type[ReviewResult]) -> ReviewResult:
+    # Count the review fixes since the latest human change request
+    fixes = re.findall(rf"\[{re.escape(key)} (review|human)-fix\]", prompt)
+    since_human = fixes[len(fixes) - fixes[::-1].index("human") :] if "human" in fixes else fixes
+    # The confidence is ignored by reviews on the default model
+    if len(since_human) < scenario.agent_rejections:
+        # Numbered, as repeated change requests end the review loop
+        return schema(
+            changes=f"{REVIEW_FINDING} {len(since_human) + 1}", approved=False, confidence=1.0
+        )
+    return schema(changes="", approved=True, confidence=1.0)
+
+
+@contextlib.contextmanager
+def _offline_settings(mcp_url: str) -> Iterator[None]:
+    """Point the Context7 client to the fake server and bypass the tool caches."""
+    saved = tool_settings.context7_mcp_url, cache_settings.cache_enabled
+    tool_settings.context7_mcp_url, cache_settings.cache_enabled = mcp_url, False
+    try:
+        yield
+    finally:
+        tool_settings.context7_mcp_url, cache_settings.cache_enabled = saved
+
+
+async def _checkpoint_size(saver) -> tuple[int, int]:
+    """Number of checkpoints and bytes of the serialized checkpoints and pending writes."""
+    async with saver.lock:
+        async with saver.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(checkpoint) + LENGTH(metadata)), 0) "
+            "FROM checkpoints"
+        ) as cur:
+            checkpoints, size = await cur.fetchone()
+        async with saver.conn.execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM writes") as cur:
+            (writes,) = await cur.fetchone()
+    return checkpoints, size + writes
+
+
+def _add_telemetry(result: BenchmarkResult, spans: list[Span]) -> None:
+    durations: dict[str, list[float]] = defaultdict(list)
+    for span in spans:
+        if span.kind == "llm":
+            result.llm_requests += 1
+            result.prompt_tokens += span.prompt_tokens
+            result.completion_tokens += span.completion_tokens
+        elif span.kind == "tool":
+            result.tool_calls += 1
+        else:
+            durations[span.name].append(span.duration)
+    result.nodes = {
+        name: {"count": len(values), "mean": sum(values) / len(values), "max": max(values)}
+        for name, values in durations.items()
+    }
+
+
+def record_result(result: BenchmarkResult, path: str) -> dict[str, Any] | None:
+    """Append the result to the JSONL history of benchmark results.
+
+    Args:
+        result: The measured result
+        path: History file, created if missing
+
+    Returns:
+        The latest earlier record of the same scenario, runs and concurrency, if any
+    """
+    record = {
+        "created_at": time.time(),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "scenario": asdict(result.scenario),
+        "runs": result.runs,
+        "concurrency": result.concurrency,
+        "metrics": result.metrics(),
+    }
+    previous = None
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                earlier = json.loads(line) if line.strip() else {}
+                if all(earlier.get(k) == record[k] for k in ("scenario", "runs", "concurrency")):
+                    previous = earlier
+    elif os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+    return previous
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(  # nosec B603,B607 - trusted dev command
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,211 @@
+"""Persistent, size-bounded caches for LLM responses and other expensive lookups."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from langchain_core.messages import BaseMessage
+from pydantic import BaseModel
+
+from makeitreal.config import cache_settings
+
+
+@dataclass
+class CacheEntry:
+    """A single cached value with its bookkeeping timestamps."""
+
+    value: str
+    created_at: float
+    expires_at: float | None
+
+    @property
+    def expired(self) -> bool:
+        """Whether the entry outlived its TTL."""
+        return self.expires_at is not None and self.expires_at <= time.time()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters of a cache consumer."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class SqliteCache:
+    """Namespaced key/value store backed by SQLite with TTL and LRU eviction.
+
+    Several namespaces may share one database file; each namespace is bounded
+    by its own ``max_entries``. The least recently accessed entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str,
+        max_entries: int = 1000,
+        ttl: float | None = None,
+    ) -> None:
+        """Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file, or ``":memory:"``
+            namespace: Name separating this cache from others in the same file
+            max_entries: Maximum number of entries kept in the namespace
+            ttl: Default time-to-live in seconds, ``None`` for no expiry
+        """
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                expires_at REAL,
+                PRIMARY KEY (namespace, key)
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS cache_entries_lru ON cache_entries (namespace, accessed_at)"
+        )
+
+    def get(self, key: str, include_stale: bool = False) -> CacheEntry | None:
+        """Look up an entry, mark it as recently used and count the hit/miss.
+
+        Args:
+            key: Cache key
+            include_stale: Also return expired entries (e.g. for revalidation)
+
+        Returns:
+            The cache entry, or None if absent (or expired and not requested)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at, expires_at FROM cache_entries "
+                "WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            entry = CacheEntry(*row) if row else None
+            if entry is None or (entry.expired and not include_stale):
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            self._conn.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (time.time(), self.namespace, key),
+            )
+            return entry
+
+    def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        """Store a value, evicting the least recently used entries if the namespace is full."""
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(namespace, key, value, created_at, accessed_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.namespace, key, value, now, now, expires_at),
+            )
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        """Remove an entry."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+
+    def clear(self) -> None:
+        """Remove all entries of the namespace."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+
+    def _evict(self) -> None:
+        # Expired entries are kept until evicted, so they can still be revalidated
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+            "SELECT key FROM cache_entries WHERE namespace = ? "
+            "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.namespace, self.namespace, self.max_entries),
+        )
+
+
+class ResponseCache:
+    """Content-addressed cache of structured LLM responses.
+
+    Entries are keyed on the rendered prompt, the model name and the JSON schema of
+    the structured output, so any change to one of them results in a cache miss.
+    """
+
+    def __init__(self, store: SqliteCache) -> None:
+        self._store = store
+        self.stats: dict[str, CacheStats] = defaultdict(CacheStats)
+
+    @classmethod
+    def from_settings(cls) -> "ResponseCache":
+        """Create the response cache configured by ``cache_settings``."""
+        return cls(
+            SqliteCache(
+                cache_settings.cache_path,
+                namespace="llm_responses",
+                max_entries=cache_settings.llm_cache_max_entries,
+                ttl=cache_settings.llm_cache_ttl,
+            )
+        )
+
+    @staticmethod
+    def key(messages: Sequence[BaseMessage], model: str, schema: type[BaseModel]) -> str:
+        """Derive the content address of a structured LLM call."""
+        payload = json.dumps(
+            {
+                "messages": [[m.type, m.content] for m in messages],
+                "model": model,
+                "schema": schema.model_json_schema(),
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, agent: str, key: str) -> str | None:
+        """Look up a cached response and count the hit/miss for the given agent."""
+        entry = self._store.get(key)
+        if entry is None:
+            self.stats[agent].misses += 1
+            return None
+        self.stats[agent].hits += 1
+        return entry.value
+
+    def set(self, key: str, value: str) -> None:
+        """Store a serialized response."""
+        self._store.set(key, value)
@@ -0,0 +1,142 @@
+"""Checkpointer backends for persisting and resuming workflow runs."""
+
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+from typing import TYPE_CHECKING
+
+from makeitreal.config import checkpoint_settings
+
+if TYPE_CHECKING:
+    from langgraph.checkpoint.base import BaseCheckpointSaver
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+CHECKPOINTER_BACKENDS = ("memory", "sqlite")
+
+
+class _Default(Enum):
+    SETTINGS = "settings"
+
+
+# Default of arguments taken from `checkpoint_settings`, as None has a meaning of its own
+FROM_SETTINGS = _Default.SETTINGS
+
+
+@asynccontextmanager
+async def open_checkpointer(
+    backend: str | None = None, path: str | None = None
+) -> AsyncIterator["BaseCheckpointSaver"]:
+    """Open a checkpointer for the lifetime of the context.
+
+    File-backed checkpointers are compacted according to ``checkpoint_settings``
+    when the context exits.
+
+    Args:
+        backend: One of ``CHECKPOINTER_BACKENDS`` (defaults to ``checkpoint_settings``)
+        path: Database file of the ``sqlite`` backend (defaults to ``checkpoint_settings``)
+
+    Yields:
+        The checkpointer
+    """
+    backend = backend or checkpoint_settings.checkpoint_backend
+    if backend == "memory":
+        from langgraph.checkpoint.memory import MemorySaver
+
+        yield MemorySaver()
+    elif backend == "sqlite":
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        path = path or checkpoint_settings.checkpoint_path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        async with AsyncSqliteSaver.from_conn_string(path) as saver:
+            try:
+                yield saver
+            finally:
+                await compact_checkpoints(saver)
+    else:
+        raise ValueError(
+            f"Unknown checkpointer backend '{backend}', expected one of {CHECKPOINTER_BACKENDS}"
+        )
+
+
+async def compact_checkpoints(
+    saver: "AsyncSqliteSaver",
+    keep_last: int | _Default = FROM_SETTINGS,
+    max_age_days: float | None | _Default = FROM_SETTINGS,
+) -> int:
+    """Remove old checkpoints from a SQLite checkpointer.
+
+    Only the latest ``keep_last`` checkpoints of every thread are kept, which is all
+    that is needed to resume a run. Threads that have not been updated for more than
+    ``max_age_days`` are deleted entirely.
+
+    Args:
+        saver: The SQLite checkpointer to compact
+        keep_last: Checkpoints kept per thread, 0 deletes all
+            (defaults to ``checkpoint_settings``)
+        max_age_days: Maximum thread age, None keeps all threads
+            (defaults to ``checkpoint_settings``)
+
+    Returns:
+        Number of deleted checkpoints
+
+    Raises:
+        ValueError: If ``keep_last`` is negative
+    """
+    if keep_last is FROM_SETTINGS:
+        keep_last = checkpoint_settings.checkpoint_keep_last
+    if max_age_days is FROM_SETTINGS:
+        max_age_days = checkpoint_settings.checkpoint_max_age_days
+    if keep_last < 0:
+        raise ValueError(f"keep_last must not be negative, got {keep_last}")
+
+    await saver.setup()
+    deleted = 0
+
+    if max_age_days is not None:
+        cutoff = datetime.now(UTC) - timedelta(days=max_age_days)
+        async with (
+            saver.lock,
+            saver.conn.execute("SELECT DISTINCT thread_id FROM checkpoints") as cur,
+        ):
+            thread_ids = [row[0] for row in await cur.fetchall()]
+        for thread_id in thread_ids:
+            latest = await saver.aget_tuple({"configurable": {"thread_id": thread_id}})
+            if latest and datetime.fromisoformat(latest.checkpoint["ts"]) < cutoff:
+                async with (
+                    saver.lock,
+                    saver.conn.execute(
+                        "SELECT COUNT(*) FROM checkpoints WHERE thread_id = ?", (thread_id,)
+                    ) as cur,
+                ):
+                    deleted += (await cur.fetchone())[0]
+                await saver.adelete_thread(thread_id)
+
+    # Checkpoint ids are time-ordered (UUIDv6), so they sort chronologically
+    async with saver.lock:
+        stale = """
+            SELECT thread_id, checkpoint_ns, checkpoint_id FROM (
+                SELECT thread_id, checkpoint_ns, checkpoint_id, ROW_NUMBER() OVER (
+                    PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+                ) AS position
+                FROM checkpoints
+            ) WHERE position > ?
+        """
+        async with saver.conn.execute(stale, (keep_last,)) as cur:
+            rows = await cur.fetchall()
+        await saver.conn.executemany(
+            "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            rows,
+        )
+        await saver.conn.executemany(
+            "DELETE FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            rows,
+        )
+        await saver.conn.commit()
+        deleted += len(rows)
+
+    return deleted
@@ -1,13 +1,24 @@
 """CLI interface for MakeItReal using Typer and Rich."""
 
 import asyncio
+import json
+import uuid
+from typing import TYPE_CHECKING
 
 import typer
-from langgraph.types import Command
 from rich.console import Console
 from rich.panel import Panel
+from rich.table import Table
 
-from makeitreal.graph import IdeationWorkflow
+from makeitreal.batch import REVIEW_MODES, read_ideas, run_batch
+from makeitreal.checkpoint import CHECKPOINTER_BACKENDS, open_checkpointer
+from makeitreal.state_store import STAGES, StateStore
+from makeitreal.telemetry import SpanSummary, telemetry
+
+# LangChain, LangGraph and the HTTP clients are imported by the commands that need them,
+# which keeps `--help` and light commands fast
+if TYPE_CHECKING:
+    from makeitreal.graph import IdeationWorkflow
 
 app = typer.Typer(help="Transform ideas into structured product concepts")
 console = Console()
@@ -15,49 +26,395 @@ console = Console()
 
 @app.command()
 def idea(
-    description: str = typer.Argument(..., help="Your product idea description"),
+    description: str | None = typer.Argument(None, help="Your product idea description"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Show detailed output"),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Do not read or write cached LLM responses"
+    ),
+    checkpointer: str | None = typer.Option(
+        None,
+        "--checkpointer",
+        help=f"Checkpointer backend, one of {', '.join(CHECKPOINTER_BACKENDS)}",
+    ),
+    resume: str | None = typer.Option(
+        None, "--resume", help="Continue the interrupted run with the given thread id"
+    ),
+    speculative: bool = typer.Option(
+        False,
+        "--speculative",
+        help="Generate the next stage in the background while you review the current one",
+    ),
+    stream: bool = typer.Option(
+        False, "--stream", help="Show proposed items while they are being generated"
+    ),
+    profile: bool = typer.Option(
+        False, "--profile", help="Show per-node, LLM and tool timings, tokens and cost"
+    ),
+    trace: str | None = typer.Option(
+        None, "--trace", help="Append a JSON line per timed node, LLM request and tool call"
+    ),
 ) -> None:
     """Analyze and structure a product idea using the IdeaCurator agent."""
 
+    if not description and not resume:
+        raise typer.BadParameter("Either an idea description or --resume is required")
+    if checkpointer and checkpointer not in CHECKPOINTER_BACKENDS:
+        raise typer.BadParameter(
+            f"Unknown checkpointer '{checkpointer}', expected one of {CHECKPOINTER_BACKENDS}"
+        )
+
     if verbose:
-        console.print(f"[dim]Processing idea: {description}[/dim]")
+        console.print(f"[dim]Processing idea: {description or resume}[/dim]")
 
     console.print(Panel("🧠 Analyzing your product idea...", style="blue"))
+    telemetry.configure(profile, trace)
+
+    asyncio.run(
+        _run_idea(description, verbose, not no_cache, checkpointer, resume, speculative, stream)
+    )
+    if profile:
+        _print_profile()
 
-    asyncio.run(_run_idea(description, verbose))
 
+async def _run_idea(
+    description: str | None,
+    verbose: bool,
+    use_cache: bool = True,
+    checkpointer: str | None = None,
+    resume: str | None = None,
+    speculative: bool = False,
+    stream: bool = False,
+):
+    from makeitreal.graph import IdeationWorkflow
+    from makeitreal.llm import chat_clients
 
-async def _run_idea(description: str, verbose: bool):
-    workflow = IdeationWorkflow()
-    await workflow.ainit()
+    # Resuming requires the run to be persisted, so default to the file-backed checkpointer
+    if resume and checkpointer is None:
+        checkpointer = "sqlite"
+    try:
+        async with open_checkpointer(checkpointer) as saver:
+            workflow = IdeationWorkflow(
+                use_cache=use_cache,
+                checkpointer=saver,
+                speculative=speculative,
+                streaming=stream,
+            )
+            await workflow.ainit()
+            try:
+                await _run_idea_session(workflow, description, verbose, resume)
+            finally:
+                await workflow.aclose()
+    finally:
+        await chat_clients.aclose()
 
-    thread_id = "cli_session"
-    config = {"configurable": {"thread_id": thread_id}}
+
+async def _run_idea_session(
+    workflow: "IdeationWorkflow", description: str | None, verbose: bool, resume: str | None
+):
+    from langgraph.checkpoint.memory import MemorySaver
+    from langgraph.types import Command
+
+    from makeitreal.tools.mcp_client import context7_cache_stats
+
+    thread_id = resume or str(uuid.uuid4())
+    if isinstance(workflow.checkpointer, MemorySaver):
+        console.print(
+            f"[yellow]Thread id: {thread_id} (checkpoints are kept in memory, "
+            "use --checkpointer sqlite to resume this run later)[/yellow]"
+        )
+    else:
+        console.print(f"[dim]Thread id: {thread_id}[/dim]")
+    on_event = _item_printer(verbose) if workflow.streaming else None
 
     with console.status("[green]Workflow processing...", spinner="dots"):
-        state = await workflow.run(description, thread_id)
+        if resume:
+            state = await workflow.resume(thread_id, on_event)
+        else:
+            state = await workflow.run(description, thread_id, on_event)
 
     while len(state.get("__interrupt__") or []) > 0:
         interrupts = state["__interrupt__"]
         proposal_key = interrupts[0].value["key"]
-        state = interrupts[0].value["state"]
-        proposal = state.get(proposal_key)
+        proposal = interrupts[0].value["proposal"]
         print(
             f"{proposal_key}:"
             + "".join([f"\n  {i + 1}. {x}" for i, x in enumerate(proposal.proposed_items)])
         )
+        if proposal.exit_reason and proposal.exit_reason != "approved":
+            console.print(
+                f"[yellow]Agent review stopped after {proposal.iterations} iterations "
+                f"({proposal.exit_reason}), open change request: {proposal.change_request}[/yellow]"
+            )
 
+        # Read input in a thread so background speculation progresses while the user thinks
         approved = False
         while True:
-            approval = input(f"Do you approve {proposal_key}? [Y|n]")
+            approval = await asyncio.to_thread(input, f"Do you approve {proposal_key}? [Y|n]")
             approved = not approval or approval.lower() == "y"
             if approved or approval.lower() == "n":
                 break
         change_request = ""
         if not approved:
-            change_request = input("What do you want to change?")
-        state = await workflow.graph.ainvoke(Command(resume=change_request), config)
+            change_request = await asyncio.to_thread(input, "What do you want to change?")
+        state = await workflow.invoke(Command(resume=change_request), thread_id, on_event)
+
+    if verbose and workflow.cache is not None:
+        for agent, stats in workflow.cache.stats.items():
+            console.print(f"[dim]LLM cache {agent}: {stats.hits} hits, {stats.misses} misses[/dim]")
+    if verbose:
+        for namespace, stats in context7_cache_stats().items():
+            console.print(f"[dim]{namespace} cache: {stats.hits} hits, {stats.misses} misses[/dim]")
+    if verbose:
+        saved = sum(generator.saved_output_tokens for generator in workflow.generators.values())
+        console.print(f"[dim]Patching proposals saved ~{saved} output tokens[/dim]")
+    if verbose and workflow.speculation is not None:
+        spec = workflow.speculation
+        console.print(f"[dim]Speculation: {spec.reused} reused, {spec.discarded} discarded[/dim]")
+    if verbose:
+        _print_rate_limits()
+
+
+def _item_printer(verbose: bool):
+    """Print streamed proposal items as they arrive."""
+
+    def on_event(event: dict) -> None:
+        if event.get("reset"):
+            console.print(f"[yellow]{event['key']} regenerated, replacing the items above[/yellow]")
+        elif event["index"] == 0:
+            console.print(f"[bold]{event['key']}[/bold] (generating)")
+            if verbose:
+                console.print(f"[dim]Time to first item: {event['elapsed']:.2f}s[/dim]")
+        console.print(f"  {event['index'] + 1}. {event['item']}")
+
+    return on_event
+
+
+@app.command()
+def batch(
+    ideas: typer.FileText = typer.Argument(
+        "-", help='JSONL file with one idea per line ({"idea": ..., "id": ...}), - for stdin'
+    ),
+    output_dir: str = typer.Option(
+        ".state/batch", "--output-dir", "-o", help="Directory for the per-idea result files"
+    ),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", help="Ideas processed at once"),
+    tokens_per_minute: int | None = typer.Option(
+        None, "--tokens-per-minute", help="Limit the estimated LLM tokens per minute"
+    ),
+    requests_per_minute: int | None = typer.Option(
+        None, "--requests-per-minute", help="Limit the LLM requests per minute"
+    ),
+    review: str = typer.Option(
+        "auto",
+        "--review",
+        help="auto: approve all human reviews, queue: stop at the first human review "
+        "(continue later with `makeitreal idea --resume <thread_id>`)",
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Do not read or write cached LLM responses"
+    ),
+    checkpointer: str | None = typer.Option(
+        None,
+        "--checkpointer",
+        help=f"Checkpointer backend, one of {', '.join(CHECKPOINTER_BACKENDS)}",
+    ),
+    profile: bool = typer.Option(
+        False, "--profile", help="Show per-node, LLM and tool timings, tokens and cost"
+    ),
+    trace: str | None = typer.Option(
+        None, "--trace", help="Append a JSON line per timed node, LLM request and tool call"
+    ),
+) -> None:
+    """Process many product ideas concurrently."""
+    if review not in REVIEW_MODES:
+        raise typer.BadParameter(f"Unknown review mode '{review}', expected one of {REVIEW_MODES}")
+    if checkpointer and checkpointer not in CHECKPOINTER_BACKENDS:
+        raise typer.BadParameter(
+            f"Unknown checkpointer '{checkpointer}', expected one of {CHECKPOINTER_BACKENDS}"
+        )
+    # Queued reviews are continued later, which requires the runs to be persisted
+    if review == "queue" and checkpointer is None:
+        checkpointer = "sqlite"
+
+    items = read_ideas(ideas)
+    console.print(Panel(f"🧠 Analyzing {len(items)} product ideas...", style="blue"))
+    if tokens_per_minute or requests_per_minute:
+        from makeitreal.llm import chat_clients
+
+        if tokens_per_minute:
+            chat_clients.rate_limiter.tokens.configure(tokens_per_minute)
+        if requests_per_minute:
+            chat_clients.rate_limiter.requests.configure(requests_per_minute)
+    telemetry.configure(profile, trace)
+
+    results = asyncio.run(
+        _run_batch(items, output_dir, concurrency, review, not no_cache, checkpointer)
+    )
+
+    table = Table("Thread id", "Status", "Idea")
+    for result in results:
+        table.add_row(result["thread_id"], result["status"], result["idea"][:60])
+    console.print(table)
+    console.print(f"Results written to {output_dir}")
+    _print_rate_limits()
+    if profile:
+        _print_profile(per_thread=True)
+
+
+async def _run_batch(items, output_dir, concurrency, review, use_cache, checkpointer):
+    from makeitreal.graph import IdeationWorkflow
+    from makeitreal.llm import chat_clients
+
+    try:
+        async with open_checkpointer(checkpointer) as saver:
+            workflow = IdeationWorkflow(use_cache=use_cache, checkpointer=saver)
+            await workflow.ainit()
+            try:
+                return await run_batch(workflow, items, output_dir, concurrency, review)
+            finally:
+                await workflow.aclose()
+    finally:
+        await chat_clients.aclose()
+
+
+def _print_rate_limits() -> None:
+    """Print how often the provider's rate limits were hit."""
+    from makeitreal.llm import chat_clients
+
+    limiter = chat_clients.rate_limiter
+    if limiter.throttled:
+        console.print(
+            f"[dim]Rate limited {limiter.throttled} times, "
+            f"concurrency adapted to {int(limiter.concurrency)}/{limiter.max_concurrency}[/dim]"
+        )
+
+
+def _print_profile(per_thread: bool = False) -> None:
+    """Print the telemetry summary of the run."""
+    table = Table(
+        "Kind",
+        "Name",
+        "Count",
+        "Total",
+        "Mean",
+        "Max",
+        "Queued",
+        "Tokens in/out",
+        "Cached",
+        "Cost",
+        "Cache hits",
+        "Errors",
+        title="Profile (seconds, USD)",
+    )
+    for s in telemetry.summary():
+        table.add_row(
+            s.kind,
+            s.name,
+            str(s.count),
+            f"{s.total:.2f}",
+            f"{s.mean:.2f}",
+            f"{s.max:.2f}",
+            f"{s.queue_time:.2f}",
+            f"{s.prompt_tokens}/{s.completion_tokens}" if s.kind == "llm" else "",
+            _cached_share(s) if s.kind == "llm" else "",
+            f"{s.cost:.4f}" if s.kind == "llm" else "",
+            str(s.cache_hits) if s.kind == "llm" else "",
+            str(s.errors),
+        )
+    console.print(table)
+
+    if per_thread:
+        threads = Table(
+            "Thread id", "LLM requests", "Tokens in/out", "Cost", title="Per idea (USD)"
+        )
+        for thread_id, s in telemetry.totals_by_thread().items():
+            threads.add_row(
+                thread_id, str(s.count), f"{s.prompt_tokens}/{s.completion_tokens}", f"{s.cost:.4f}"
+            )
+        console.print(threads)
+    _print_review_tiering()
+    if any(span.estimated_tokens for span in telemetry.spans):
+        console.print("[dim]Some token counts are estimates, the API reported no usage[/dim]")
+    if telemetry.trace_path:
+        console.print(f"[dim]Trace written to {telemetry.trace_path}[/dim]")
+
+
+def _cached_share(summary: SpanSummary) -> str:
+    """Prompt tokens the provider read from its prompt cache, and their share."""
+    if not summary.prompt_tokens:
+        return str(summary.cached_tokens)
+    return f"{summary.cached_tokens} ({summary.cached_tokens / summary.prompt_tokens:.0%})"
+
+
+def _print_review_tiering() -> None:
+    """Print the savings of reviews by cheaper models, if any agent is routed to one."""
+    from makeitreal import config
+
+    default_model = config.openai_settings.openai_model
+    tiering = telemetry.review_tiering(default_model)
+    if not tiering:
+        return
+    table = Table(
+        "Stage",
+        "Reviews",
+        "Escalated",
+        "Time",
+        "Saved time",
+        "Cost",
+        "Saved cost",
+        title=f"Review tiering vs. {default_model} (seconds, USD)",
+    )
+    for stage, s in tiering.items():
+        table.add_row(
+            stage,
+            str(s.reviews),
+            str(s.escalations),
+            f"{s.primary_time + s.escalation_time:.2f}",
+            f"{s.saved_time:.2f}" if s.saved_time is not None else "",
+            f"{s.primary_cost + s.escalation_cost:.4f}",
+            f"{s.saved_cost:.4f}",
+        )
+    console.print(table)
+    console.print("[dim]Saved time is estimated from the latency of the escalated reviews[/dim]")
+
+
+@app.command()
+def export(
+    thread_id: str | None = typer.Argument(None, help="Thread to export, omit to list threads"),
+    snapshot: int = typer.Option(
+        -1, "--snapshot", "-s", help="Snapshot number, negative numbers count from the latest"
+    ),
+    stage: str | None = typer.Option(
+        None, "--stage", help=f"Export only one stage, one of {', '.join(STAGES)}"
+    ),
+    output: str | None = typer.Option(None, "--output", "-o", help="File to write, - for stdout"),
+) -> None:
+    """Export a stored workflow result as JSON."""
+
+    store = StateStore()
+    if thread_id is None:
+        table = Table("Thread id", "Snapshots")
+        for thread in store.threads():
+            table.add_row(thread, str(len(store.snapshots(thread))))
+        console.print(table)
+        return
+
+    try:
+        if stage:
+            value = store.load_stage(thread_id, stage, snapshot)
+            data = value if stage == "idea" else value.model_dump()
+        else:
+            data = store.export(thread_id, snapshot)
+    except KeyError as e:
+        raise typer.BadParameter(str(e.args[0])) from e
+
+    content = json.dumps(data, indent=2)
+    if output is None or output == "-":
+        print(content)
+    else:
+        with open(output, "w") as f:
+            f.write(content)
+        console.print(f"Exported thread {thread_id} to {output}")
 
 
 if __name__ == "__main__":
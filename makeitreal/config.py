@@ -12,7 +12,118 @@ class OpenAISettings(BaseSettings):
     openai_api_key: str
     openai_model: str = "gpt-4.1-nano-2025-04-14"
     openai_base_url: str = "https://api.openai.com/v1"
+    # Models of individual agents by class name, applying to subclasses too, e.g.
+    # {"RequirementsReviewAgent": "gpt-4.1-nano"} for all review agents
+    openai_agent_models: dict[str, str] = {}
 
+    # Connection pool shared by all agents
+    openai_max_connections: int = 20
+    openai_max_keepalive_connections: int = 10
+    openai_keepalive_expiry: float = 30.0
+    openai_http2: bool = True
+    openai_timeout: float = 120.0
 
-# Global settings instance
-openai_settings = OpenAISettings()
+    # Rate limits, adaptive concurrency and retry/backoff policy applied to every LLM request
+    openai_max_concurrency: int = 8
+    openai_min_concurrency: int = 1
+    # Seconds per request above which the concurrency is decreased, None to ignore latency
+    openai_latency_target: float | None = None
+    openai_requests_per_minute: int | None = None
+    openai_tokens_per_minute: int | None = None
+    openai_max_retries: int = 3
+    openai_backoff_initial: float = 1.0
+    openai_backoff_max: float = 30.0
+
+    def model_for(self, agent_class: type) -> str:
+        """Model of the agent class or its closest configured base class, else ``openai_model``."""
+        for cls in agent_class.__mro__:
+            if cls.__name__ in self.openai_agent_models:
+                return self.openai_agent_models[cls.__name__]
+        return self.openai_model
+
+
+class CacheSettings(BaseSettings):
+    """Persistent cache configuration."""
+
+    model_config = ConfigDict(env_file=".env", extra="ignore")
+
+    cache_enabled: bool = True
+    cache_path: str = ".cache/makeitreal.sqlite"
+    llm_cache_max_entries: int = 2000
+    llm_cache_ttl: float | None = 7 * 24 * 3600
+    web_cache_max_entries: int = 1000
+    web_cache_ttl: float | None = 24 * 3600
+    context7_id_cache_max_entries: int = 1000
+    context7_id_cache_ttl: float | None = 30 * 24 * 3600
+    context7_docs_cache_max_entries: int = 200
+    context7_docs_cache_ttl: float | None = 24 * 3600
+
+
+class CheckpointSettings(BaseSettings):
+    """Workflow checkpoint persistence configuration."""
+
+    model_config = ConfigDict(env_file=".env", extra="ignore")
+
+    checkpoint_backend: str = "memory"
+    checkpoint_path: str = ".state/checkpoints.sqlite"
+    checkpoint_keep_last: int = 5
+    checkpoint_max_age_days: float | None = 30
+    # Snapshot log of the workflow results per thread
+    state_store_path: str = ".state/threads"
+
+
+class ToolSettings(BaseSettings):
+    """Agent tool execution configuration."""
+
+    model_config = ConfigDict(env_file=".env", extra="ignore")
+
+    tool_max_concurrency: int = 4
+    tool_timeout: float = 60.0
+    web_search_workers: int = 4
+    web_fetch_streaming: bool = True
+    web_fetch_max_bytes: int = 2 * 1024 * 1024
+    context7_mcp_url: str = "http://context7-mcp:8080/mcp"
+    mcp_max_connections: int = 10
+    mcp_keepalive_timeout: float = 60.0
+
+
+class ReviewSettings(BaseSettings):
+    """Limits and regeneration strategy of the generator/reviewer loop of each stage."""
+
+    model_config = ConfigDict(env_file=".env", extra="ignore")
+
+    review_max_iterations: int = 3
+    # Escalate to the human once less than this share of the items changes in two consecutive
+    # iterations (or none at all in one), a targeted patch of a long list changes little
+    review_convergence_threshold: float = 0.1
+    # Let the generator patch a rejected proposal instead of regenerating all items
+    review_patch_regeneration: bool = True
+    # Repeat a review with the default model if the reviewer's own model is less confident
+    review_escalation_confidence: float = 0.7
+    # ... or if it reverses its previous verdict on the same, unchanged items
+    review_escalate_on_flip: bool = True
+
+
+class HistorySettings(BaseSettings):
+    """Retention policy of the workflow's message history."""
+
+    model_config = ConfigDict(env_file=".env", extra="ignore")
+
+    history_max_messages: int = 20
+    history_max_tokens: int | None = 8000
+
+
+# Global settings instances
+cache_settings = CacheSettings()
+checkpoint_settings = CheckpointSettings()
+tool_settings = ToolSettings()
+review_settings = ReviewSettings()
+history_settings = HistorySettings()
+
+
+def __getattr__(name: str):
+    # The OpenAI settings require an API key, so they are only built once they are used
+    if name == "openai_settings":
+        globals()["openai_settings"] = OpenAISettings()
+        return globals()["openai_settings"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
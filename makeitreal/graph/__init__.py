@@ -1,5 +1,18 @@
 """LangGraph workflow components for MakeItReal."""
 
-from .workflow import IdeationWorkflow
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .workflow import IdeationWorkflow
 
 __all__ = ["IdeationWorkflow"]
+
+# LangGraph and the agents are imported on first access only, see `__getattr__`
+_LAZY_ATTRIBUTES = {"IdeationWorkflow": ".workflow"}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
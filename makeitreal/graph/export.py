@@ -0,0 +1,115 @@
+"""Offline export of the workflow graph topology."""
+
+import json
+from collections import defaultdict
+from typing import Any
+
+from langchain_core.runnables.graph import Edge, Graph
+from langgraph.graph.state import CompiledStateGraph
+
+from makeitreal.cache import ResponseCache
+from makeitreal.graph.workflow import IdeationWorkflow
+
+GRAPH_FORMATS = ("mermaid", "dot", "json")
+
+
+class StubAgent:
+    """Placeholder agent for building the graph without LLM clients or tools."""
+
+    def __init__(self, key: str, role: str) -> None:
+        self.name = f"{role} stub for {key}"
+
+    async def process(self, *args: Any, **kwargs: Any) -> dict[str, Any]:
+        raise RuntimeError(f"{self.name} cannot process states")
+
+
+def create_stub_agents(key: str, cache: ResponseCache | None) -> tuple[StubAgent, StubAgent]:
+    """Agent factory creating stubs for the generator and review agent of a stage."""
+    return StubAgent(key, "generator"), StubAgent(key, "review")
+
+
+async def build_offline_graph() -> CompiledStateGraph:
+    """Build the workflow graph with stub agents, without credentials or connections."""
+    workflow = IdeationWorkflow(use_cache=False, agent_factory=create_stub_agents)
+    await workflow.ainit(connect=False)
+    return workflow.graph
+
+
+def export_graph(
+    graph: CompiledStateGraph, graph_format: str = "mermaid", xray: bool = True
+) -> str:
+    """Render the graph topology.
+
+    Args:
+        graph: The compiled workflow graph
+        graph_format: One of ``GRAPH_FORMATS``
+        xray: Inline the stages' sub graphs instead of showing them as single nodes
+
+    Returns:
+        The rendered graph
+    """
+    drawable = graph.get_graph(xray=xray)
+    drawable.edges = _split_routes(drawable, _route_labels(graph))
+    if graph_format == "mermaid":
+        return drawable.draw_mermaid()
+    if graph_format == "dot":
+        return _draw_dot(drawable)
+    if graph_format == "json":
+        return json.dumps(_graph_json(drawable), indent=2)
+    raise ValueError(f"Unknown graph format '{graph_format}', expected one of {GRAPH_FORMATS}")
+
+
+def _route_labels(graph: CompiledStateGraph, prefix: str = "") -> dict[tuple[str, str], list[str]]:
+    """Labels of the conditional routes between each pair of nodes, including sub graphs."""
+    labels = defaultdict(list)
+    for source, branches in graph.builder.branches.items():
+        for branch in branches.values():
+            for label, target in (branch.ends or {}).items():
+                if label != target:
+                    labels[(f"{prefix}{source}", f"{prefix}{target}")].append(label)
+    for name, subgraph in graph.get_subgraphs():
+        labels.update(_route_labels(subgraph, f"{prefix}{name}:"))
+    return labels
+
+
+def _split_routes(drawable: Graph, labels: dict[tuple[str, str], list[str]]) -> list[Edge]:
+    """Draw routes sharing their nodes as separate edges, LangGraph only labels one of them."""
+    edges = []
+    for edge in drawable.edges:
+        route_labels = labels.get((edge.source, edge.target), [])
+        if edge.conditional and len(route_labels) > 1:
+            edges.extend(edge._replace(data=label) for label in route_labels)
+        else:
+            edges.append(edge)
+    return edges
+
+
+def _graph_json(drawable: Graph) -> dict[str, Any]:
+    return {
+        "nodes": [{"id": node.id, "name": node.name} for node in drawable.nodes.values()],
+        "edges": [
+            {
+                "source": edge.source,
+                "target": edge.target,
+                "conditional": edge.conditional,
+                **({"label": str(edge.data)} if edge.data is not None else {}),
+            }
+            for edge in drawable.edges
+        ],
+    }
+
+
+def _draw_dot(drawable: Graph) -> str:
+    lines = ["digraph workflow {", "  rankdir=TB;"]
+    for node in drawable.nodes.values():
+        lines.append(f"  {json.dumps(node.id)} [label={json.dumps(node.name)}];")
+    for edge in drawable.edges:
+        attributes = []
+        if edge.conditional:
+            attributes.append("style=dashed")
+        if edge.data is not None:
+            attributes.append(f"label={json.dumps(str(edge.data))}")
+        suffix = f" [{', '.join(attributes)}]" if attributes else ""
+        lines.append(f"  {json.dumps(edge.source)} -> {json.dumps(edge.target)}{suffix};")
+    lines.append("}")
+    return "\n".join(lines)
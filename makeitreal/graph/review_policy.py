@@ -0,0 +1,124 @@
+"""Early-exit policy of the generator/reviewer loop."""
+
+from makeitreal.config import review_settings
+from makeitreal.state import Proposal
+
+# Why the agent review loop of a stage handed over to the human
+REVIEW_EXIT_REASONS = ("approved", "max_iterations", "converged", "repeated_change_request")
+# Why a review was repeated with the stronger model
+REVIEW_ESCALATION_REASONS = ("low_confidence", "verdict_flip")
+
+
+def item_set_distance(previous: list[str], current: list[str]) -> float:
+    """Jaccard distance between two item lists, ignoring case, whitespace and order.
+
+    Returns:
+        0.0 for identical item sets up to 1.0 for disjoint ones
+    """
+    previous_set = {_normalize(item) for item in previous}
+    current_set = {_normalize(item) for item in current}
+    union = previous_set | current_set
+    if not union:
+        return 0.0
+    return 1.0 - len(previous_set & current_set) / len(union)
+
+
+def review_exit_reason(
+    proposal: Proposal,
+    approved: bool,
+    change_request: str,
+    max_iterations: int | None = None,
+    convergence_threshold: float | None = None,
+) -> str | None:
+    """Decide whether the agent review loop of a stage ends.
+
+    Args:
+        proposal: The reviewed proposal with its loop bookkeeping
+        approved: Whether the reviewer approved the proposal
+        change_request: The reviewer's change request
+        max_iterations: Maximum generator runs per round (defaults to ``review_settings``)
+        convergence_threshold: Item change below which the loop has converged, if it
+            stays below for two consecutive iterations (defaults to ``review_settings``)
+
+    Returns:
+        One of ``REVIEW_EXIT_REASONS``, or None to continue the loop
+    """
+    if max_iterations is None:
+        max_iterations = review_settings.review_max_iterations
+    if convergence_threshold is None:
+        convergence_threshold = review_settings.review_convergence_threshold
+
+    if approved:
+        return "approved"
+    # Convergence needs a few iterations to show, so it is checked before the bound
+    if _converged(proposal, convergence_threshold):
+        return "converged"
+    if proposal.iterations >= max_iterations:
+        return "max_iterations"
+    if proposal.previous_change_request and _normalize(change_request) == _normalize(
+        proposal.previous_change_request
+    ):
+        return "repeated_change_request"
+    return None
+
+
+def review_escalation_reason(
+    proposal: Proposal,
+    approved: bool,
+    confidence: float | None,
+    min_confidence: float | None = None,
+    escalate_on_flip: bool | None = None,
+) -> str | None:
+    """Decide whether a review by a cheaper model is repeated with the stronger model.
+
+    Args:
+        proposal: The reviewed proposal, still holding the previous verdict of the round
+        approved: Whether the reviewer approved the proposal
+        confidence: The reviewer's confidence in its verdict, between 0 and 1, or None if
+            it reported none
+        min_confidence: Confidence below which the review escalates
+            (defaults to ``review_settings``)
+        escalate_on_flip: Escalate when the verdict differs from the previous one of
+            the round on unchanged items (defaults to ``review_settings``)
+
+    Returns:
+        One of ``REVIEW_ESCALATION_REASONS``, or None to keep the verdict
+    """
+    if min_confidence is None:
+        min_confidence = review_settings.review_escalation_confidence
+    if escalate_on_flip is None:
+        escalate_on_flip = review_settings.review_escalate_on_flip
+
+    if confidence is None or confidence < min_confidence:
+        return "low_confidence"
+    # Only a verdict on the very items reviewed before is comparable, the first review of a
+    # round has no previous verdict and a regenerated proposal is a different one
+    if (
+        escalate_on_flip
+        and proposal.iterations > 1
+        and proposal.item_change == 0
+        and approved != proposal.agent_approved
+    ):
+        return "verdict_flip"
+    return None
+
+
+def _converged(proposal: Proposal, threshold: float) -> bool:
+    """Whether the items did not change at all, or only little in two consecutive iterations.
+
+    A single small change is no sign of convergence, as patching one item of a long list
+    changes only a small share of the items.
+    """
+    if proposal.item_change is None:
+        return False
+    if proposal.item_change == 0:
+        return True
+    return (
+        proposal.item_change < threshold
+        and proposal.previous_item_change is not None
+        and proposal.previous_item_change < threshold
+    )
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
@@ -0,0 +1,77 @@
+"""Speculative execution of workflow stages during human review."""
+
+import asyncio
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+def fingerprint(*parts: Any) -> str:
+    """Hash the JSON-serializable inputs a speculative result depends on."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+class SpeculativeExecutor:
+    """Runs work ahead of time in the background and hands it out if its inputs still match.
+
+    Speculations are identified by thread id and key and tagged with a fingerprint of
+    their inputs. Taking a speculation with a different fingerprint discards it, and
+    starting one with a new fingerprint replaces (rebases) the previous one.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without speculations."""
+        self._speculations: dict[tuple[str, str], tuple[str, asyncio.Task]] = {}
+        self.reused = 0
+        self.discarded = 0
+
+    def start(
+        self,
+        thread_id: str,
+        key: str,
+        inputs_fingerprint: str,
+        work: Callable[[], Awaitable[Any]],
+    ) -> None:
+        """Start the work in the background unless it already runs for the same inputs."""
+        current = self._speculations.get((thread_id, key))
+        if current and current[0] == inputs_fingerprint:
+            return
+        self.discard(thread_id, key)
+        task = asyncio.create_task(work())
+        self._speculations[(thread_id, key)] = (inputs_fingerprint, task)
+
+    async def take(self, thread_id: str, key: str, inputs_fingerprint: str) -> Any | None:
+        """Await and return the speculative result if it was computed from the same inputs.
+
+        Returns:
+            The result, or None if there is no matching or successful speculation
+        """
+        speculation = self._speculations.pop((thread_id, key), None)
+        if speculation is None:
+            return None
+        speculated_fingerprint, task = speculation
+        if speculated_fingerprint != inputs_fingerprint:
+            task.cancel()
+            self.discarded += 1
+            return None
+        try:
+            result = await task
+        except Exception as e:
+            print(f"Speculative {key} failed: {e}")
+            self.discarded += 1
+            return None
+        self.reused += 1
+        return result
+
+    def discard(self, thread_id: str, key: str) -> None:
+        """Cancel a speculation."""
+        speculation = self._speculations.pop((thread_id, key), None)
+        if speculation is not None:
+            speculation[1].cancel()
+            self.discarded += 1
+
+    def cancel_all(self) -> None:
+        """Cancel all pending speculations."""
+        for thread_id, key in list(self._speculations):
+            self.discard(thread_id, key)
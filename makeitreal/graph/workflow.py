@@ -1,93 +1,173 @@
 """LangGraph workflow implementation for idea processing."""
 
-import json
-import os
+import time
 import uuid
-from datetime import datetime
-from typing import Any
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 
 from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.config import get_stream_writer
 from langgraph.graph import END, START, StateGraph
-from langgraph.types import interrupt
-
-from makeitreal.agents.base_agent import BaseAgent
-from makeitreal.agents.requirements_generator_agent import RequirementsGeneratorAgent
-from makeitreal.agents.requirements_review_agent import RequirementsReviewAgent
-from makeitreal.agents.task_generator_agent import TaskGeneratorAgent
-from makeitreal.agents.task_review_agent import TaskReviewAgent
-from makeitreal.agents.techstack_generator_agent import TechStackGeneratorAgent
-from makeitreal.agents.techstack_review_agent import TechStackReviewAgent
+from langgraph.types import Command, interrupt
+
+from makeitreal.cache import ResponseCache
+from makeitreal.config import cache_settings
+from makeitreal.graph.review_policy import item_set_distance, review_exit_reason
+from makeitreal.graph.speculation import SpeculativeExecutor, fingerprint
+from makeitreal.rate_limit import Priority, request_priority
 from makeitreal.state import Proposal, WorkflowState
+from makeitreal.state_store import StateStore
+from makeitreal.telemetry import telemetry
+
+if TYPE_CHECKING:
+    from makeitreal.agents.base_agent import BaseAgent
+    from makeitreal.agents.requirements_generator_agent import RequirementsGeneratorAgent
+
+# Proposal keys in the order of the workflow's stages
+STAGE_KEYS = ("features", "tech_stack", "tasks")
+# Node of the top-level graph running the sub graph of each stage
+STAGE_NODES = {
+    "features": "requirement_analysis",
+    "tech_stack": "techstack_discovery",
+    "tasks": "task_creation",
+}
+
+# Creates the generator and review agent of a stage from its key and the response cache
+AgentFactory = Callable[
+    [str, ResponseCache | None], tuple["RequirementsGeneratorAgent", "BaseAgent"]
+]
+
+
+def create_agents(
+    key: str, cache: ResponseCache | None
+) -> tuple["RequirementsGeneratorAgent", "BaseAgent"]:
+    """Create the LLM-backed generator and review agent of a stage."""
+    from makeitreal.agents.requirements_generator_agent import RequirementsGeneratorAgent
+    from makeitreal.agents.requirements_review_agent import RequirementsReviewAgent
+    from makeitreal.agents.task_generator_agent import TaskGeneratorAgent
+    from makeitreal.agents.task_review_agent import TaskReviewAgent
+    from makeitreal.agents.techstack_generator_agent import TechStackGeneratorAgent
+    from makeitreal.agents.techstack_review_agent import TechStackReviewAgent
+
+    generator_class, review_class = {
+        "features": (RequirementsGeneratorAgent, RequirementsReviewAgent),
+        "tech_stack": (TechStackGeneratorAgent, TechStackReviewAgent),
+        "tasks": (TaskGeneratorAgent, TaskReviewAgent),
+    }[key]
+    return generator_class(cache=cache), review_class(cache=cache)
 
 
 class IdeationWorkflow:
     """LangGraph workflow for processing product ideas."""
 
-    def __init__(self):
-        """Initialize the workflow with memory checkpointing."""
-        self.checkpointer = MemorySaver()
+    def __init__(
+        self,
+        use_cache: bool | None = None,
+        checkpointer: BaseCheckpointSaver | None = None,
+        speculative: bool = False,
+        streaming: bool = False,
+        agent_factory: AgentFactory = create_agents,
+    ):
+        """Initialize the workflow with checkpointing.
+
+        Args:
+            use_cache: Cache structured LLM responses on disk (defaults to ``cache_settings``)
+            checkpointer: Checkpointer persisting the runs (defaults to in-memory)
+            speculative: Generate the next stage's proposal while a human reviews a stage
+            streaming: Stream the generators' responses and emit every proposed item as a
+                custom stream event, see ``invoke``
+            agent_factory: Creates the agents of each stage (e.g. stubs to export the graph)
+        """
+        self.checkpointer = checkpointer or MemorySaver()
         self.graph = None
+        if use_cache is None:
+            use_cache = cache_settings.cache_enabled
+        self.cache = ResponseCache.from_settings() if use_cache else None
+        self.speculation = SpeculativeExecutor() if speculative else None
+        self.state_store = StateStore()
+        self.streaming = streaming
+        self.agent_factory = agent_factory
+        self.generators: dict[str, RequirementsGeneratorAgent] = {}
+
+    async def ainit(self, connect: bool = True):
+        """Build the graph and open the connections shared by the agents' tools.
+
+        Args:
+            connect: Open the tools' connections, not needed to only inspect the graph
+        """
+        if connect:
+            from makeitreal.tools.mcp_client import get_mcp_client
 
-    async def ainit(self):
+            await get_mcp_client()
         self.graph = await self._build_graph()
 
+    async def aclose(self):
+        """Cancel pending speculations and close the connections shared by the agents' tools."""
+        from makeitreal.tools.mcp_client import close_mcp_client
+
+        if self.speculation is not None:
+            self.speculation.cancel_all()
+        await close_mcp_client()
+
     async def _build_graph(self):
         """Build the LangGraph workflow."""
         workflow = StateGraph(WorkflowState)
 
-        workflow.add_node(
-            "requirement_analysis",
-            await self._build_proposal_graph(
-                "features", RequirementsGeneratorAgent(), RequirementsReviewAgent()
-            ),
-        )
-        workflow.add_node(
-            "techstack_discovery",
-            await self._build_proposal_graph(
-                "tech_stack", TechStackGeneratorAgent(), TechStackReviewAgent()
-            ),
-        )
-        workflow.add_node(
-            "task_creation",
-            await self._build_proposal_graph("tasks", TaskGeneratorAgent(), TaskReviewAgent()),
-        )
+        for key in STAGE_KEYS:
+            generator_agent, review_agent = self.agent_factory(key, self.cache)
+            workflow.add_node(
+                STAGE_NODES[key],
+                await self._build_proposal_graph(key, generator_agent, review_agent),
+            )
         workflow.add_node("log_tasks", self._log_tasks)
 
-        workflow.add_edge(START, "requirement_analysis")
-        workflow.add_edge("requirement_analysis", "techstack_discovery")
-        workflow.add_edge("techstack_discovery", "task_creation")
-        workflow.add_edge("task_creation", "log_tasks")
-        workflow.add_edge("log_tasks", END)
+        nodes = [START, *(STAGE_NODES[key] for key in STAGE_KEYS), "log_tasks", END]
+        for source, target in zip(nodes, nodes[1:], strict=False):
+            workflow.add_edge(source, target)
 
         return workflow.compile(checkpointer=self.checkpointer)
 
     async def _build_proposal_graph(
         self,
         key: str,
-        generator_agent: RequirementsGeneratorAgent,
-        review_agent: RequirementsReviewAgent,
+        generator_agent: "RequirementsGeneratorAgent",
+        review_agent: "BaseAgent",
     ):
         """Build a LangGraph sub graph of the workflow."""
         workflow = StateGraph(WorkflowState)
+        self.generators[key] = generator_agent
+
+        async def generate_agent_node(state, config: RunnableConfig):
+            iteration = state.get(key).iterations + 1
+            with self._node_span(f"{key}/generator", key, iteration, config):
+                return await self._requirement_analysis(state, key, generator_agent, config)
 
-        async def generate_agent_node(state):
-            await self._requirement_analysis(state, key, generator_agent)
+        async def review_agent_node(state, config: RunnableConfig):
+            iteration = state.get(key).iterations
+            with self._node_span(f"{key}/review", key, iteration, config):
+                return await self._agent_review(state, key, review_agent)
 
-        async def review_agent_node(state):
-            return await self._agent_review(state, key, review_agent)
+        async def human_review_node(state, config: RunnableConfig):
+            return self._human_review(state, key, config)
 
         workflow.add_node("requirements_agent", generate_agent_node)
         workflow.add_node("review_agent", review_agent_node)
-        workflow.add_node("human_review", lambda state: self._human_review(state, key))
+        workflow.add_node("human_review", human_review_node)
 
         workflow.add_edge(START, "requirements_agent")
         workflow.add_edge("requirements_agent", "review_agent")
 
         workflow.add_conditional_edges(
             "review_agent",
-            lambda state: state.get(key).agent_approved and "approved" or "rejected",
-            {"approved": "human_review", "rejected": "requirements_agent"},
+            lambda state: self._review_route(state.get(key)),
+            {
+                "approved": "human_review",
+                "escalate": "human_review",
+                "rejected": "requirements_agent",
+            },
         )
         workflow.add_conditional_edges(
             "human_review",
@@ -97,12 +177,52 @@ class IdeationWorkflow:
 
         return workflow.compile()
 
+    @staticmethod
+    def _review_route(proposal: Proposal) -> str:
+        """Hand approved proposals and ended review loops to the human, revise the others."""
+        if proposal.exit_reason is None:
+            return "rejected"
+        return "approved" if proposal.exit_reason == "approved" else "escalate"
+
+    def _node_span(self, name: str, key: str, iteration: int, config: RunnableConfig):
+        """Telemetry span of a stage's node, tied to the thread and review iteration."""
+        return telemetry.span(
+            "node",
+            name,
+            thread_id=config["configurable"]["thread_id"],
+            stage=key,
+            iteration=iteration,
+        )
+
     async def _requirement_analysis(
-        self, state: WorkflowState, key: str, agent: RequirementsGeneratorAgent
+        self,
+        state: WorkflowState,
+        key: str,
+        agent: "RequirementsGeneratorAgent",
+        config: RunnableConfig | None = None,
     ) -> dict[str, Any]:
         print(f"{key} requirement analysis")
-        result = await agent.process(state)
+        result = None
+        if self.speculation is not None and config is not None:
+            result = await self.speculation.take(
+                config["configurable"]["thread_id"], key, self._stage_fingerprint(state, key)
+            )
+            if result is not None:
+                print(f"{key} reusing speculative result")
+        if result is None:
+            result = await agent.process(state, self._item_writer(key))
         proposal = state.get(key)
+        # Compare with the previous iteration of this review round only
+        if proposal.iterations > 0:
+            proposal.previous_item_change = proposal.item_change
+            proposal.item_change = item_set_distance(proposal.proposed_items, result["items"])
+            proposal.previous_change_request = proposal.change_request
+        else:
+            proposal.previous_item_change = None
+            proposal.item_change = None
+            proposal.previous_change_request = None
+        proposal.iterations += 1
+        proposal.revision += 1
         proposal.proposed_items = result["items"]
         proposal.change_request = None
 
@@ -110,24 +230,74 @@ class IdeationWorkflow:
             key: proposal,
         }
 
+    def _item_writer(self, key: str) -> Callable[[int, str], None] | None:
+        """Emit streamed items as ``{"key", "index", "item", "elapsed", "reset"}`` custom stream
+        events, ``reset`` marking the first of the items replacing all items emitted before.
+        """
+        if not self.streaming:
+            return None
+        writer = get_stream_writer()
+        started = time.perf_counter()
+        written = False
+
+        def write(index: int, item: str) -> None:
+            nonlocal written
+            writer(
+                {
+                    "key": key,
+                    "index": index,
+                    "item": item,
+                    "elapsed": time.perf_counter() - started,
+                    "reset": written and index == 0,
+                }
+            )
+            written = True
+
+        return write
+
     async def _agent_review(
-        self, state: WorkflowState, key: str, agent: BaseAgent
+        self, state: WorkflowState, key: str, agent: "BaseAgent"
     ) -> dict[str, Any]:
         print(f"{key} review by agent")
         result = await agent.process(state)
         proposal = state.get(key)
         proposal.agent_approved = result["approved"]
+        proposal.exit_reason = review_exit_reason(
+            proposal, result["approved"], result["changes"] or ""
+        )
         proposal.change_request = result["changes"] or ""
+        if proposal.exit_reason and proposal.exit_reason != "approved":
+            print(
+                f"{key} agent review stopped after {proposal.iterations} iterations: "
+                f"{proposal.exit_reason}"
+            )
 
         return {
             key: proposal,
         }
 
-    def _human_review(self, state: WorkflowState, key: str) -> dict[str, Any]:
+    def _human_review(
+        self, state: WorkflowState, key: str, config: RunnableConfig | None = None
+    ) -> dict[str, Any]:
         print(f"{key} review by human")
+        if self.speculation is not None and config is not None:
+            self._speculate_next_stage(state, key, config["configurable"]["thread_id"])
         proposal = state.get(key)
-        proposal.change_request = interrupt({"key": key, "state": state})
+        # Only the reviewed proposal is shipped, the rest of the state is in the checkpoint
+        proposal.change_request = interrupt(
+            {"key": key, "proposal": proposal, "revision": proposal.revision}
+        )
         proposal.human_approved = proposal.change_request == ""
+        if not proposal.human_approved:
+            # The human's change request starts a new review round
+            proposal.iterations = 0
+            next_key = self._next_stage_key(key)
+            if self.speculation is not None and config is not None and next_key:
+                # Stop generating the next stage from the rejected proposal
+                self.speculation.discard(config["configurable"]["thread_id"], next_key)
+        elif config is not None:
+            # Snapshot every approved stage, unchanged stages are deduplicated by the store
+            self.state_store.save(config["configurable"]["thread_id"], state)
 
         # proposal.human_approved = proposal.human_approved or randint(1,2) > 1
         # TODO: proposal.change_request = "Please remove feature xy"
@@ -140,29 +310,72 @@ class IdeationWorkflow:
             key: proposal,
         }
 
-    def _save_state_to_json(self, state: WorkflowState) -> None:
-        """Save workflow state to JSON file."""
-        os.makedirs(".state", exist_ok=True)
-        filename = f".state/state_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(filename, "w") as f:
-            json.dump(
-                {
-                    "idea": state["idea"].content,
-                    "features": state["features"].model_dump(),
-                    "tech_stack": state["tech_stack"].model_dump(),
-                    "tasks": state["tasks"].model_dump(),
-                },
-                f,
-                indent=2,
-            )
-        print(f"\nState saved to {filename} ✓")
+    def _speculate_next_stage(self, state: WorkflowState, key: str, thread_id: str) -> None:
+        """Start generating the next stage from the agent-approved proposal under human review.
+
+        The result is reused if the human approves the proposal unchanged and discarded
+        (or rebased onto the regenerated proposal) otherwise.
+        """
+        next_key = self._next_stage_key(key)
+        if next_key is None:
+            return
+        speculative_state = {
+            **state,
+            **{k: state[k].model_copy(deep=True) for k in STAGE_KEYS},
+        }
+        speculative_state[key].human_approved = True
+        generator = self.generators[next_key]
+
+        async def speculate() -> dict[str, Any]:
+            # Speculative requests must not delay the requests the user waits for
+            with (
+                request_priority(Priority.BATCH),
+                telemetry.span(
+                    "node",
+                    f"{next_key}/speculative_generator",
+                    thread_id=thread_id,
+                    stage=next_key,
+                    iteration=1,
+                ),
+            ):
+                return await generator.process(speculative_state)
+
+        self.speculation.start(
+            thread_id,
+            next_key,
+            self._stage_fingerprint(speculative_state, next_key),
+            speculate,
+        )
+
+    @staticmethod
+    def _next_stage_key(key: str) -> str | None:
+        position = STAGE_KEYS.index(key)
+        return STAGE_KEYS[position + 1] if position + 1 < len(STAGE_KEYS) else None
 
-    def _log_tasks(self, state: WorkflowState) -> dict[str, Any]:
+    def _stage_fingerprint(self, state: WorkflowState, key: str) -> str:
+        """Fingerprint of the inputs a stage's generator depends on."""
+        earlier_keys = STAGE_KEYS[: STAGE_KEYS.index(key)]
+        proposal = state[key]
+        return fingerprint(
+            state["idea"].content,
+            [state[k].proposed_items for k in earlier_keys],
+            proposal.proposed_items,
+            proposal.change_request,
+        )
+
+    def _log_tasks(self, state: WorkflowState, config: RunnableConfig) -> dict[str, Any]:
         print("TASKS:\n* " + ("\n* ".join(state.get("tasks").proposed_items)))
-        self._save_state_to_json(state)
+        thread_id = config["configurable"]["thread_id"]
+        snapshot = self.state_store.save(thread_id, state)
+        print(f"\nState saved as snapshot {snapshot} of thread {thread_id} ✓")
         return {}
 
-    async def run(self, idea: str, thread_id: str = None) -> WorkflowState:
+    async def run(
+        self,
+        idea: str,
+        thread_id: str = None,
+        on_event: Callable[[dict[str, Any]], None] | None = None,
+    ) -> WorkflowState:
         """Execute workflow for a given idea."""
         if thread_id is None:
             thread_id = str(uuid.uuid4())
@@ -174,7 +387,64 @@ class IdeationWorkflow:
             "tech_stack": Proposal(),
             "tasks": Proposal(),
         }
+        return await self.invoke(initial_state, thread_id, on_event)
+
+    async def invoke(
+        self,
+        input: WorkflowState | Command | None,
+        thread_id: str,
+        on_event: Callable[[dict[str, Any]], None] | None = None,
+    ) -> WorkflowState:
+        """Run the graph until it completes or interrupts for a human review.
+
+        Args:
+            input: Initial state, ``Command(resume=...)`` to answer an interrupt, or None
+                to continue from the last checkpoint
+            thread_id: Thread of the run
+            on_event: Called with every custom stream event (e.g. streamed items)
+
+        Returns:
+            The state, with the pending interrupts under ``__interrupt__``
+        """
         config = {"configurable": {"thread_id": thread_id}}
-        result = await self.graph.ainvoke(initial_state, config)
+        if on_event is None:
+            return await self.graph.ainvoke(input, config)
+
+        async for _namespace, event in self.graph.astream(
+            input, config, stream_mode="custom", subgraphs=True
+        ):
+            on_event(event)
+        snapshot = await self.graph.aget_state(config, subgraphs=True)
+        interrupts = self._snapshot_interrupts(snapshot)
+        return {**snapshot.values, "__interrupt__": interrupts} if interrupts else snapshot.values
+
+    async def resume(
+        self, thread_id: str, on_event: Callable[[dict[str, Any]], None] | None = None
+    ) -> WorkflowState:
+        """Continue an interrupted run from its last checkpoint.
+
+        Returns the pending human review interrupt again if the run stopped there,
+        otherwise continues with the first node that did not complete.
+        """
+        config = {"configurable": {"thread_id": thread_id}}
+        snapshot = await self.graph.aget_state(config, subgraphs=True)
+        if not snapshot.values:
+            raise ValueError(f"No checkpoint found for thread '{thread_id}'")
+
+        interrupts = self._snapshot_interrupts(snapshot)
+        if interrupts:
+            return {**snapshot.values, "__interrupt__": interrupts}
+        if not snapshot.next:
+            return snapshot.values
+
+        return await self.invoke(None, thread_id, on_event)
+
+    def _snapshot_interrupts(self, snapshot) -> list:
+        return [interrupt for task in snapshot.tasks for interrupt in self._task_interrupts(task)]
 
-        return result
+    def _task_interrupts(self, task) -> list:
+        if task.interrupts:
+            return list(task.interrupts)
+        if task.state is not None:
+            return [i for subtask in task.state.tasks for i in self._task_interrupts(subtask)]
+        return []
@@ -0,0 +1,89 @@
+"""Retention policy for the message history of the workflow state.
+
+No node adds to the history yet, it only holds the idea. The retention policy guards the
+checkpoints against unbounded growth once agents record their turns in it.
+"""
+
+from collections.abc import Sequence
+
+from langchain_core.messages import AnyMessage, BaseMessage, SystemMessage
+from langgraph.graph.message import Messages, add_messages
+
+from makeitreal.config import history_settings
+from makeitreal.rate_limit import CHARS_PER_TOKEN, estimate_tokens
+
+SUMMARY_MESSAGE_ID = "history-summary"
+SUMMARY_HEADER = "Summary of earlier messages:"
+# Characters of each dropped message kept in the summary
+SUMMARY_EXCERPT_LENGTH = 200
+
+
+def add_messages_bounded(left: Messages, right: Messages) -> list[AnyMessage]:
+    """``add_messages`` reducer that applies the retention policy of ``history_settings``.
+
+    An update holding the summary message is a complete, already bounded history, e.g. the
+    output of a stage's sub graph. Messages it no longer holds were folded into its summary
+    and are dropped instead of being summarized again.
+    """
+    right = add_messages([], right)
+    if any(message.id == SUMMARY_MESSAGE_ID for message in right):
+        kept_ids = {message.id for message in right}
+        left = [message for message in add_messages([], left) if message.id in kept_ids]
+    return trim_history(
+        add_messages(left, right),
+        history_settings.history_max_messages,
+        history_settings.history_max_tokens,
+    )
+
+
+def trim_history(
+    messages: Sequence[BaseMessage], max_messages: int, max_tokens: int | None = None
+) -> list[BaseMessage]:
+    """Keep the first message, a summary of dropped messages and the latest messages.
+
+    The first message (the idea) is always kept. Older messages beyond ``max_messages``
+    or the token budget are folded into a single summary message holding an excerpt of
+    each, itself bounded by the token budget.
+
+    Args:
+        messages: Message history, oldest first
+        max_messages: Maximum number of messages kept, including first and summary
+        max_tokens: Estimated token budget of the kept messages, None for no budget
+
+    Returns:
+        The bounded message history
+    """
+    messages = list(messages)
+    if len(messages) <= max_messages and (
+        max_tokens is None or estimate_tokens(messages) <= max_tokens
+    ):
+        return messages
+
+    head, rest = messages[:1], messages[1:]
+    summary = None
+    if rest and rest[0].id == SUMMARY_MESSAGE_ID:
+        summary, rest = rest[0], rest[1:]
+
+    budget = None if max_tokens is None else max_tokens - estimate_tokens(head)
+    kept: list[BaseMessage] = []
+    # The latest messages get up to half of the budget, the summary the rest
+    for message in reversed(rest):
+        if len(kept) >= max(max_messages - 2, 0):
+            break
+        if budget is not None and estimate_tokens([*kept, message]) > budget // 2:
+            break
+        kept.insert(0, message)
+    dropped = rest[: len(rest) - len(kept)]
+    if not dropped:
+        return [*head, *([summary] if summary else []), *kept]
+
+    excerpts = summary.content.split("\n")[1:] if summary else []
+    excerpts += [f"{m.type}: {str(m.content)[:SUMMARY_EXCERPT_LENGTH]}" for m in dropped]
+    body = "\n".join(excerpts)
+    if budget is not None:
+        # Drop the oldest excerpts once the summary outgrows its share of the budget
+        overhead = estimate_tokens([*kept, SystemMessage(content=f"{SUMMARY_HEADER}\n")])
+        allowed = max(budget - overhead, 0) * CHARS_PER_TOKEN
+        body = body[max(len(body) - allowed, 0) :] if allowed else ""
+    summary = SystemMessage(content=f"{SUMMARY_HEADER}\n{body}", id=SUMMARY_MESSAGE_ID)
+    return [*head, summary, *kept]
@@ -0,0 +1,210 @@
+"""Shared, pooled OpenAI chat clients for all agents."""
+
+import importlib.util
+import time
+from collections.abc import AsyncIterator, Callable, Sequence
+from contextlib import asynccontextmanager
+from typing import Any
+
+import httpx
+import openai
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables import Runnable
+from langchain_openai import ChatOpenAI
+from pydantic import BaseModel
+
+from makeitreal import config
+from makeitreal.rate_limit import RateLimiter
+
+# Errors worth retrying: transient network issues, rate limits and server-side failures.
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class ThrottleCallbackHandler(BaseCallbackHandler):
+    """Reports the rate limit responses of every attempt, including retried ones."""
+
+    # Called on the event loop, the limiter is not thread-safe
+    run_inline = True
+
+    def __init__(self, rate_limiter: RateLimiter) -> None:
+        self.rate_limiter = rate_limiter
+        self.reported: set[int] = set()
+
+    def on_llm_error(self, error: BaseException, **kwargs: Any) -> None:
+        self.report(error)
+
+    def report(self, error: BaseException) -> None:
+        """Throttle the limiter once per rate limit error."""
+        if isinstance(error, openai.RateLimitError) and id(error) not in self.reported:
+            self.reported.add(id(error))
+            self.rate_limiter.throttle(_retry_after(error))
+
+
+def _retry_after(error: openai.RateLimitError) -> float | None:
+    try:
+        return float(error.response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class ChatClientRegistry:
+    """Factory handing out chat clients that share one tuned HTTP connection pool.
+
+    All clients created by the registry reuse the same keep-alive connections, are
+    admitted by one rate limiter (request and token budgets, adaptive concurrency and
+    priorities) and get the same retry and backoff policy.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry; clients are created on first use."""
+        self._http_client: httpx.AsyncClient | None = None
+        self._chat_models: dict[str, ChatOpenAI] = {}
+        self._rate_limiter: RateLimiter | None = None
+        # Incremented whenever the clients handed out so far are closed
+        self.generation = 0
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """The rate limiter admitting the requests of all agents."""
+        if self._rate_limiter is None:
+            settings = config.openai_settings
+            self._rate_limiter = RateLimiter(
+                requests_per_minute=settings.openai_requests_per_minute,
+                tokens_per_minute=settings.openai_tokens_per_minute,
+                max_concurrency=settings.openai_max_concurrency,
+                min_concurrency=settings.openai_min_concurrency,
+                latency_target=settings.openai_latency_target,
+                throttle_pause=settings.openai_backoff_initial,
+            )
+        return self._rate_limiter
+
+    def http_client(self) -> httpx.AsyncClient:
+        """The pooled HTTP client (HTTP/2 if enabled and the ``h2`` package is installed)."""
+        if self._http_client is None or self._http_client.is_closed:
+            if self._http_client is not None:
+                self.generation += 1
+            self._chat_models.clear()
+            self._http_client = httpx.AsyncClient(
+                http2=config.openai_settings.openai_http2
+                and importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(
+                    max_connections=config.openai_settings.openai_max_connections,
+                    max_keepalive_connections=config.openai_settings.openai_max_keepalive_connections,
+                    keepalive_expiry=config.openai_settings.openai_keepalive_expiry,
+                ),
+                timeout=config.openai_settings.openai_timeout,
+            )
+        return self._http_client
+
+    def chat_model(self, model: str | None = None) -> ChatOpenAI:
+        """Get the shared chat model client for the given (or configured) model name."""
+        model = model or config.openai_settings.openai_model
+        http_client = self.http_client()
+        if model not in self._chat_models:
+            self._chat_models[model] = ChatOpenAI(
+                model=model,
+                api_key=config.openai_settings.openai_api_key,
+                base_url=config.openai_settings.openai_base_url,
+                http_async_client=http_client,
+                timeout=config.openai_settings.openai_timeout,
+                # Report token usage of streamed responses too
+                stream_usage=True,
+                # Retries are handled by the registry's policy, see `_with_policies`
+                max_retries=0,
+            )
+        return self._chat_models[model]
+
+    def structured(self, schema: type[BaseModel], model: str | None = None) -> Runnable:
+        """Chat model bound to a structured output schema, with retry policy applied."""
+        return self._with_policies(
+            self.chat_model(model).with_structured_output(schema, method="function_calling")
+        )
+
+    def with_tools(self, tools: Sequence[Any], model: str | None = None) -> Runnable:
+        """Chat model bound to tools, with retry policy applied."""
+        return self._with_policies(self.chat_model(model).bind_tools(tools))
+
+    @asynccontextmanager
+    async def limit(self, estimated_tokens: int = 0) -> AsyncIterator[ThrottleCallbackHandler]:
+        """Admit an LLM request through the shared rate limiter.
+
+        The request's latency and rate limit errors adapt the limiter's concurrency.
+
+        Args:
+            estimated_tokens: Estimated tokens of the request, taken from the token budget
+
+        Yields:
+            Callback handler to pass to the request, reporting the rate limit responses
+            of retried attempts too
+        """
+        rate_limiter = self.rate_limiter
+        await rate_limiter.acquire(estimated_tokens)
+        throttle = ThrottleCallbackHandler(rate_limiter)
+        started = time.monotonic()
+        latency = None
+        try:
+            yield throttle
+            latency = time.monotonic() - started
+        except BaseException as e:
+            throttle.report(e)
+            raise
+        finally:
+            rate_limiter.release(latency)
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+            self.generation += 1
+        self._chat_models.clear()
+        if self._rate_limiter is not None:
+            self._rate_limiter.reset()
+
+    def _with_policies(self, runnable: Runnable) -> Runnable:
+        return runnable.with_retry(
+            retry_if_exception_type=RETRYABLE_ERRORS,
+            stop_after_attempt=config.openai_settings.openai_max_retries + 1,
+            wait_exponential_jitter=True,
+            exponential_jitter_params={
+                "initial": config.openai_settings.openai_backoff_initial,
+                "max": config.openai_settings.openai_backoff_max,
+            },
+        )
+
+
+# Global registry instance shared by all agents
+chat_clients = ChatClientRegistry()
+
+
+class pooled_runnable:  # noqa: N801 - used like ``functools.cached_property``
+    """Cached agent attribute holding a runnable built from ``chat_clients``.
+
+    The runnable is rebuilt once the registry closed its clients, so agents outlive
+    ``chat_clients.aclose()``. Assigning to the attribute replaces the runnable for good,
+    e.g. with a scripted model.
+    """
+
+    def __init__(self, build: Callable[[Any], Runnable]) -> None:
+        self.build = build
+        self.__doc__ = build.__doc__
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        generation, runnable = instance.__dict__.get(self.name, (-1, None))
+        if generation is not None and generation != chat_clients.generation:
+            runnable = self.build(instance)
+            instance.__dict__[self.name] = (chat_clients.generation, runnable)
+        return runnable
+
+    def __set__(self, instance: Any, value: Runnable) -> None:
+        instance.__dict__[self.name] = (None, value)
@@ -0,0 +1,246 @@
+"""Rate limiting primitives for LLM requests."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
+
+# Rough average of characters per token of OpenAI tokenizers for English text
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(messages: Sequence["BaseMessage"]) -> int:
+    """Estimate the prompt tokens of the given messages without calling a tokenizer."""
+    return sum(len(str(m.content)) // CHARS_PER_TOKEN + 4 for m in messages)
+
+
+class TokenBucket:
+    """Token bucket refilling ``per_minute`` tokens per minute.
+
+    The bucket holds at most one minute worth of tokens. Without a rate, tokens are
+    always available. Waiting for tokens is up to the caller, see ``RateLimiter``.
+    """
+
+    def __init__(self, per_minute: float | None = None) -> None:
+        """Initialize the bucket.
+
+        Args:
+            per_minute: Tokens per minute, ``None`` for no limit
+        """
+        self.configure(per_minute)
+
+    def configure(self, per_minute: float | None) -> None:
+        """Change the rate, starting with a full bucket."""
+        self.per_minute = per_minute
+        self._tokens = per_minute or 0.0
+        self._updated = time.monotonic()
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available, 0 if they are available now.
+
+        Requests larger than the bucket only wait for a full bucket.
+        """
+        if not self.per_minute:
+            return 0.0
+        self._refill()
+        missing = min(amount, self.per_minute) - self._tokens
+        return max(missing, 0.0) * 60 / self.per_minute
+
+    def take(self, amount: float) -> None:
+        """Take ``amount`` tokens (at most a full bucket) without waiting."""
+        if self.per_minute:
+            self._refill()
+            self._tokens -= min(amount, self.per_minute)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.per_minute, self._tokens + (now - self._updated) * self.per_minute / 60
+        )
+        self._updated = now
+
+
+class Priority(IntEnum):
+    """Admission priority of LLM requests, lower values go first.
+
+    Priorities order the requests waiting for the limiter of one process only, separate
+    processes (e.g. an interactive session next to a batch run) compete for the rate
+    limits of the provider on equal terms.
+    """
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+_priority: ContextVar[Priority] = ContextVar("request_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """Admit the LLM requests made within the block (and its tasks) with ``priority``."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class RateLimiter:
+    """Admission control shared by all LLM requests of the process.
+
+    Requests are admitted in priority order (then first come, first served) once
+
+    * the requests-per-minute and tokens-per-minute buckets hold enough capacity for
+      the request's estimated tokens,
+    * fewer requests than the concurrency limit are in flight and
+    * no rate limit response paused admissions.
+
+    The concurrency limit adapts to the provider (AIMD): it grows by one per window of
+    successful requests up to ``max_concurrency`` and is halved on rate limit
+    responses or, with a ``latency_target``, on slower responses.
+    """
+
+    # Concurrency is decreased at most once per interval, so a burst of rate limit
+    # responses to the same window of requests counts as one signal
+    DECREASE_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        latency_target: float | None = None,
+        throttle_pause: float = 1.0,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request budget, ``None`` for no limit
+            tokens_per_minute: Estimated token budget, ``None`` for no limit
+            max_concurrency: Upper bound (and initial value) of the concurrency limit
+            min_concurrency: Lower bound of the concurrency limit
+            latency_target: Seconds per request above which concurrency is decreased,
+                ``None`` to adapt to rate limit responses only
+            throttle_pause: Seconds admissions pause after a rate limit response
+                without ``Retry-After`` header
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = max(1, min(min_concurrency, max_concurrency))
+        self.latency_target = latency_target
+        self.throttle_pause = throttle_pause
+        self.concurrency = float(max_concurrency)
+        self.in_flight = 0
+        self.throttled = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._waiters: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._changed: asyncio.Event | None = None
+
+    async def acquire(self, estimated_tokens: int = 0, priority: Priority | None = None) -> float:
+        """Wait until the request is admitted.
+
+        Args:
+            estimated_tokens: Estimated tokens of the request
+            priority: Admission priority (defaults to the one of ``request_priority``)
+
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        entry = (_priority.get() if priority is None else priority, next(self._sequence))
+        heapq.heappush(self._waiters, entry)
+        try:
+            while True:
+                delay = None
+                if self._waiters[0] == entry:
+                    delay = self._admission_delay(estimated_tokens)
+                    if delay == 0:
+                        heapq.heappop(self._waiters)
+                        self.requests.take(1)
+                        self.tokens.take(estimated_tokens)
+                        self.in_flight += 1
+                        self._notify()
+                        return time.monotonic() - started
+                await self._wait(delay)
+        except BaseException:
+            if entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._notify()
+            raise
+
+    def release(self, latency: float | None = None) -> None:
+        """Finish an admitted request, adapting the concurrency to its latency.
+
+        Args:
+            latency: Seconds the request took, None if it failed
+        """
+        self.in_flight -= 1
+        if latency is not None:
+            if self.latency_target is not None and latency > self.latency_target:
+                self._decrease()
+            else:
+                # Additive increase: about one more request per window of successes
+                self.concurrency = min(
+                    self.max_concurrency, self.concurrency + 1 / max(self.concurrency, 1)
+                )
+        self._notify()
+
+    def throttle(self, retry_after: float | None = None) -> None:
+        """Report a rate limit response: pause admissions and decrease the concurrency.
+
+        Args:
+            retry_after: Seconds to pause as requested by the provider
+        """
+        self.throttled += 1
+        pause = self.throttle_pause if retry_after is None else retry_after
+        self._paused_until = max(self._paused_until, time.monotonic() + pause)
+        self._decrease()
+        self._notify()
+
+    def reset(self) -> None:
+        """Forget waiters and the event loop bound wake-up event, e.g. after closing a loop."""
+        self._waiters.clear()
+        self._changed = None
+        self.in_flight = 0
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease >= self.DECREASE_INTERVAL:
+            self._last_decrease = now
+            self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+
+    def _admission_delay(self, estimated_tokens: int) -> float | None:
+        """Seconds until the request can be admitted, None to wait for a release."""
+        if self.in_flight >= int(self.concurrency):
+            return None
+        return max(
+            self._paused_until - time.monotonic(),
+            self.requests.wait_time(1),
+            self.tokens.wait_time(estimated_tokens),
+            0.0,
+        )
+
+    async def _wait(self, timeout: float | None) -> None:
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        with suppress(TimeoutError):
+            await asyncio.wait_for(self._changed.wait(), timeout)
+
+    def _notify(self) -> None:
+        """Wake up all waiters to re-check whether the first one can be admitted."""
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
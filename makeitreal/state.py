@@ -3,9 +3,10 @@
 from typing import Annotated, TypedDict
 
 from langchain_core.messages import BaseMessage
-from langgraph.graph.message import add_messages
 from pydantic import BaseModel
 
+from makeitreal.history import add_messages_bounded
+
 
 class Proposal(BaseModel):
     """A set of proposed items that is subject to review."""
@@ -14,12 +15,21 @@ class Proposal(BaseModel):
     change_request: str | None = None
     agent_approved: bool = False
     human_approved: bool = False
+    # Incremented whenever the items are (re)generated, identifies what a human reviewed
+    revision: int = 0
+    # Generator/reviewer loop bookkeeping of the current review round
+    iterations: int = 0
+    item_change: float | None = None
+    previous_item_change: float | None = None
+    previous_change_request: str | None = None
+    exit_reason: str | None = None
 
 
 class WorkflowState(TypedDict):
     """State schema for the ideation workflow."""
 
-    messages: Annotated[list[BaseMessage], add_messages]
+    # Bounded by the retention policy of `history_settings` in every (sub) graph
+    messages: Annotated[list[BaseMessage], add_messages_bounded]
     idea: BaseMessage
     features: Proposal
     tech_stack: Proposal
@@ -0,0 +1,133 @@
+"""Append-only, content-addressed store of workflow state snapshots."""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from typing import TYPE_CHECKING, Any
+
+from makeitreal.config import checkpoint_settings
+
+if TYPE_CHECKING:
+    from makeitreal.state import Proposal, WorkflowState
+
+STATE_FORMAT_VERSION = 1
+STAGES = ("idea", "features", "tech_stack", "tasks")
+
+
+class StateStore:
+    """Stores snapshots of the workflow state per thread.
+
+    Every thread has a directory holding an append-only ``log.jsonl`` and an
+    ``objects`` directory. Each log line is a snapshot referencing the stages by the
+    content hash of their gzip-compressed JSON object, so unchanged stages are stored
+    only once and a single stage can be loaded without reading the others.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        """Initialize the store.
+
+        Args:
+            path: Root directory of the store (defaults to ``checkpoint_settings``)
+        """
+        self.path = path or checkpoint_settings.state_store_path
+
+    def save(self, thread_id: str, state: "WorkflowState") -> int:
+        """Append a snapshot of the state unless it equals the latest one.
+
+        Returns:
+            Number of the snapshot holding the state
+        """
+        stages = {
+            "idea": self._write_object(thread_id, state["idea"].content),
+            **{
+                stage: self._write_object(thread_id, state[stage].model_dump())
+                for stage in STAGES[1:]
+            },
+        }
+        snapshots = self.snapshots(thread_id)
+        if snapshots and snapshots[-1]["stages"] == stages:
+            return len(snapshots) - 1
+
+        entry = {"version": STATE_FORMAT_VERSION, "created_at": time.time(), "stages": stages}
+        with open(self._log_path(thread_id), "a") as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        return len(snapshots)
+
+    def snapshots(self, thread_id: str) -> list[dict[str, Any]]:
+        """The log entries of a thread, oldest first."""
+        try:
+            with open(self._log_path(thread_id)) as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def threads(self) -> list[str]:
+        """Directory names of the stored threads."""
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(
+            name
+            for name in os.listdir(self.path)
+            if os.path.exists(os.path.join(self.path, name, "log.jsonl"))
+        )
+
+    def load_stage(self, thread_id: str, stage: str, snapshot: int = -1) -> "str | Proposal":
+        """Load a single stage of a snapshot.
+
+        Args:
+            thread_id: Thread of the run
+            stage: One of ``STAGES``
+            snapshot: Snapshot number, negative numbers count from the latest
+
+        Returns:
+            The idea text or the stage's proposal
+
+        Raises:
+            KeyError: If the thread has no such snapshot or stage
+        """
+        from makeitreal.state import Proposal
+
+        if stage not in STAGES:
+            raise KeyError(f"Unknown stage '{stage}', expected one of {STAGES}")
+        value = self._read_object(thread_id, self._snapshot(thread_id, snapshot)["stages"][stage])
+        return value if stage == "idea" else Proposal.model_validate(value)
+
+    def export(self, thread_id: str, snapshot: int = -1) -> dict[str, Any]:
+        """Load a snapshot in the JSON shape of the former ``state_<timestamp>.json`` files."""
+        stages = self._snapshot(thread_id, snapshot)["stages"]
+        return {stage: self._read_object(thread_id, stages[stage]) for stage in STAGES}
+
+    def _snapshot(self, thread_id: str, snapshot: int) -> dict[str, Any]:
+        snapshots = self.snapshots(thread_id)
+        try:
+            return snapshots[snapshot]
+        except IndexError:
+            raise KeyError(f"Thread '{thread_id}' has no snapshot {snapshot}") from None
+
+    def _thread_path(self, thread_id: str) -> str:
+        return os.path.join(self.path, re.sub(r"[^\w.-]", "_", thread_id))
+
+    def _log_path(self, thread_id: str) -> str:
+        return os.path.join(self._thread_path(thread_id), "log.jsonl")
+
+    def _object_path(self, thread_id: str, digest: str) -> str:
+        return os.path.join(self._thread_path(thread_id), "objects", f"{digest}.json.gz")
+
+    def _write_object(self, thread_id: str, value: Any) -> str:
+        data = json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(thread_id, digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so readers never see partial objects
+            with open(path + ".tmp", "wb") as f:
+                f.write(gzip.compress(data, mtime=0))
+            os.replace(path + ".tmp", path)
+        return digest
+
+    def _read_object(self, thread_id: str, digest: str) -> Any:
+        with open(self._object_path(thread_id, digest), "rb") as f:
+            return json.loads(gzip.decompress(f.read()))
@@ -1,5 +1,6 @@
 """Subcommands for MakeItReal CLI."""
 
 from .dump_graph import dump
+from .warmup_docs import warmup
 
-__all__ = ["dump"]
+__all__ = ["dump", "warmup"]
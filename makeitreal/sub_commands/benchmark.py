@@ -0,0 +1,99 @@
+import asyncio
+import os
+from dataclasses import replace
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+app = typer.Typer(help="Benchmark the workflow offline")
+console = Console()
+
+
+@app.command()
+def benchmark(
+    scenarios: list[str] | None = typer.Argument(
+        None, help="Scenarios to run: single-pass, review-loop, tool-heavy (default: all)"
+    ),
+    runs: int = typer.Option(10, "--runs", "-n", help="Ideas processed per scenario"),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", help="Ideas processed at once"),
+    latency: float | None = typer.Option(
+        None, "--latency", help="Seconds per scripted LLM response (default: the scenario's)"
+    ),
+    tool_latency: float | None = typer.Option(
+        None, "--tool-latency", help="Seconds per stub tool call (default: the scenario's)"
+    ),
+    memory: bool = typer.Option(
+        True, "--memory/--no-memory", help="Repeat the runs with tracemalloc to measure memory"
+    ),
+    results: str = typer.Option(
+        ".state/benchmarks/results.jsonl", "--results", help="JSONL history of the results"
+    ),
+    record: bool = typer.Option(True, "--record/--no-record", help="Append to the history"),
+) -> None:
+    """Run scripted workflows with a local fake LLM, stub tools and a fake MCP server."""
+    # No request reaches the API, but the settings require a key to be present
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    from makeitreal.benchmark.harness import SCENARIOS, record_result, run_scenario
+
+    unknown = set(scenarios or []) - set(SCENARIOS)
+    if unknown:
+        raise typer.BadParameter(
+            f"Unknown scenarios {sorted(unknown)}, expected some of {list(SCENARIOS)}"
+        )
+
+    summary = Table(
+        "Scenario",
+        "Runs/s",
+        "p50 s",
+        "p95 s",
+        "LLM req/run",
+        "Tokens/run",
+        "Tool calls/run",
+        "Checkpoints/run",
+        "Checkpoint KiB/run",
+        "Peak MiB",
+        "vs. last",
+        title=f"{runs} runs, {concurrency} at a time",
+    )
+    nodes = Table("Scenario", "Node", "Count", "Mean ms", "Max ms", title="Node durations")
+    for name in scenarios or SCENARIOS:
+        scenario = SCENARIOS[name]
+        if latency is not None:
+            scenario = replace(scenario, latency=latency)
+        if tool_latency is not None:
+            scenario = replace(scenario, tool_latency=tool_latency)
+        console.print(f"[dim]{name}: {scenario.description}[/dim]")
+        result = asyncio.run(run_scenario(scenario, runs, concurrency, memory))
+
+        change = ""
+        previous = record_result(result, results) if record else None
+        if previous and previous["metrics"]["throughput"]:
+            ratio = result.throughput / previous["metrics"]["throughput"] - 1
+            change = f"{ratio:+.1%} ({previous['commit'] or 'unknown commit'})"
+        summary.add_row(
+            name,
+            f"{result.throughput:.2f}",
+            f"{result.percentile(50):.3f}",
+            f"{result.percentile(95):.3f}",
+            f"{result.llm_requests / runs:.1f}",
+            f"{(result.prompt_tokens + result.completion_tokens) / runs:.0f}",
+            f"{result.tool_calls / runs:.1f}",
+            f"{result.checkpoints / runs:.1f}",
+            f"{result.checkpoint_bytes / runs / 1024:.1f}",
+            f"{result.peak_memory / 2**20:.1f}" if result.peak_memory is not None else "",
+            change,
+        )
+        for node, stats in result.nodes.items():
+            nodes.add_row(
+                name,
+                node,
+                str(stats["count"]),
+                f"{stats['mean'] * 1000:.1f}",
+                f"{stats['max'] * 1000:.1f}",
+            )
+
+    console.print(summary)
+    console.print(nodes)
+    if record:
+        console.print(f"[dim]Results appended to {results}[/dim]")
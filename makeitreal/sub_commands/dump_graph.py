@@ -2,42 +2,30 @@ import asyncio
 
 import typer
 
-from makeitreal.agents.requirements_generator_agent import RequirementsGeneratorAgent
-from makeitreal.agents.requirements_review_agent import RequirementsReviewAgent
-from makeitreal.graph import IdeationWorkflow
-
 app = typer.Typer(help="Dump workflow graph")
 
 
-async def _dump(workflow: IdeationWorkflow) -> None:
-    """Dump the AI workflow graph mermaid diagram."""
-    await workflow.ainit()
-
-    print("Main Graph (top-level; each node is actually a sub graph):")
-    print("```mermaid")
-    print(workflow.graph.get_graph().draw_mermaid())
-    print("```")
-    print(
-        "Sub graph (used within each `requirements_analysis`, `techstack_discovery`, "
-        "`task_creation` in the graph above)"
-    )
-    print("```mermaid")
-    print(
-        (
-            await workflow._build_proposal_graph(
-                key="features",
-                generator_agent=RequirementsGeneratorAgent(),
-                review_agent=RequirementsReviewAgent(),
-            )
+@app.command()
+def dump(
+    graph_format: str = typer.Option(
+        "mermaid", "--format", "-f", help="Output format: mermaid, dot or json"
+    ),
+    xray: bool = typer.Option(
+        True, "--xray/--no-xray", help="Inline the stages' sub graphs into one diagram"
+    ),
+    output: str | None = typer.Option(None, "--output", "-o", help="File to write, - for stdout"),
+) -> None:
+    """Dump the AI workflow graph without LLM clients, credentials or connections."""
+    from makeitreal.graph.export import GRAPH_FORMATS, build_offline_graph, export_graph
+
+    if graph_format not in GRAPH_FORMATS:
+        raise typer.BadParameter(
+            f"Unknown format '{graph_format}', expected one of {GRAPH_FORMATS}"
         )
-        .get_graph()
-        .draw_mermaid()
-    )
-    print("```")
 
-
-@app.command()
-def dump() -> None:
-    """Dump the AI workflow graph mermaid diagram."""
-    workflow = IdeationWorkflow()
-    asyncio.run(_dump(workflow))
+    content = export_graph(asyncio.run(build_offline_graph()), graph_format, xray)
+    if output is None or output == "-":
+        print(content)
+    else:
+        with open(output, "w") as f:
+            f.write(content + "\n")
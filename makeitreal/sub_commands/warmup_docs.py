@@ -0,0 +1,64 @@
+import asyncio
+
+import typer
+
+app = typer.Typer(help="Preload the Context7 documentation cache")
+
+COMMON_LIBRARIES = [
+    "react",
+    "next.js",
+    "vue",
+    "angular",
+    "svelte",
+    "tailwindcss",
+    "express",
+    "nestjs",
+    "fastapi",
+    "django",
+    "flask",
+    "sqlalchemy",
+    "pydantic",
+    "langchain",
+    "postgresql",
+    "mongodb",
+    "redis",
+    "prisma",
+    "spring boot",
+    "flutter",
+]
+
+
+async def _warmup(libraries: list[str], topic: str | None) -> None:
+    """Resolve and fetch the documentation of all libraries concurrently."""
+    from makeitreal.tools.mcp_client import (
+        close_mcp_client,
+        context7_cache_stats,
+        search_library_documentation,
+    )
+
+    try:
+        docs = await asyncio.gather(
+            *(search_library_documentation(library, topic) for library in libraries),
+            return_exceptions=True,
+        )
+    finally:
+        await close_mcp_client()
+
+    for library, doc in zip(libraries, docs, strict=True):
+        if isinstance(doc, Exception):
+            print(f"✗ {library}: {doc}")
+        else:
+            print(f"{'✓' if doc else '✗'} {library}")
+    for namespace, stats in context7_cache_stats().items():
+        print(f"{namespace}: {stats.hits} hits, {stats.misses} misses")
+
+
+@app.command()
+def warmup(
+    libraries: list[str] | None = typer.Argument(
+        None, help="Libraries to preload (defaults to a list of common libraries)"
+    ),
+    topic: str | None = typer.Option(None, "--topic", help="Documentation topic to focus on"),
+) -> None:
+    """Preload the Context7 library id and documentation cache."""
+    asyncio.run(_warmup(libraries or COMMON_LIBRARIES, topic))
@@ -0,0 +1,279 @@
+"""Structured latency, token and cost instrumentation of workflow runs."""
+
+import json
+import os
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+# USD per million input, cached input and output tokens, matched by model name prefix
+MODEL_PRICES = {
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+}
+SPAN_KINDS = ("node", "llm", "tool")
+# Model tiers of review requests, see `Telemetry.review_tiering`
+REVIEW_TIERS = ("primary", "escalation")
+
+# Attributes (thread id, stage, iteration, tier) inherited by nested spans
+_INHERITED = ("thread_id", "stage", "iteration", "tier")
+_context: ContextVar[dict[str, Any] | None] = ContextVar("telemetry_context", default=None)
+
+
+def estimate_cost(
+    model: str | None, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0
+) -> float:
+    """Estimate the USD cost of a request, 0 for models without known prices."""
+    prefix = max((p for p in MODEL_PRICES if model and model.startswith(p)), key=len, default=None)
+    if prefix is None:
+        return 0.0
+    input_price, cached_price, output_price = MODEL_PRICES[prefix]
+    return (
+        (prompt_tokens - cached_tokens) * input_price
+        + cached_tokens * cached_price
+        + completion_tokens * output_price
+    ) / 1_000_000
+
+
+@dataclass
+class Span:
+    """A timed unit of work: a graph node, an LLM request or a tool call."""
+
+    kind: str
+    name: str
+    thread_id: str | None = None
+    stage: str | None = None
+    iteration: int | None = None
+    started_at: float = field(default_factory=time.time)
+    duration: float = 0.0
+    queue_time: float = 0.0
+    model: str | None = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    # Whether the token counts are estimates because the API reported no usage
+    estimated_tokens: bool = False
+    cost: float = 0.0
+    cache_hit: bool | None = None
+    error: str | None = None
+    # One of `REVIEW_TIERS` for reviews by a cheaper model than the default
+    tier: str | None = None
+
+    def record_usage(
+        self,
+        model: str | None,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cached_tokens: int = 0,
+        estimated: bool = False,
+    ) -> None:
+        """Add the token usage of a request and its estimated cost."""
+        self.model = model
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.cached_tokens += cached_tokens
+        self.estimated_tokens = self.estimated_tokens or estimated
+        self.cost += estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens)
+
+
+@dataclass
+class SpanSummary:
+    """Aggregated spans of one kind and name."""
+
+    kind: str
+    name: str
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    queue_time: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cost: float = 0.0
+    cache_hits: int = 0
+    errors: int = 0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass
+class TieringSummary:
+    """Reviews of one stage by a cheaper model, compared with running all on the default model."""
+
+    stage: str
+    reviews: int = 0
+    escalations: int = 0
+    primary_time: float = 0.0
+    escalation_time: float = 0.0
+    primary_cost: float = 0.0
+    escalation_cost: float = 0.0
+    # The primary reviews' tokens priced for the default model
+    baseline_cost: float = 0.0
+
+    @property
+    def saved_cost(self) -> float:
+        return self.baseline_cost - self.primary_cost - self.escalation_cost
+
+    @property
+    def saved_time(self) -> float | None:
+        """Time saved, assuming every review took as long as the escalated ones.
+
+        None without escalations to measure the default model's latency by.
+        """
+        if not self.escalations:
+            return None
+        baseline = self.reviews * self.escalation_time / self.escalations
+        return baseline - self.primary_time - self.escalation_time
+
+
+class Telemetry:
+    """Collects spans and optionally appends them to a JSONL trace file.
+
+    Recording is disabled until ``configure`` enables it, so instrumented code costs
+    next to nothing in regular runs.
+    """
+
+    def __init__(self) -> None:
+        """Initialize disabled telemetry without spans."""
+        self.enabled = False
+        self.trace_path: str | None = None
+        self.spans: list[Span] = []
+
+    def configure(self, enabled: bool = True, trace_path: str | None = None) -> None:
+        """Enable or disable recording.
+
+        Args:
+            enabled: Record spans in memory
+            trace_path: Also append every span as a JSON line to this file
+        """
+        self.enabled = enabled or trace_path is not None
+        self.trace_path = trace_path
+        if trace_path and os.path.dirname(trace_path):
+            os.makedirs(os.path.dirname(trace_path), exist_ok=True)
+
+    @contextmanager
+    def span(self, kind: str, name: str, **attributes: Any) -> Iterator[Span]:
+        """Time the block as a span.
+
+        The span inherits thread id, stage and iteration from enclosing spans, and
+        attributes given here are inherited by nested spans.
+
+        Args:
+            kind: One of ``SPAN_KINDS``
+            name: Node, agent or tool name
+            attributes: Span fields, e.g. ``thread_id``, ``stage`` or ``iteration``
+
+        Yields:
+            The span, to record usage, queue time or cache hits on
+        """
+        context = _context.get() or {}
+        inherited = {k: v for k, v in attributes.items() if k in _INHERITED}
+        span = Span(kind=kind, name=name, **(context | attributes))
+        token = _context.set(context | inherited)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.duration = time.perf_counter() - started
+            _context.reset(token)
+            if self.enabled:
+                self.record(span)
+
+    @contextmanager
+    def attributes(self, **attributes: Any) -> Iterator[None]:
+        """Tag the spans started within the block without timing it as a span itself.
+
+        Args:
+            attributes: Inherited span fields, e.g. ``tier``
+        """
+        token = _context.set((_context.get() or {}) | attributes)
+        try:
+            yield
+        finally:
+            _context.reset(token)
+
+    def record(self, span: Span) -> None:
+        """Store a finished span and append it to the trace file."""
+        self.spans.append(span)
+        if self.trace_path:
+            with open(self.trace_path, "a") as f:
+                f.write(json.dumps(asdict(span)) + "\n")
+
+    def summary(self) -> list[SpanSummary]:
+        """Aggregate the recorded spans by kind and name, slowest first."""
+        summaries: dict[tuple[str, str], SpanSummary] = {}
+        for span in self.spans:
+            summary = summaries.setdefault(
+                (span.kind, span.name), SpanSummary(kind=span.kind, name=span.name)
+            )
+            summary.count += 1
+            summary.total += span.duration
+            summary.max = max(summary.max, span.duration)
+            summary.queue_time += span.queue_time
+            summary.prompt_tokens += span.prompt_tokens
+            summary.completion_tokens += span.completion_tokens
+            summary.cached_tokens += span.cached_tokens
+            summary.cost += span.cost
+            summary.cache_hits += bool(span.cache_hit)
+            summary.errors += span.error is not None
+        return sorted(summaries.values(), key=lambda s: (SPAN_KINDS.index(s.kind), -s.total))
+
+    def totals_by_thread(self) -> dict[str, SpanSummary]:
+        """Tokens and cost of the LLM requests per thread."""
+        totals: dict[str, SpanSummary] = defaultdict(lambda: SpanSummary(kind="llm", name=""))
+        for span in self.spans:
+            if span.kind == "llm":
+                total = totals[span.thread_id or ""]
+                total.count += 1
+                total.prompt_tokens += span.prompt_tokens
+                total.completion_tokens += span.completion_tokens
+                total.cost += span.cost
+        return dict(totals)
+
+    def review_tiering(self, default_model: str) -> dict[str, TieringSummary]:
+        """Latency and cost of the tiered review requests per stage.
+
+        Args:
+            default_model: The stronger model that reviews escalate to
+
+        Returns:
+            Summaries by stage, empty if no review ran on a cheaper model
+        """
+        summaries: dict[str, TieringSummary] = {}
+        for span in self.spans:
+            if span.kind != "llm" or span.tier is None or span.cache_hit:
+                continue
+            stage = span.stage or ""
+            summary = summaries.setdefault(stage, TieringSummary(stage=stage))
+            if span.tier == "escalation":
+                summary.escalations += 1
+                summary.escalation_time += span.duration
+                summary.escalation_cost += span.cost
+            else:
+                summary.reviews += 1
+                summary.primary_time += span.duration
+                summary.primary_cost += span.cost
+                summary.baseline_cost += estimate_cost(
+                    default_model, span.prompt_tokens, span.completion_tokens, span.cached_tokens
+                )
+        return summaries
+
+    def reset(self) -> None:
+        """Drop the recorded spans."""
+        self.spans.clear()
+
+
+# Global telemetry shared by the workflow, the agents and their tools
+telemetry = Telemetry()
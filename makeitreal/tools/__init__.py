@@ -1,9 +1,25 @@
 """Tools package for makeitreal agents."""
 
-from .context7_search import search_library_docs
-from .web_search import search_suitable_techstack
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .context7_search import search_library_docs
+    from .web_search import search_suitable_techstack
 
 __all__ = [
     "search_suitable_techstack",
     "search_library_docs",
 ]
+
+# The HTTP clients and parsers of the tools are imported on first access only
+_LAZY_ATTRIBUTES = {
+    "search_suitable_techstack": ".web_search",
+    "search_library_docs": ".context7_search",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,20 +1,66 @@
 """MCP Client wrapper for Context7 communication."""
 
+import functools
+import itertools
 import json
+from collections.abc import AsyncIterable, AsyncIterator
 from typing import Any
 
 import aiohttp
 
+from makeitreal.cache import CacheStats, SqliteCache
+from makeitreal.config import cache_settings, tool_settings
+
+
+async def _iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines as chunks arrive, regardless of line length."""
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer.extend(chunk)
+        if b"\n" not in chunk:
+            continue
+        *lines, rest = buffer.split(b"\n")
+        buffer = bytearray(rest)
+        for line in lines:
+            yield line.decode("utf-8").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8").rstrip("\r")
+
+
+async def _iter_sse_events(lines: AsyncIterable[str]) -> AsyncIterator[tuple[str, str]]:
+    """Parse server-sent events, yielding ``(event, data)`` as soon as each frame is complete.
+
+    Multi-line ``data:`` fields are joined with newlines, comments are skipped.
+    """
+    event, data = "message", []
+    async for line in lines:
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        value = value.removeprefix(" ")
+        if field == "event":
+            event = value
+        elif field == "data":
+            data.append(value)
+    if data:
+        yield event, "\n".join(data)
+
 
 class MCPClient:
     """Async MCP Client for Context7 communication via Docker container."""
 
-    def __init__(self, container_name: str = "context7-mcp"):
+    def __init__(self, container_name: str = "context7-mcp", base_url: str | None = None):
         """Initialize MCP client."""
         self.container_name = container_name
         self.session: aiohttp.ClientSession | None = None
-        self.base_url = f"http://{container_name}:8080/mcp"
-        self.request_id = 0
+        self.base_url = base_url or f"http://{container_name}:8080/mcp"
+        # Request ids are drawn atomically, so concurrent requests never share an id
+        self._request_ids = itertools.count(1)
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -25,9 +71,21 @@ class MCPClient:
         """Async context manager exit."""
         await self.disconnect()
 
+    @property
+    def connected(self) -> bool:
+        """Whether the client holds an open HTTP session."""
+        return self.session is not None and not self.session.closed
+
     async def connect(self) -> None:
-        """Connect to the Context7 MCP server via HTTP."""
-        self.session = aiohttp.ClientSession()
+        """Connect to the Context7 MCP server via HTTP, reusing pooled keep-alive connections."""
+        if self.connected:
+            return
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=tool_settings.mcp_max_connections,
+                keepalive_timeout=tool_settings.mcp_keepalive_timeout,
+            )
+        )
 
     async def disconnect(self) -> None:
         """Disconnect from the MCP server."""
@@ -37,11 +95,11 @@ class MCPClient:
 
     async def _send_request(self, method: str, params: dict[str, Any]) -> dict[str, Any]:
         """Send a JSON-RPC request to the MCP server via HTTP."""
-        if not self.session:
+        if not self.connected:
             raise RuntimeError("MCP client not connected")
 
-        self.request_id += 1
-        request = {"jsonrpc": "2.0", "id": self.request_id, "method": method, "params": params}
+        request_id = next(self._request_ids)
+        request = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
 
         async with self.session.post(
             self.base_url,
@@ -54,14 +112,26 @@ class MCPClient:
             if response.status != 200:
                 raise RuntimeError(f"HTTP error: {response.status}")
 
-            # Parse SSE format: "event: message\ndata: {json}"
-            response_text = await response.text()
-            for line in response_text.strip().split("\n"):
-                if line.startswith("data: "):
-                    data = json.loads(line[6:])
-                    if "error" in data:
-                        raise RuntimeError(f"MCP server error: {data['error']}")
-                    return data.get("result", {})
+            if response.content_type == "application/json":
+                return self._parse_response(await response.json())
+
+            # Parse SSE frames ("event: message\ndata: {json}") while they arrive and
+            # return on the frame answering this request, skipping notifications
+            lines = _iter_lines(response.content.iter_any())
+            async for _, payload in _iter_sse_events(lines):
+                data = json.loads(payload)
+                if data.get("id") == request_id:
+                    # Read the stream to its end, so the connection returns to the pool
+                    await response.content.read()
+                    await response.release()
+                    return self._parse_response(data)
+
+        raise RuntimeError(f"MCP server sent no response to request {request_id}")
+
+    def _parse_response(self, data: dict[str, Any]) -> dict[str, Any]:
+        if "error" in data:
+            raise RuntimeError(f"MCP server error: {data['error']}")
+        return data.get("result", {})
 
     async def resolve_library_id(self, library_name: str) -> str | None:
         """Resolve a library name to Context7-compatible library ID."""
@@ -95,10 +165,75 @@ class MCPClient:
         return None
 
 
-async def search_library_documentation(library_name: str, topic: str | None = None) -> str | None:
+# Process-wide client sharing one connection pool between all lookups
+_shared_client: MCPClient | None = None
+
+
+async def get_mcp_client() -> MCPClient:
+    """Get the shared, connected MCP client."""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = MCPClient(base_url=tool_settings.context7_mcp_url)
+    await _shared_client.connect()
+    return _shared_client
+
+
+async def close_mcp_client() -> None:
+    """Close the shared MCP client's connections."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.disconnect()
+        _shared_client = None
+
+
+@functools.cache
+def _context7_cache(namespace: str) -> SqliteCache:
+    """Two-level Context7 cache.
+
+    ``context7_ids`` maps library names to Context7 ids (long TTL), ``context7_docs``
+    maps (library id, topic, tokens) to documentation texts (shorter TTL, size-capped).
+    """
+    if namespace == "context7_ids":
+        max_entries, ttl = (
+            cache_settings.context7_id_cache_max_entries,
+            cache_settings.context7_id_cache_ttl,
+        )
+    else:
+        max_entries, ttl = (
+            cache_settings.context7_docs_cache_max_entries,
+            cache_settings.context7_docs_cache_ttl,
+        )
+    return SqliteCache(cache_settings.cache_path, namespace, max_entries=max_entries, ttl=ttl)
+
+
+def context7_cache_stats() -> dict[str, CacheStats]:
+    """Hit/miss metrics of the Context7 library id and documentation caches."""
+    return {
+        namespace: _context7_cache(namespace).stats
+        for namespace in ("context7_ids", "context7_docs")
+    }
+
+
+async def search_library_documentation(
+    library_name: str, topic: str | None = None, tokens: int = 10000
+) -> str | None:
     """Search for library documentation using Context7 MCP."""
-    async with MCPClient() as client:
-        library_id = await client.resolve_library_id(library_name)
-        if library_id:
-            return await client.get_library_docs(library_id, topic)
+    use_cache = cache_settings.cache_enabled
+    client = await get_mcp_client()
+
+    name_key = " ".join(library_name.lower().split())
+    cached_id = _context7_cache("context7_ids").get(name_key) if use_cache else None
+    library_id = cached_id.value if cached_id else await client.resolve_library_id(library_name)
+    if not library_id:
         return None
+    if use_cache and not cached_id:
+        _context7_cache("context7_ids").set(name_key, library_id)
+
+    docs_key = json.dumps([library_id, topic, tokens])
+    cached_docs = _context7_cache("context7_docs").get(docs_key) if use_cache else None
+    if cached_docs:
+        return cached_docs.value
+    docs = await client.get_library_docs(library_id, topic, tokens)
+    if use_cache and docs:
+        _context7_cache("context7_docs").set(docs_key, docs)
+    return docs
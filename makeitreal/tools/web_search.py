@@ -1,23 +1,167 @@
 """Web search tools for market research and competitor analysis."""
 
 import asyncio
+import codecs
+import contextlib
+import functools
+import json
 import re
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
 
 import aiohttp
 from bs4 import BeautifulSoup
 from ddgs import DDGS
 from langchain_core.tools import tool
 
+from makeitreal.cache import SqliteCache
+from makeitreal.config import cache_settings, tool_settings
 
-async def _ddg_search(query: str) -> str:
-    """Search for relevant technologies for a suitable tech stack
-    and return result URLs"""
+try:
+    from lxml import etree
+
+    # Raised when closing an lxml parser that was fed no text at all
+    _PARSE_ERRORS: tuple[type[Exception], ...] = (etree.ParseError,)
+except ImportError:  # lxml is optional, the stdlib parser is used otherwise
+    etree = None
+    _PARSE_ERRORS = ()
+
+# Bounded pool running the blocking search client and HTML parsing off the event loop
+_executor = ThreadPoolExecutor(
+    max_workers=tool_settings.web_search_workers, thread_name_prefix="web_search"
+)
+
+MAX_TEXT_LENGTH = 2000
+_SKIPPED_TAGS = {"script", "style", "nav", "footer", "header", "aside"}
+_CHUNK_SIZE = 16 * 1024
+
+
+@functools.cache
+def _web_cache(namespace: str) -> SqliteCache:
+    """On-disk cache of search results (``web_search``) and page texts (``web_pages``)."""
+    return SqliteCache(
+        cache_settings.cache_path,
+        namespace=namespace,
+        max_entries=cache_settings.web_cache_max_entries,
+        ttl=cache_settings.web_cache_ttl,
+    )
+
+
+def _ddg_search_sync(query: str) -> list[str]:
     with DDGS() as ddgs:
         return [r["href"] for r in list(ddgs.text(query, max_results=1))]
 
 
+async def _ddg_search(query: str) -> list[str]:
+    """Search for relevant technologies for a suitable tech stack
+    and return result URLs"""
+    key = " ".join(query.lower().split())
+    if cache_settings.cache_enabled and (entry := _web_cache("web_search").get(key)):
+        return json.loads(entry.value)
+
+    urls = await asyncio.get_running_loop().run_in_executor(_executor, _ddg_search_sync, query)
+    if cache_settings.cache_enabled and urls:
+        _web_cache("web_search").set(key, json.dumps(urls))
+    return urls
+
+
+class _TextExtractor:
+    """Parser target collecting visible text until enough of it has been found."""
+
+    def __init__(self, limit: int = MAX_TEXT_LENGTH) -> None:
+        self.limit = limit
+        self._parts: list[str] = []
+        self._length = 0
+        self._skip_depth = 0
+
+    @property
+    def done(self) -> bool:
+        """Whether enough text has been collected to stop parsing."""
+        return self._length >= self.limit
+
+    @property
+    def text(self) -> str:
+        text = re.sub(r"\s+", " ", "".join(self._parts)).strip()
+        return text[: self.limit]
+
+    def start(self, tag: str, attrs) -> None:
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+
+    def end(self, tag: str) -> None:
+        if tag in _SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def data(self, data: str) -> None:
+        if not self._skip_depth and not self.done:
+            self._parts.append(data)
+            self._length += len(re.sub(r"\s+", " ", data))
+
+    def close(self) -> str:
+        return self.text
+
+
+class _StdlibHTMLParser(HTMLParser):
+    """Incremental stdlib HTML parser feeding a ``_TextExtractor``."""
+
+    def __init__(self, target: _TextExtractor) -> None:
+        super().__init__()
+        self._target = target
+
+    def handle_starttag(self, tag, attrs):
+        self._target.start(tag, attrs)
+
+    def handle_endtag(self, tag):
+        self._target.end(tag)
+
+    def handle_data(self, data):
+        self._target.data(data)
+
+
+def _incremental_parser(target: _TextExtractor):
+    """Create an incremental HTML parser, preferring lxml when it is installed."""
+    if etree is not None:
+        return etree.HTMLParser(target=target)
+    return _StdlibHTMLParser(target)
+
+
+def _close_parser(parser, tail: str) -> None:
+    """Feed the decoder's remaining text and flush the text buffered by the parser."""
+    if tail:
+        parser.feed(tail)
+    with contextlib.suppress(*_PARSE_ERRORS):
+        parser.close()
+
+
+async def _extract_text_streaming(response: aiohttp.ClientResponse) -> str:
+    """Parse the response body in chunks until enough visible text has been collected.
+
+    Downloading stops early once ``MAX_TEXT_LENGTH`` characters of text were found or
+    ``tool_settings.web_fetch_max_bytes`` were read, whichever comes first.
+    """
+    loop = asyncio.get_running_loop()
+    extractor = _TextExtractor()
+    parser = _incremental_parser(extractor)
+    decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(errors="replace")
+    received = 0
+
+    async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+        received += len(chunk)
+        await loop.run_in_executor(_executor, parser.feed, decoder.decode(chunk))
+        if extractor.done or received >= tool_settings.web_fetch_max_bytes:
+            break
+
+    # Unterminated elements and trailing text are only reported when the parser is closed
+    await loop.run_in_executor(_executor, _close_parser, parser, decoder.decode(b"", final=True))
+    return extractor.text
+
+
 async def _fetch_url_content(session: aiohttp.ClientSession, url: str) -> str | None:
-    """Fetch content from a URL."""
+    """Fetch the text content of a URL.
+
+    Texts are cached per URL. Expired entries are revalidated with their
+    ETag/Last-Modified validators, so unchanged pages are not downloaded again.
+    """
     headers = {
         "User-Agent": (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
@@ -25,10 +169,41 @@ async def _fetch_url_content(session: aiohttp.ClientSession, url: str) -> str |
         )
     }
 
+    cache = _web_cache("web_pages") if cache_settings.cache_enabled else None
+    entry = cache.get(url, include_stale=True) if cache is not None else None
+    cached = json.loads(entry.value) if entry else None
+    if entry and not entry.expired:
+        return cached["text"]
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
     try:
         async with session.get(url, headers=headers, timeout=10) as response:
+            if response.status == 304 and cached:
+                cache.set(url, entry.value)
+                return cached["text"]
             if response.status == 200:
-                return await response.text()
+                if tool_settings.web_fetch_streaming:
+                    text = await _extract_text_streaming(response)
+                else:
+                    html = await response.text()
+                    text = await asyncio.get_running_loop().run_in_executor(
+                        _executor, _clean_html, html
+                    )
+                if cache is not None:
+                    cache.set(
+                        url,
+                        json.dumps(
+                            {
+                                "text": text,
+                                "etag": response.headers.get("ETag"),
+                                "last_modified": response.headers.get("Last-Modified"),
+                            }
+                        ),
+                    )
+                return text
     except Exception:
         pass
     return None
@@ -39,7 +214,7 @@ def _clean_html(html: str) -> str:
     if not html:
         return ""
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml" if etree is not None else "html.parser")
 
     # Remove unwanted elements
     for element in soup(["script", "style", "nav", "footer", "header", "aside"]):
@@ -53,7 +228,7 @@ def _clean_html(html: str) -> str:
     text = text.strip()
 
     # Limit length
-    return text[:2000] if len(text) > 2000 else text
+    return text[:MAX_TEXT_LENGTH]
 
 
 async def _fetch_urls_parallel(urls: list[str]) -> list[str]:
@@ -61,7 +236,7 @@ async def _fetch_urls_parallel(urls: list[str]) -> list[str]:
     async with aiohttp.ClientSession() as session:
         tasks = [_fetch_url_content(session, url) for url in urls]
         contents = await asyncio.gather(*tasks)
-        return [_clean_html(content) for content in contents if content]
+        return [content for content in contents if content]
 
 
 @tool
@@ -0,0 +1,60 @@
+"""Shared pytest configuration and workflow stubs."""
+
+import asyncio
+import os
+from collections import Counter
+
+import pytest
+
+from makeitreal.graph.workflow import IdeationWorkflow
+from makeitreal.state_store import StateStore
+
+# Offline tests never reach the API, but the settings require a key to be present.
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+
+class StubGenerator:
+    """Proposes one item per generation of a stage, failing for ideas containing "fail"."""
+
+    running = 0
+    max_running = 0
+
+    def __init__(self, key: str) -> None:
+        self.name = f"generator stub for {key}"
+        self.key = key
+        self.generations = Counter()
+        self.saved_output_tokens = 0
+
+    @property
+    def calls(self) -> int:
+        return self.generations.total()
+
+    async def process(self, state, on_item=None) -> dict:
+        idea = state["idea"].content
+        if "fail" in idea:
+            raise RuntimeError(f"cannot process {idea}")
+        self.generations[idea] += 1
+        StubGenerator.running += 1
+        StubGenerator.max_running = max(StubGenerator.max_running, StubGenerator.running)
+        await asyncio.sleep(0.01)
+        StubGenerator.running -= 1
+        return {"items": [f"{self.key} v{self.generations[idea]} of {idea}"]}
+
+
+class ApprovingReviewer:
+    name = "review stub"
+
+    async def process(self, state) -> dict:
+        return {"changes": "", "approved": True}
+
+
+@pytest.fixture
+async def workflow(tmp_path):
+    """Workflow with stub agents, whose agent reviews approve every proposal."""
+    StubGenerator.running = StubGenerator.max_running = 0
+    workflow = IdeationWorkflow(
+        use_cache=False, agent_factory=lambda key, cache: (StubGenerator(key), ApprovingReviewer())
+    )
+    workflow.state_store = StateStore(str(tmp_path / "threads"))
+    await workflow.ainit(connect=False)
+    return workflow
@@ -0,0 +1,72 @@
+"""Tests for batch processing."""
+
+import json
+
+import pytest
+from langgraph.types import Command
+
+from makeitreal.batch import BatchItem, read_ideas, run_batch
+
+
+def test_read_ideas_accepts_objects_and_strings():
+    items = read_ideas(['{"id": "todo", "idea": "task app"}\n', "\n", '"chat app"\n'])
+
+    assert [(i.thread_id, i.idea) for i in items][0] == ("todo", "task app")
+    assert items[1].idea == "chat app"
+    assert items[1].thread_id != items[0].thread_id
+
+
+def test_read_ideas_rejects_lines_without_idea():
+    with pytest.raises(ValueError, match="Line 2"):
+        read_ideas(['"chat app"', '{"id": "empty"}'])
+
+
+def _max_running(workflow) -> int:
+    return type(workflow.generators["features"]).max_running
+
+
+async def test_auto_review_completes_all_ideas_and_writes_result_files(workflow, tmp_path):
+    items = [BatchItem(f"idea/{i}", f"app {i}") for i in range(3)]
+
+    results = await run_batch(workflow, items, str(tmp_path / "out"), concurrency=2)
+
+    assert [r["status"] for r in results] == ["completed"] * 3
+    assert results[0]["tasks"] == ["tasks v1 of app 0"]
+    # Thread ids are sanitized into file names
+    with open(tmp_path / "out" / "idea_1.json") as f:
+        assert json.load(f) == results[1]
+    assert _max_running(workflow) <= 2
+
+
+async def test_concurrency_caps_the_ideas_in_progress(workflow, tmp_path):
+    items = [BatchItem(f"t{i}", f"app {i}") for i in range(6)]
+
+    await run_batch(workflow, items, str(tmp_path), concurrency=1)
+
+    assert _max_running(workflow) == 1
+
+
+async def test_queue_review_stops_at_the_first_human_review(workflow, tmp_path):
+    (result,) = await run_batch(workflow, [BatchItem("t", "app")], str(tmp_path), review="queue")
+
+    assert result["status"] == "pending_review"
+    assert result["pending_review"] == "features"
+    assert result["features"] == ["features v1 of app"]
+
+    # The queued idea continues from its checkpoint
+    state = await workflow.resume("t")
+    assert state["__interrupt__"][0].value["key"] == "features"
+    state = await workflow.invoke(Command(resume=""), "t")
+    assert state["__interrupt__"][0].value["key"] == "tech_stack"
+
+
+async def test_failed_ideas_are_reported_without_stopping_the_batch(workflow, tmp_path):
+    items = [BatchItem("ok", "app"), BatchItem("bad", "fail app")]
+
+    ok, failed = await run_batch(workflow, items, str(tmp_path))
+
+    assert ok["status"] == "completed"
+    assert failed["status"] == "failed"
+    assert "cannot process fail app" in failed["error"]
+    with open(tmp_path / "bad.json") as f:
+        assert json.load(f)["status"] == "failed"
@@ -0,0 +1,37 @@
+"""Tests for the offline benchmark harness."""
+
+from dataclasses import replace
+
+from makeitreal.benchmark.harness import SCENARIOS, record_result, run_scenario
+from makeitreal.config import cache_settings, tool_settings
+
+
+async def test_review_loop_runs_as_scripted():
+    mcp_url = tool_settings.context7_mcp_url
+
+    result = await run_scenario(SCENARIOS["review-loop"], runs=2, concurrency=2)
+
+    # Two rounds (agent approval, human rejection) of three generations per stage and run
+    assert result.nodes["features/generator"]["count"] == 12
+    assert result.nodes["tasks/review"]["count"] == 12
+    # Each tech stack generation looks up one library: resolve the id and fetch the docs
+    assert result.mcp_requests == 2 * 6 * 2
+    assert result.tool_calls == 2 * 6 * 2
+    assert result.checkpoints > 0 and result.checkpoint_bytes > 0
+    assert result.peak_memory > 0
+    assert len(result.run_times) == 2 and result.throughput > 0
+    assert tool_settings.context7_mcp_url == mcp_url
+    assert cache_settings.cache_enabled
+
+
+async def test_results_are_compared_with_the_previous_record(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    scenario = replace(SCENARIOS["single-pass"], items=2)
+    result = await run_scenario(scenario, runs=1, concurrency=1, measure_memory=False)
+
+    assert record_result(result, path) is None
+    previous = record_result(result, path)
+
+    assert previous["scenario"]["items"] == 2
+    assert previous["metrics"]["llm_requests"] == 7
+    assert record_result(await run_scenario(scenario, runs=2, measure_memory=False), path) is None
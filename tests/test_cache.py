@@ -0,0 +1,55 @@
+"""Tests for the persistent caches."""
+
+import time
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from makeitreal.agents.requirements_generator_agent import ProposalResult
+from makeitreal.agents.requirements_review_agent import ReviewResult
+from makeitreal.cache import ResponseCache, SqliteCache
+
+
+def test_sqlite_cache_expires_entries():
+    cache = SqliteCache(":memory:", namespace="test", ttl=0.01)
+    cache.set("key", "value")
+    assert cache.get("key").value == "value"
+
+    time.sleep(0.02)
+    assert cache.get("key") is None
+    assert cache.get("key", include_stale=True).value == "value"
+
+
+def test_sqlite_cache_evicts_least_recently_used():
+    cache = SqliteCache(":memory:", namespace="test", max_entries=2)
+    cache.set("a", "1")
+    time.sleep(0.001)
+    cache.set("b", "2")
+    time.sleep(0.001)
+    cache.get("a")
+    time.sleep(0.001)
+    cache.set("c", "3")
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a").value == "1"
+
+
+def test_response_cache_key_depends_on_prompt_model_and_schema():
+    messages = [SystemMessage(content="system"), HumanMessage(content="idea")]
+    key = ResponseCache.key(messages, "model-a", ProposalResult)
+
+    assert key == ResponseCache.key(messages, "model-a", ProposalResult)
+    assert key != ResponseCache.key(messages, "model-b", ProposalResult)
+    assert key != ResponseCache.key(messages, "model-a", ReviewResult)
+    assert key != ResponseCache.key(messages[:1], "model-a", ProposalResult)
+
+
+def test_response_cache_counts_hits_and_misses_per_agent():
+    cache = ResponseCache(SqliteCache(":memory:", namespace="llm_responses"))
+    assert cache.get("Generator", "key") is None
+    cache.set("key", '{"items": []}')
+    assert cache.get("Generator", "key") == '{"items": []}'
+
+    assert cache.stats["Generator"].hits == 1
+    assert cache.stats["Generator"].misses == 1
+    assert "Reviewer" not in cache.stats
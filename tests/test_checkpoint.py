@@ -0,0 +1,68 @@
+"""Tests for the checkpointer backends."""
+
+from typing import TypedDict
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+
+from makeitreal.checkpoint import compact_checkpoints, open_checkpointer
+from makeitreal.config import checkpoint_settings
+
+
+class CounterState(TypedDict):
+    count: int
+
+
+def _counter_graph(checkpointer):
+    graph = StateGraph(CounterState)
+    graph.add_node("increment", lambda state: {"count": state["count"] + 1})
+    graph.add_edge(START, "increment")
+    graph.add_edge("increment", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+async def test_compaction_keeps_latest_checkpoints_per_thread(tmp_path):
+    async with open_checkpointer("sqlite", str(tmp_path / "checkpoints.sqlite")) as saver:
+        graph = _counter_graph(saver)
+        config = {"configurable": {"thread_id": "thread"}}
+        for _ in range(3):
+            await graph.ainvoke({"count": 0}, config)
+
+        assert len([c async for c in saver.alist(config)]) > 2
+        deleted = await compact_checkpoints(saver, keep_last=2, max_age_days=None)
+
+        assert deleted > 0
+        assert len([c async for c in saver.alist(config)]) == 2
+        assert (await graph.aget_state(config)).values == {"count": 1}
+
+
+async def test_compaction_removes_expired_threads(tmp_path):
+    async with open_checkpointer("sqlite", str(tmp_path / "checkpoints.sqlite")) as saver:
+        graph = _counter_graph(saver)
+        config = {"configurable": {"thread_id": "thread"}}
+        await graph.ainvoke({"count": 0}, config)
+
+        await compact_checkpoints(saver, max_age_days=-1)
+
+        assert [c async for c in saver.alist(config)] == []
+
+
+async def test_explicit_arguments_override_the_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint_settings, "checkpoint_max_age_days", -1)
+    async with open_checkpointer("sqlite", str(tmp_path / "checkpoints.sqlite")) as saver:
+        graph = _counter_graph(saver)
+        config = {"configurable": {"thread_id": "thread"}}
+        await graph.ainvoke({"count": 0}, config)
+
+        # None keeps expired threads despite the settings
+        await compact_checkpoints(saver, max_age_days=None)
+        assert [c async for c in saver.alist(config)] != []
+
+        await compact_checkpoints(saver, keep_last=0, max_age_days=None)
+        assert [c async for c in saver.alist(config)] == []
+
+
+async def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        async with open_checkpointer("redis"):
+            pass
@@ -0,0 +1,128 @@
+"""Tests for streaming the generator agents' proposed items."""
+
+import json
+
+import httpx
+import openai
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from makeitreal.agents.requirements_generator_agent import (
+    ProposalResult,
+    RequirementsGeneratorAgent,
+)
+from makeitreal.state import Proposal
+
+ITEMS = ["Login", "Sign up", "Dashboard"]
+ARGUMENTS = json.dumps({"items": ITEMS})
+
+
+class FakeToolCallingModel(BaseChatModel):
+    """Streams the function-calling arguments of a ``ProposalResult`` in small chunks."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-tool-calling"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(**kwargs)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        tool_call = {"name": "ProposalResult", "args": json.loads(ARGUMENTS), "id": "call_0"}
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content="", tool_calls=[tool_call]))]
+        )
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        for start in range(0, len(ARGUMENTS), 4):
+            chunk = {"args": ARGUMENTS[start : start + 4], "index": 0, "name": None, "id": None}
+            if start == 0:
+                chunk |= {"name": "ProposalResult", "id": "call_0"}
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[chunk]))
+
+
+def _agent() -> RequirementsGeneratorAgent:
+    agent = RequirementsGeneratorAgent()
+    agent._llm = FakeToolCallingModel().with_structured_output(ProposalResult)
+    return agent
+
+
+def _state() -> dict:
+    return {"idea": "task management app", "features": Proposal()}
+
+
+async def test_items_are_emitted_once_each_and_in_order():
+    streamed = []
+
+    result = await _agent().process(_state(), lambda index, item: streamed.append((index, item)))
+
+    assert result == {"items": ITEMS}
+    assert streamed == list(enumerate(ITEMS))
+
+
+async def test_items_are_emitted_before_the_response_completes(monkeypatch):
+    agent = _agent()
+    streamed = []
+    items_before_completion = []
+
+    original = agent._astream_llm
+
+    async def record_partials(llm, prompt_value, on_partial):
+        def recording(partial):
+            on_partial(partial)
+            items_before_completion.append(len(streamed))
+
+        return await original(llm, prompt_value, recording)
+
+    monkeypatch.setattr(agent, "_astream_llm", record_partials)
+
+    await agent.process(_state(), lambda index, item: streamed.append(item))
+
+    assert 0 < items_before_completion[-1] < len(ITEMS)
+
+
+class NonStreamingModel(FakeToolCallingModel):
+    """Answers streamed requests with the complete response, like models without streaming."""
+
+    _astream = BaseChatModel._astream
+
+
+class InterruptedStreamModel(FakeToolCallingModel):
+    """Fails after streaming part of the items, the repeated request proposes others."""
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        tool_call = {"name": "ProposalResult", "args": {"items": ["Profile"]}, "id": "call_0"}
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content="", tool_calls=[tool_call]))]
+        )
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        arguments = ""
+        async for chunk in super()._astream(messages, stop, run_manager, **kwargs):
+            yield chunk
+            arguments += chunk.message.tool_call_chunks[0]["args"]
+            if "Dashboard" in arguments:
+                raise openai.APITimeoutError(request=httpx.Request("POST", "https://api"))
+
+
+async def test_models_without_streaming_fall_back_to_a_request():
+    agent = RequirementsGeneratorAgent()
+    agent._llm = NonStreamingModel().with_structured_output(ProposalResult)
+    streamed = []
+
+    result = await agent.process(_state(), lambda index, item: streamed.append((index, item)))
+
+    assert result == {"items": ITEMS}
+    assert streamed == list(enumerate(ITEMS))
+
+
+async def test_items_of_a_repeated_stream_replace_the_streamed_ones():
+    agent = RequirementsGeneratorAgent()
+    agent._llm = InterruptedStreamModel().with_structured_output(ProposalResult)
+    streamed = []
+
+    result = await agent.process(_state(), lambda index, item: streamed.append((index, item)))
+
+    assert result == {"items": ["Profile"]}
+    assert streamed == [(0, "Login"), (1, "Sign up"), (0, "Profile")]
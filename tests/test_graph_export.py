@@ -0,0 +1,50 @@
+"""Tests for the offline workflow graph export."""
+
+import json
+
+import pytest
+
+from makeitreal.graph.export import build_offline_graph, export_graph
+
+
+@pytest.fixture
+async def graph():
+    return await build_offline_graph()
+
+
+async def test_sub_graphs_are_inlined(graph):
+    data = json.loads(export_graph(graph, "json"))
+
+    node_ids = {node["id"] for node in data["nodes"]}
+    assert {"task_creation:human_review", "requirement_analysis:review_agent"} <= node_ids
+    # Approvals and escalations share their target but are drawn as separate routes
+    review_routes = [
+        edge
+        for edge in data["edges"]
+        if edge["source"] == "techstack_discovery:review_agent"
+        and edge["target"] == "techstack_discovery:human_review"
+    ]
+    assert [edge["label"] for edge in review_routes] == ["approved", "escalate"]
+    assert all(edge["conditional"] for edge in review_routes)
+
+
+async def test_stages_are_single_nodes_without_xray(graph):
+    data = json.loads(export_graph(graph, "json", xray=False))
+
+    assert [node["id"] for node in data["nodes"]] == [
+        "__start__",
+        "requirement_analysis",
+        "techstack_discovery",
+        "task_creation",
+        "log_tasks",
+        "__end__",
+    ]
+
+
+async def test_mermaid_and_dot(graph):
+    assert "subgraph task_creation" in export_graph(graph, "mermaid")
+    dot = export_graph(graph, "dot")
+    assert dot.startswith("digraph workflow {")
+    assert '"log_tasks" -> "__end__";' in dot
+    with pytest.raises(ValueError):
+        export_graph(graph, "svg")
@@ -0,0 +1,73 @@
+"""Tests for the message history retention policy."""
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from makeitreal.history import SUMMARY_MESSAGE_ID, add_messages_bounded, trim_history
+from makeitreal.rate_limit import estimate_tokens
+
+
+def _turns(count: int, length: int = 10) -> list:
+    return [AIMessage(content=f"{i:03d}" + "x" * length, id=f"m{i}") for i in range(1, count + 1)]
+
+
+def test_short_history_is_kept():
+    messages = [HumanMessage(content="idea", id="m0"), *_turns(3)]
+
+    assert trim_history(messages, max_messages=10) == messages
+
+
+def test_old_messages_are_summarized_and_the_idea_is_kept():
+    messages = [HumanMessage(content="idea", id="m0"), *_turns(30)]
+
+    trimmed = trim_history(messages, max_messages=10)
+
+    assert len(trimmed) == 10
+    assert trimmed[0].content == "idea"
+    assert trimmed[1].id == SUMMARY_MESSAGE_ID
+    assert "ai: 001" in trimmed[1].content
+    assert [m.id for m in trimmed[2:]] == [f"m{i}" for i in range(23, 31)]
+
+
+def test_summary_is_extended_by_later_trims():
+    messages = trim_history([HumanMessage(content="idea"), *_turns(10)], max_messages=5)
+
+    trimmed = trim_history([*messages, *_turns(12)[10:]], max_messages=5)
+
+    assert trimmed[1].content.count("ai: ") == 9
+    assert len(trimmed) == 5
+
+
+def test_token_budget_bounds_kept_messages_and_summary():
+    messages = [HumanMessage(content="idea"), *_turns(50, length=400)]
+
+    trimmed = trim_history(messages, max_messages=100, max_tokens=1000)
+
+    assert estimate_tokens(trimmed) <= 1000
+    assert trimmed[-1].id == "m50"
+
+
+def test_reducer_applies_the_configured_policy(monkeypatch):
+    monkeypatch.setattr("makeitreal.history.history_settings.history_max_messages", 4)
+    monkeypatch.setattr("makeitreal.history.history_settings.history_max_tokens", None)
+    messages = [HumanMessage(content="idea")]
+
+    for message in _turns(10):
+        messages = add_messages_bounded(messages, [message])
+
+    assert len(messages) == 4
+    assert messages[-1].id == "m10"
+
+
+def test_summarized_update_replaces_the_folded_messages(monkeypatch):
+    monkeypatch.setattr("makeitreal.history.history_settings.history_max_messages", 4)
+    monkeypatch.setattr("makeitreal.history.history_settings.history_max_tokens", None)
+    parent = [HumanMessage(content="idea", id="m0"), *_turns(2)]
+    # A sub graph returns its whole, already bounded history
+    subgraph = parent
+    for message in _turns(6)[2:]:
+        subgraph = add_messages_bounded(subgraph, [message])
+
+    messages = add_messages_bounded(parent, subgraph)
+
+    assert messages == subgraph
+    assert messages[1].content.count("ai: 001") == 1
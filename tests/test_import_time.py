@@ -0,0 +1,55 @@
+"""Guards against slow CLI startup caused by eager imports."""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Packages only the commands running the workflow or its tools may import
+HEAVY_PACKAGES = {
+    "aiohttp",
+    "bs4",
+    "ddgs",
+    "deepeval",
+    "httpx",
+    "langchain_core",
+    "langchain_openai",
+    "langgraph",
+    "openai",
+}
+# Generous budget for a cold import of the CLI, best of three runs
+IMPORT_TIME_BUDGET = 1.5
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    env = {k: v for k, v in os.environ.items() if k != "OPENAI_API_KEY"}
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True
+    )
+
+
+def test_cli_modules_do_not_import_heavy_packages():
+    result = _run(
+        "import json, sys\n"
+        "import makeitreal.cli, makeitreal.sub_commands, makeitreal.graph, makeitreal.tools\n"
+        "print(json.dumps(sorted({m.split('.')[0] for m in sys.modules})))"
+    )
+
+    assert HEAVY_PACKAGES.isdisjoint(json.loads(result.stdout))
+
+
+def test_help_works_without_api_key():
+    result = _run("from makeitreal.cli import app; app(['--help'])")
+
+    assert "Transform ideas" in result.stdout
+
+
+def test_cli_import_time_stays_within_budget():
+    durations = []
+    for _ in range(3):
+        started = time.perf_counter()
+        _run("import makeitreal.cli")
+        durations.append(time.perf_counter() - started)
+
+    assert min(durations) < IMPORT_TIME_BUDGET
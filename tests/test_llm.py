@@ -0,0 +1,123 @@
+"""Tests for the shared, pooled chat client registry."""
+
+import json
+
+import httpx
+import pytest
+
+from makeitreal import config
+from makeitreal.agents.requirements_generator_agent import RequirementsGeneratorAgent
+from makeitreal.agents.requirements_review_agent import ReviewResult
+from makeitreal.llm import ChatClientRegistry, chat_clients
+
+
+def _completion(arguments: dict) -> dict:
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4.1-nano",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "tool_calls",
+                "message": {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [
+                        {
+                            "id": "call_1",
+                            "type": "function",
+                            "function": {
+                                "name": "ReviewResult",
+                                "arguments": json.dumps(arguments),
+                            },
+                        }
+                    ],
+                },
+            }
+        ],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    }
+
+
+def _chat_model(runnable):
+    """The chat model of a structured output runnable with retry policy."""
+    return runnable.bound.first.bound
+
+
+@pytest.fixture
+async def registry():
+    registry = ChatClientRegistry()
+    yield registry
+    await registry.aclose()
+
+
+async def test_models_and_agents_share_one_connection_pool(registry):
+    http_client = registry.http_client()
+
+    assert registry.chat_model("gpt-4.1").http_async_client is http_client
+    assert registry.chat_model("gpt-4.1-nano").http_async_client is http_client
+    assert registry.chat_model("gpt-4.1") is registry.chat_model("gpt-4.1")
+    assert _chat_model(registry.structured(ReviewResult, "gpt-4.1")) is registry.chat_model(
+        "gpt-4.1"
+    )
+
+
+async def test_transient_errors_are_retried(registry, monkeypatch):
+    monkeypatch.setattr(config.openai_settings, "openai_backoff_initial", 0.01)
+    monkeypatch.setattr(config.openai_settings, "openai_backoff_max", 0.01)
+    statuses = [503, 429, 200]
+    requests = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        status = statuses.pop(0)
+        if status != 200:
+            return httpx.Response(status, json={"error": {"message": "try again"}})
+        return httpx.Response(200, json=_completion({"changes": "", "approved": True}))
+
+    registry._http_client = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+
+    result = await registry.structured(ReviewResult).ainvoke("Review the features")
+
+    assert result == ReviewResult(changes="", approved=True)
+    assert len(requests) == 3
+
+
+async def test_http2_falls_back_to_http1_without_h2(registry, monkeypatch):
+    monkeypatch.setattr(config.openai_settings, "openai_http2", True)
+    monkeypatch.setattr("makeitreal.llm.importlib.util.find_spec", lambda name: None)
+    created = []
+
+    class RecordingClient(httpx.AsyncClient):
+        def __init__(self, **kwargs) -> None:
+            created.append(kwargs)
+            super().__init__(**kwargs)
+
+    monkeypatch.setattr("makeitreal.llm.httpx.AsyncClient", RecordingClient)
+
+    registry.http_client()
+
+    assert created[0]["http2"] is False
+
+
+async def test_agents_get_new_clients_after_the_pool_is_closed():
+    agent = RequirementsGeneratorAgent()
+    llm = agent._llm
+    assert agent._llm is llm
+
+    await chat_clients.aclose()
+
+    assert agent._llm is not llm
+    assert _chat_model(agent._llm).http_async_client is chat_clients.http_client()
+    await chat_clients.aclose()
+
+
+async def test_assigned_runnables_survive_closing_the_pool():
+    agent = RequirementsGeneratorAgent()
+    agent._llm = scripted = object()
+
+    await chat_clients.aclose()
+
+    assert agent._llm is scripted
@@ -0,0 +1,145 @@
+"""Tests for the Context7 MCP client."""
+
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from makeitreal.tools import mcp_client
+
+
+def _sse(payload: dict) -> str:
+    return f"event: message\ndata: {json.dumps(payload)}\n\n"
+
+
+requests: list[str] = []
+
+
+async def _handle_mcp(request: web.Request) -> web.Response:
+    body = await request.json()
+    requests.append(body["params"]["name"])
+    arguments = body["params"]["arguments"]
+    await asyncio.sleep(0.01)
+    if body["params"]["name"] == "resolve-library-id":
+        text = f"- Context7-compatible library ID: /org/{arguments['libraryName']}"
+    else:
+        text = f"Docs of {arguments['context7CompatibleLibraryID']}"
+    result = {"content": [{"type": "text", "text": text}]}
+    return web.Response(
+        text=_sse({"jsonrpc": "2.0", "id": body["id"], "result": result}),
+        content_type="text/event-stream",
+    )
+
+
+@pytest.fixture
+async def mcp_server(monkeypatch, tmp_path):
+    requests.clear()
+    monkeypatch.setattr(mcp_client.cache_settings, "cache_path", str(tmp_path / "cache.sqlite"))
+    mcp_client._context7_cache.cache_clear()
+    app = web.Application()
+    app.router.add_post("/mcp", _handle_mcp)
+    async with TestServer(app) as server:
+        monkeypatch.setattr(
+            mcp_client.tool_settings, "context7_mcp_url", str(server.make_url("/mcp"))
+        )
+        yield server
+    await mcp_client.close_mcp_client()
+    mcp_client._context7_cache.cache_clear()
+
+
+async def test_concurrent_lookups_share_one_session(mcp_server):
+    libraries = ["react", "fastapi", "django", "vue"]
+
+    docs = await asyncio.gather(
+        *(mcp_client.search_library_documentation(name) for name in libraries)
+    )
+
+    assert docs == [f"Docs of /org/{name}" for name in libraries]
+    client = await mcp_client.get_mcp_client()
+    assert client is await mcp_client.get_mcp_client()
+    assert next(client._request_ids) == 2 * len(libraries) + 1
+
+
+async def test_library_ids_and_docs_are_cached(mcp_server):
+    assert await mcp_client.search_library_documentation("React") == "Docs of /org/React"
+    assert await mcp_client.search_library_documentation("react ", topic="hooks") == (
+        "Docs of /org/React"
+    )
+    assert await mcp_client.search_library_documentation("react") == "Docs of /org/React"
+
+    assert requests == ["resolve-library-id", "get-library-docs", "get-library-docs"]
+    stats = mcp_client.context7_cache_stats()
+    assert (stats["context7_ids"].hits, stats["context7_ids"].misses) == (2, 1)
+    assert (stats["context7_docs"].hits, stats["context7_docs"].misses) == (1, 2)
+
+
+async def _stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def test_sse_parser_handles_split_frames_and_multiline_data():
+    chunks = (
+        b': keep-alive\n\nevent: notification\ndata: {"method": ',
+        b'"progress"}\n\nevent: message\r\ndata: {"id": 1,\r\ndata:  "result": {}}\r\n\r\n',
+        b"data: trailing",
+    )
+
+    events = [
+        e async for e in mcp_client._iter_sse_events(mcp_client._iter_lines(_stream(*chunks)))
+    ]
+
+    assert events == [
+        ("notification", '{"method": "progress"}'),
+        ("message", '{"id": 1,\n "result": {}}'),
+        ("message", "trailing"),
+    ]
+
+
+async def test_response_is_returned_after_preceding_notifications(monkeypatch):
+    async def handle(request):
+        body = await request.json()
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await response.write(_sse({"jsonrpc": "2.0", "method": "notifications/progress"}).encode())
+        data = json.dumps({"jsonrpc": "2.0", "id": body["id"], "result": {"content": []}})
+        head, tail = data.split(", ", 1)
+        await response.write(f"data: {head},\ndata: {tail}\n\n".encode())
+        return response
+
+    app = web.Application()
+    app.router.add_post("/mcp", handle)
+    async with (
+        TestServer(app) as server,
+        mcp_client.MCPClient(base_url=str(server.make_url("/mcp"))) as client,
+    ):
+        assert await client._send_request("tools/call", {}) == {"content": []}
+
+
+async def test_connections_are_reused_after_streamed_responses():
+    connections = []
+
+    async def handle(request):
+        body = await request.json()
+        connections.append(request.transport)
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await response.write(_sse({"jsonrpc": "2.0", "id": body["id"], "result": {}}).encode())
+        # Notifications may follow the response before the stream ends
+        await asyncio.sleep(0.05)
+        await response.write(_sse({"jsonrpc": "2.0", "method": "notifications/done"}).encode())
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_post("/mcp", handle)
+    async with (
+        TestServer(app) as server,
+        mcp_client.MCPClient(base_url=str(server.make_url("/mcp"))) as client,
+    ):
+        for _ in range(3):
+            assert await client._send_request("tools/call", {}) == {}
+
+    assert len(connections) == 3 and len(set(map(id, connections))) == 1
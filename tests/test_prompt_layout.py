@@ -0,0 +1,63 @@
+"""Tests for the prefix cache friendly layout of the agent prompts."""
+
+import os
+
+from langchain_core.messages import HumanMessage
+
+from makeitreal.agents.requirements_review_agent import RequirementsReviewAgent
+from makeitreal.agents.task_generator_agent import TaskGeneratorAgent
+from makeitreal.agents.techstack_generator_agent import TechStackGeneratorAgent
+
+
+def _text(prompt_value) -> str:
+    return "\n".join(str(message.content) for message in prompt_value.to_messages())
+
+
+async def test_iterations_share_the_prompt_up_to_the_current_items():
+    agent = TaskGeneratorAgent()
+    context = {
+        "idea": "task management app",
+        "features": "1. Add tasks\n2. Share tasks",
+        "tech_stack": "1. FastAPI",
+    }
+
+    first = _text(await agent._prompt.ainvoke(context | {"items": "", "change_request": None}))
+    second = _text(
+        await agent._patch_prompt.ainvoke(
+            context | {"items": "1. Create the API", "change_request": "Add a UI task"}
+        )
+    )
+
+    prefix = os.path.commonprefix([first, second])
+    # Instructions, idea and the earlier stages come before anything that changes
+    assert prefix.startswith(agent._prompt.messages[0].content)
+    assert "2. Share tasks" in prefix and "FastAPI" in prefix
+    assert "Create the API" not in prefix
+
+
+async def test_research_results_extend_the_tool_decision_prompt():
+    agent = TechStackGeneratorAgent()
+    variables = {
+        "idea": "task management app",
+        "features": "1. Add tasks",
+        "items": "",
+        "change_request": None,
+        "research": "",
+    }
+
+    decision = _text(await agent._prompt.ainvoke(variables))
+    final = _text(await agent._prompt.ainvoke(variables | {"research": "\n\nTool results"}))
+
+    assert final.startswith(decision)
+
+
+async def test_ideas_are_rendered_as_text():
+    agent = RequirementsReviewAgent()
+    state = {"idea": HumanMessage(content="task management app")}
+
+    prompt = await agent._prompt.ainvoke({"idea": agent._idea(state), "items": "1. Add tasks"})
+
+    system, context, request = prompt.to_messages()
+    assert "Are there any use-cases missing" in system.content
+    assert "task management app" in context.content and "content=" not in context.content
+    assert "1. Add tasks" in request.content
@@ -0,0 +1,95 @@
+"""Tests for patching proposals instead of regenerating them."""
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from makeitreal.agents.requirements_generator_agent import (
+    ItemOperation,
+    ProposalPatch,
+    ProposalResult,
+    RequirementsGeneratorAgent,
+)
+from makeitreal.state import Proposal
+
+ITEMS = ["Login", "Sign up", "Dashboard"]
+TASKS = [f"Implement the REST endpoint and persistence of use-case {i}" for i in range(1, 11)]
+
+
+def _patch(*operations: tuple) -> ProposalPatch:
+    return ProposalPatch(
+        operations=[
+            ItemOperation(op=op, number=number, item=item) for op, number, item in operations
+        ]
+    )
+
+
+def test_apply_refers_to_the_original_numbers():
+    patch = _patch(("remove", 1, None), ("modify", 3, "Admin dashboard"), ("add", None, "Export"))
+
+    assert patch.apply(ITEMS) == ["Sign up", "Admin dashboard", "Export"]
+
+
+@pytest.mark.parametrize(
+    "operations",
+    [
+        [("remove", 4, None)],
+        [("modify", 2, None)],
+        [("add", None, "")],
+        [("remove", 1, None), ("modify", 1, "Login with SSO")],
+        [("remove", 1, None), ("remove", 2, None), ("remove", 3, None)],
+    ],
+)
+def test_invalid_patches_are_rejected(operations):
+    with pytest.raises(ValueError):
+        _patch(*operations).apply(ITEMS)
+
+
+def _agent(patch: ProposalPatch) -> tuple[RequirementsGeneratorAgent, list[str]]:
+    agent = RequirementsGeneratorAgent()
+    calls = []
+
+    def patch_llm(prompt_value):
+        calls.append("patch")
+        return patch
+
+    def full_llm(prompt_value):
+        calls.append("full")
+        return ProposalResult(items=["Regenerated"])
+
+    agent._patch_llm = RunnableLambda(patch_llm)
+    agent._llm = RunnableLambda(full_llm)
+    return agent, calls
+
+
+def _state(change_request: str | None, items: list[str] = ITEMS) -> dict:
+    return {
+        "idea": "task management app",
+        "features": Proposal(proposed_items=items, change_request=change_request),
+    }
+
+
+async def test_change_request_is_patched():
+    agent, calls = _agent(_patch(("add", None, "Export")))
+
+    result = await agent.process(_state("Add an export", TASKS))
+
+    assert result == {"items": TASKS + ["Export"]}
+    assert calls == ["patch"]
+    assert agent.saved_output_tokens > 0
+
+
+async def test_invalid_patch_falls_back_to_full_regeneration():
+    agent, calls = _agent(_patch(("remove", 7, None)))
+
+    result = await agent.process(_state("Remove item 7"))
+
+    assert result == {"items": ["Regenerated"]}
+    assert calls == ["patch", "full"]
+
+
+async def test_proposal_without_change_request_is_regenerated():
+    agent, calls = _agent(_patch(("add", None, "Export")))
+
+    await agent.process(_state(None))
+
+    assert calls == ["full"]
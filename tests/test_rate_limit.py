@@ -0,0 +1,105 @@
+"""Tests for the shared rate limiter of LLM requests."""
+
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+
+from makeitreal.llm import ChatClientRegistry
+from makeitreal.rate_limit import Priority, RateLimiter, request_priority
+
+
+def _rate_limit_error(retry_after: str | None = None) -> openai.RateLimitError:
+    headers = {"retry-after": retry_after} if retry_after else {}
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, request=request, headers=headers)
+    return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+async def test_interactive_requests_are_admitted_before_batch_requests():
+    limiter = RateLimiter(max_concurrency=1)
+    await limiter.acquire()
+    admitted = []
+
+    async def request(name: str, priority: Priority) -> None:
+        with request_priority(priority):
+            await limiter.acquire()
+        admitted.append(name)
+        limiter.release(0.1)
+
+    batch = asyncio.create_task(request("batch", Priority.BATCH))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(request("interactive", Priority.INTERACTIVE))
+    await asyncio.sleep(0)
+    limiter.release(0.1)
+    await asyncio.gather(batch, interactive)
+
+    assert admitted == ["interactive", "batch"]
+    assert limiter.in_flight == 0
+
+
+async def test_token_budget_delays_requests():
+    # 100 tokens per second, starting with a full bucket
+    limiter = RateLimiter(tokens_per_minute=6000)
+    assert await limiter.acquire(6000) < 0.05
+    limiter.release(0.1)
+
+    assert await limiter.acquire(10) >= 0.08
+
+
+async def test_cancelled_waiters_leave_the_queue():
+    limiter = RateLimiter(max_concurrency=1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    limiter.release(0.1)
+
+    assert await asyncio.wait_for(limiter.acquire(), 1) < 1
+
+
+def test_concurrency_adapts_additively_up_and_multiplicatively_down():
+    limiter = RateLimiter(max_concurrency=8, min_concurrency=2, latency_target=10)
+
+    limiter.in_flight = 3
+    limiter.throttle()
+    # A burst of rate limit responses counts as one signal
+    limiter.throttle()
+    assert limiter.concurrency == 4
+    assert limiter.throttled == 2
+
+    for _ in range(3):
+        limiter.release(0.5)
+    assert 4.5 < limiter.concurrency < 5
+
+    limiter._last_decrease = 0
+    limiter.in_flight = 1
+    limiter.release(30)
+    assert limiter.concurrency == pytest.approx(2.4, abs=0.1)
+
+    limiter._last_decrease = 0
+    limiter.throttle()
+    assert limiter.concurrency == 2
+
+
+async def test_rate_limit_errors_throttle_the_shared_limiter():
+    registry = ChatClientRegistry()
+    registry._rate_limiter = RateLimiter(max_concurrency=4)
+
+    with pytest.raises(openai.RateLimitError):
+        async with registry.limit(100) as throttle:
+            # Reported by the callbacks of a retried attempt and again when raised
+            error = _rate_limit_error(retry_after="0.2")
+            throttle.on_llm_error(error)
+            raise error
+
+    limiter = registry.rate_limiter
+    assert (limiter.throttled, limiter.concurrency, limiter.in_flight) == (1, 2, 0)
+    started = time.monotonic()
+    await limiter.acquire()
+    assert time.monotonic() - started >= 0.15
@@ -0,0 +1,131 @@
+"""Tests for the model routing and escalation of the review agents."""
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from makeitreal import config
+from makeitreal.agents.requirements_review_agent import (
+    RatedReviewResult,
+    RequirementsReviewAgent,
+    ReviewResult,
+)
+from makeitreal.agents.task_review_agent import TaskReviewAgent
+from makeitreal.agents.techstack_generator_agent import TechStackGeneratorAgent
+from makeitreal.state import Proposal
+from makeitreal.telemetry import telemetry
+
+
+@pytest.fixture
+def tiered(monkeypatch):
+    monkeypatch.setattr(config.openai_settings, "openai_model", "gpt-4.1")
+    monkeypatch.setattr(
+        config.openai_settings, "openai_agent_models", {"RequirementsReviewAgent": "gpt-4.1-nano"}
+    )
+    telemetry.reset()
+    telemetry.configure(True)
+    yield
+    telemetry.configure(False)
+    telemetry.reset()
+
+
+def _reviewer(verdicts: list[ReviewResult], calls: list[str], model: str) -> RunnableLambda:
+    def review(prompt):
+        calls.append(model)
+        return verdicts.pop(0)
+
+    return RunnableLambda(review)
+
+
+def test_agents_are_routed_by_their_closest_configured_class(tiered):
+    assert TaskReviewAgent().model == "gpt-4.1-nano"
+    assert RequirementsReviewAgent().model == "gpt-4.1-nano"
+    assert config.openai_settings.model_for(TechStackGeneratorAgent) == "gpt-4.1"
+
+
+def test_only_reviews_on_a_cheaper_model_report_a_confidence(tiered, monkeypatch):
+    assert RequirementsReviewAgent()._schema is RatedReviewResult
+
+    monkeypatch.setattr(config.openai_settings, "openai_agent_models", {})
+    assert RequirementsReviewAgent()._schema is ReviewResult
+
+
+def test_confidence_is_clamped_to_the_unit_interval():
+    def confidence(value):
+        return RatedReviewResult(changes="", approved=True, confidence=value).confidence
+
+    assert confidence(0.85) == 0.85
+    assert confidence(85) == 0.85
+    assert confidence(250) == 1.0
+    assert confidence(-1) == 0.0
+    assert confidence(None) is None
+
+
+async def test_reviews_without_a_confidence_escalate(tiered):
+    calls = []
+    agent = RequirementsReviewAgent()
+    agent._llm = _reviewer([RatedReviewResult(changes="", approved=True)], calls, "cheap")
+    agent._escalation_llm = _reviewer(
+        [ReviewResult(changes="Add search", approved=False)], calls, "default"
+    )
+
+    result = await agent.process({"idea": "todo app", "features": Proposal(iterations=1)})
+
+    assert calls == ["cheap", "default"] and not result["approved"]
+
+
+async def test_approvals_of_regenerated_items_are_kept(tiered):
+    calls = []
+    agent = RequirementsReviewAgent()
+    agent._llm = _reviewer(
+        [
+            RatedReviewResult(changes="Add login", approved=False, confidence=0.9),
+            RatedReviewResult(changes="", approved=True, confidence=0.9),
+        ],
+        calls,
+        "cheap",
+    )
+    proposal = Proposal(proposed_items=["Search"], iterations=1)
+
+    await agent.process({"idea": "todo app", "features": proposal})
+    proposal.proposed_items, proposal.item_change, proposal.iterations = ["Login"], 1.0, 2
+    second = await agent.process({"idea": "todo app", "features": proposal})
+
+    assert calls == ["cheap", "cheap"] and second["approved"]
+
+
+async def test_flipped_verdicts_are_repeated_with_the_default_model(tiered):
+    calls = []
+    agent = RequirementsReviewAgent()
+    agent._llm = _reviewer(
+        [
+            RatedReviewResult(changes="Add login", approved=False, confidence=0.9),
+            RatedReviewResult(changes="", approved=True, confidence=0.9),
+        ],
+        calls,
+        "cheap",
+    )
+    agent._escalation_llm = _reviewer(
+        [ReviewResult(changes="Add search", approved=False)], calls, "default"
+    )
+    proposal = Proposal(proposed_items=["Login"], iterations=1)
+
+    first = await agent.process({"idea": "todo app", "features": proposal})
+    # The generator returned the same items again
+    proposal.agent_approved, proposal.item_change, proposal.iterations = first["approved"], 0.0, 2
+    second = await agent.process({"idea": "todo app", "features": proposal})
+
+    assert calls == ["cheap", "cheap", "default"]
+    assert second["changes"] == "Add search" and not second["approved"]
+    assert [span.tier for span in telemetry.spans] == ["primary", "primary", "escalation"]
+
+
+async def test_reviews_on_the_default_model_never_escalate(tiered, monkeypatch):
+    monkeypatch.setattr(config.openai_settings, "openai_agent_models", {})
+    calls = []
+    agent = RequirementsReviewAgent()
+    agent._llm = _reviewer([ReviewResult(changes="", approved=True)], calls, "default")
+
+    result = await agent.process({"idea": "todo app", "features": Proposal(iterations=1)})
+
+    assert calls == ["default"] and result["approved"]
+    assert telemetry.spans[0].tier is None
@@ -0,0 +1,97 @@
+from makeitreal.graph.review_policy import (
+    item_set_distance,
+    review_escalation_reason,
+    review_exit_reason,
+)
+from makeitreal.state import Proposal
+
+
+def test_item_set_distance_ignores_case_whitespace_and_order():
+    assert item_set_distance(["Login", "Sign up"], ["sign  up", "login"]) == 0.0
+    assert item_set_distance(["a", "b"], ["c"]) == 1.0
+    assert item_set_distance(["a", "b", "c"], ["a", "b", "d"]) == 0.5
+
+
+def test_approval_ends_the_loop():
+    proposal = Proposal(iterations=1)
+
+    assert review_exit_reason(proposal, True, "", max_iterations=3) == "approved"
+    assert review_exit_reason(proposal, False, "Add login", max_iterations=3) is None
+
+
+def test_loop_is_bounded():
+    proposal = Proposal(iterations=3)
+
+    assert review_exit_reason(proposal, False, "Add login", max_iterations=3) == "max_iterations"
+
+
+def test_converged_items_escalate():
+    proposal = Proposal(
+        iterations=3,
+        item_change=0.05,
+        previous_item_change=0.08,
+        previous_change_request="Add login",
+    )
+
+    reason = review_exit_reason(
+        proposal, False, "Remove search", max_iterations=5, convergence_threshold=0.1
+    )
+
+    assert reason == "converged"
+
+
+def test_convergence_is_detected_with_the_default_settings():
+    # Two small patches in a row reach the last iteration of a round
+    proposal = Proposal(iterations=3, item_change=0.05, previous_item_change=0.05)
+
+    assert review_exit_reason(proposal, False, "Remove search") == "converged"
+
+    proposal.previous_item_change = 0.5
+    assert review_exit_reason(proposal, False, "Remove search") == "max_iterations"
+
+
+def test_single_small_change_does_not_converge():
+    # Patching one of ten items
+    proposal = Proposal(iterations=2, item_change=1 / 11, previous_change_request="Add login")
+
+    assert (
+        review_exit_reason(
+            proposal, False, "Add search", max_iterations=5, convergence_threshold=0.1
+        )
+        is None
+    )
+
+    proposal.item_change = 0.0
+    assert (
+        review_exit_reason(
+            proposal, False, "Add search", max_iterations=5, convergence_threshold=0.1
+        )
+        == "converged"
+    )
+
+
+def test_repeated_change_request_escalates():
+    proposal = Proposal(iterations=2, item_change=0.5, previous_change_request="Add  login")
+
+    reason = review_exit_reason(
+        proposal, False, "add login", max_iterations=5, convergence_threshold=0.1
+    )
+
+    assert reason == "repeated_change_request"
+
+
+def test_uncertain_or_flipped_reviews_escalate():
+    proposal = Proposal(iterations=2, agent_approved=False, item_change=0.0)
+
+    assert review_escalation_reason(proposal, False, 0.5, min_confidence=0.7) == "low_confidence"
+    assert review_escalation_reason(proposal, True, 0.9, min_confidence=0.7) == "verdict_flip"
+    assert review_escalation_reason(proposal, False, 0.9, min_confidence=0.7) is None
+    assert (
+        review_escalation_reason(proposal, True, 0.9, min_confidence=0.7, escalate_on_flip=False)
+        is None
+    )
+    # No previous verdict in the first iteration of a round
+    assert review_escalation_reason(Proposal(iterations=1), True, 0.9, min_confidence=0.7) is None
+    # An approval of regenerated items follows a rejection by design
+    regenerated = Proposal(iterations=2, agent_approved=False, item_change=0.2)
+    assert review_escalation_reason(regenerated, True, 0.9, min_confidence=0.7) is None
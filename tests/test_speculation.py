@@ -0,0 +1,50 @@
+import asyncio
+
+from makeitreal.graph.speculation import SpeculativeExecutor, fingerprint
+
+
+async def test_matching_speculation_is_reused():
+    executor = SpeculativeExecutor()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        return {"items": ["a"]}
+
+    executor.start("t", "tasks", fingerprint("x"), work)
+    executor.start("t", "tasks", fingerprint("x"), work)
+
+    assert await executor.take("t", "tasks", fingerprint("x")) == {"items": ["a"]}
+    assert len(calls) == 1
+    assert executor.reused == 1
+
+
+async def test_stale_speculation_is_discarded():
+    executor = SpeculativeExecutor()
+    cancelled = asyncio.Event()
+
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    executor.start("t", "tasks", fingerprint("x"), work)
+    await asyncio.sleep(0)
+
+    assert await executor.take("t", "tasks", fingerprint("y")) is None
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert executor.discarded == 1
+    assert await executor.take("t", "tasks", fingerprint("x")) is None
+
+
+async def test_failed_speculation_falls_back():
+    executor = SpeculativeExecutor()
+
+    async def work():
+        raise RuntimeError("boom")
+
+    executor.start("t", "tasks", fingerprint("x"), work)
+
+    assert await executor.take("t", "tasks", fingerprint("x")) is None
@@ -0,0 +1,56 @@
+"""Tests for the workflow state snapshot store."""
+
+import os
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from makeitreal.state import Proposal
+from makeitreal.state_store import StateStore
+
+
+def _state(tasks: list[str]) -> dict:
+    return {
+        "idea": HumanMessage(content="task management app"),
+        "features": Proposal(proposed_items=["Login"], human_approved=True),
+        "tech_stack": Proposal(proposed_items=["Python"]),
+        "tasks": Proposal(proposed_items=tasks),
+    }
+
+
+def test_unchanged_stages_are_stored_once(tmp_path):
+    store = StateStore(str(tmp_path))
+
+    assert store.save("thread/1", _state(["Set up repo"])) == 0
+    assert store.save("thread/1", _state(["Set up repo"])) == 0
+    assert store.save("thread/1", _state(["Set up repo", "Add login"])) == 1
+
+    objects = os.listdir(tmp_path / "thread_1" / "objects")
+    # idea, features and tech stack are shared by both snapshots
+    assert len(objects) == 5
+    assert store.threads() == ["thread_1"]
+
+
+def test_single_stages_and_exports_are_loaded_by_snapshot(tmp_path):
+    store = StateStore(str(tmp_path))
+    store.save("t", _state(["Set up repo"]))
+    store.save("t", _state(["Set up repo", "Add login"]))
+
+    assert store.load_stage("t", "tasks").proposed_items == ["Set up repo", "Add login"]
+    assert store.load_stage("t", "tasks", snapshot=0).proposed_items == ["Set up repo"]
+    assert store.load_stage("t", "idea") == "task management app"
+    assert store.export("t", snapshot=0) == {
+        "idea": "task management app",
+        "features": _state([])["features"].model_dump(),
+        "tech_stack": _state([])["tech_stack"].model_dump(),
+        "tasks": Proposal(proposed_items=["Set up repo"]).model_dump(),
+    }
+
+
+def test_missing_snapshots_raise_key_error(tmp_path):
+    store = StateStore(str(tmp_path))
+
+    with pytest.raises(KeyError):
+        store.export("unknown")
+    with pytest.raises(KeyError):
+        store.load_stage("unknown", "messages")
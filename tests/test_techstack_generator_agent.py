@@ -0,0 +1,62 @@
+"""Tests for the tech stack generator agent's tool execution."""
+
+import asyncio
+
+from langchain_core.tools import tool
+
+from makeitreal.agents.techstack_generator_agent import TechStackGeneratorAgent
+from makeitreal.config import tool_settings
+
+calls: list[str] = []
+running = {"now": 0, "max": 0}
+
+
+@tool
+async def slow_search(query: str) -> str:
+    """Search slowly."""
+    calls.append(query)
+    running["now"] += 1
+    running["max"] = max(running["max"], running["now"])
+    await asyncio.sleep(0.05)
+    running["now"] -= 1
+    return f"results for {query}"
+
+
+@tool
+async def hanging_search(query: str) -> str:
+    """Never return in time."""
+    await asyncio.sleep(10)
+    return "too late"
+
+
+def _agent() -> TechStackGeneratorAgent:
+    agent = TechStackGeneratorAgent()
+    agent._tools_by_name = {t.name: t for t in (slow_search, hanging_search)}
+    return agent
+
+
+async def test_tool_calls_run_once_and_concurrently():
+    calls.clear()
+    tool_calls = [
+        {"name": "slow_search", "args": {"query": f"q{i}"}, "id": f"call_{i}"} for i in range(3)
+    ]
+
+    results = await _agent()._run_tool_calls(tool_calls)
+
+    assert sorted(calls) == ["q0", "q1", "q2"]
+    assert running["max"] == 3
+    assert [r.tool_call_id for r in results] == ["call_0", "call_1", "call_2"]
+    assert results[0].content == "results for q0"
+
+
+async def test_tool_call_timeout_and_unknown_tool_are_reported(monkeypatch):
+    monkeypatch.setattr(tool_settings, "tool_timeout", 0.05)
+    tool_calls = [
+        {"name": "hanging_search", "args": {"query": "q"}, "id": "call_0"},
+        {"name": "missing", "args": {}, "id": "call_1"},
+    ]
+
+    results = await _agent()._run_tool_calls(tool_calls)
+
+    assert "timed out" in results[0].content
+    assert "unknown tool" in results[1].content
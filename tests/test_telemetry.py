@@ -0,0 +1,132 @@
+"""Tests for the workflow telemetry."""
+
+import json
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.prompt_values import StringPromptValue
+
+from makeitreal.agents.requirements_review_agent import RequirementsReviewAgent
+from makeitreal.telemetry import Telemetry, estimate_cost, telemetry
+
+
+class FakeUsageModel(BaseChatModel):
+    """Answers every request with a fixed message and token usage."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-usage"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        message = AIMessage(
+            content="ok",
+            usage_metadata={
+                "input_tokens": 1000,
+                "output_tokens": 100,
+                "total_tokens": 1100,
+                "input_token_details": {"cache_read": 400},
+            },
+            response_metadata={"model_name": "gpt-4.1-mini-2025-04-14"},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+@pytest.fixture
+def recording():
+    telemetry.reset()
+    telemetry.configure(True)
+    yield telemetry
+    telemetry.configure(False)
+    telemetry.reset()
+
+
+def test_cost_uses_longest_matching_model_prefix():
+    # gpt-4.1-mini, not gpt-4.1 prices
+    assert estimate_cost("gpt-4.1-mini-2025-04-14", 1_000_000, 0) == pytest.approx(0.40)
+    assert estimate_cost("gpt-4.1", 1_000_000, 1_000_000) == pytest.approx(10.00)
+    assert estimate_cost("gpt-4.1", 1_000_000, 0, cached_tokens=1_000_000) == pytest.approx(0.50)
+    assert estimate_cost("unknown-model", 1_000_000, 1_000_000) == 0.0
+
+
+def test_nested_spans_inherit_thread_stage_and_iteration(tmp_path):
+    trace = tmp_path / "trace.jsonl"
+    recorder = Telemetry()
+    recorder.configure(trace_path=str(trace))
+
+    with (
+        recorder.span("node", "features/generator", thread_id="t1", stage="features", iteration=2),
+        recorder.span("llm", "RequirementsGeneratorAgent") as span,
+    ):
+        span.record_usage("gpt-4.1", 100, 10)
+    with recorder.span("tool", "search"):
+        pass
+
+    llm, node, tool = recorder.spans
+    assert (llm.thread_id, llm.stage, llm.iteration) == ("t1", "features", 2)
+    assert node.duration >= llm.duration
+    assert tool.thread_id is None
+    lines = [json.loads(line) for line in trace.read_text().splitlines()]
+    assert [line["name"] for line in lines] == [
+        "RequirementsGeneratorAgent",
+        "features/generator",
+        "search",
+    ]
+    assert lines[0]["prompt_tokens"] == 100
+
+
+def test_disabled_telemetry_records_nothing():
+    recorder = Telemetry()
+
+    with recorder.span("node", "features/generator"):
+        pass
+
+    assert recorder.spans == []
+
+
+def test_failed_spans_record_the_error():
+    recorder = Telemetry()
+    recorder.configure()
+
+    with pytest.raises(TimeoutError), recorder.span("tool", "search"):
+        raise TimeoutError
+
+    assert recorder.spans[0].error == "TimeoutError"
+    assert recorder.summary()[0].errors == 1
+
+
+async def test_agent_requests_record_reported_usage_and_cost(recording):
+    agent = RequirementsReviewAgent()
+
+    await agent._ainvoke_llm(FakeUsageModel(), StringPromptValue(text="review this"))
+    await agent._ainvoke_llm(FakeUsageModel(), StringPromptValue(text="review this"))
+
+    (summary,) = recording.summary()
+    assert (summary.kind, summary.name, summary.count) == ("llm", agent.name, 2)
+    assert (summary.prompt_tokens, summary.completion_tokens) == (2000, 200)
+    assert summary.cached_tokens == 800
+    assert summary.cost == pytest.approx(2 * (600 * 0.40 + 400 * 0.10 + 100 * 1.60) / 1_000_000)
+    assert not any(span.estimated_tokens for span in recording.spans)
+
+
+def test_review_tiering_compares_with_the_default_model():
+    recorder = Telemetry()
+    recorder.configure()
+
+    with recorder.span("node", "features/review", stage="features"):
+        for tier, duration in (("primary", 1.0), ("primary", 1.0), ("escalation", 3.0)):
+            with recorder.attributes(tier=tier), recorder.span("llm", "Reviewer") as span:
+                span.record_usage("gpt-4.1-nano" if tier == "primary" else "gpt-4.1", 1000, 100)
+            span.duration = duration
+    with recorder.span("llm", "Generator", stage="features") as span:
+        span.record_usage("gpt-4.1", 1000, 100)
+
+    (summary,) = recorder.review_tiering("gpt-4.1").values()
+    assert (summary.stage, summary.reviews, summary.escalations) == ("features", 2, 1)
+    assert summary.baseline_cost == pytest.approx(2 * estimate_cost("gpt-4.1", 1000, 100))
+    assert summary.saved_cost == pytest.approx(
+        estimate_cost("gpt-4.1", 1000, 100) - 2 * estimate_cost("gpt-4.1-nano", 1000, 100)
+    )
+    # Two reviews at the escalated review's 3 seconds, instead of 1 + 1 + 3
+    assert summary.saved_time == pytest.approx(1.0)
@@ -0,0 +1,177 @@
+"""Tests for the web search tools."""
+
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from makeitreal.tools import web_search
+
+
+@pytest.fixture(autouse=True)
+def web_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(web_search.cache_settings, "cache_path", str(tmp_path / "cache.sqlite"))
+    web_search._web_cache.cache_clear()
+    yield
+    web_search._web_cache.cache_clear()
+
+
+class _SlowDDGS:
+    """Blocking stand-in for the DuckDuckGo client."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def text(self, query, max_results):
+        time.sleep(0.2)
+        return [{"href": f"https://example.com/{query}"}]
+
+
+async def _max_loop_lag(coro) -> tuple[float, object]:
+    """Run the coroutine and measure the longest event loop stall meanwhile."""
+    lag = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal lag
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag = max(lag, time.perf_counter() - started - 0.01)
+
+    beat = asyncio.create_task(heartbeat())
+    result = await coro
+    done.set()
+    await beat
+    return lag, result
+
+
+async def test_search_does_not_block_event_loop(monkeypatch):
+    monkeypatch.setattr(web_search, "DDGS", _SlowDDGS)
+
+    lag, urls = await _max_loop_lag(web_search._ddg_search("fastapi"))
+
+    assert urls == ["https://example.com/fastapi"]
+    assert lag < 0.1
+
+
+async def test_search_results_are_cached(monkeypatch):
+    monkeypatch.setattr(web_search, "DDGS", _SlowDDGS)
+    await web_search._ddg_search("FastAPI  docs")
+
+    started = time.perf_counter()
+    assert await web_search._ddg_search("fastapi docs") == ["https://example.com/FastAPI  docs"]
+    assert time.perf_counter() - started < 0.1
+
+
+async def test_concurrent_searches_overlap(monkeypatch):
+    monkeypatch.setattr(web_search, "DDGS", _SlowDDGS)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(web_search._ddg_search(q) for q in ("react", "vue", "svelte")))
+
+    assert time.perf_counter() - started < 0.5
+
+
+class _FakeContent:
+    def __init__(self, body: bytes):
+        self.body = body
+        self.read = 0
+
+    async def iter_chunked(self, size):
+        for i in range(0, len(self.body), size):
+            self.read += size
+            yield self.body[i : i + size]
+
+
+class _FakeResponse:
+    charset = "utf-8"
+
+    def __init__(self, body: bytes):
+        self.content = _FakeContent(body)
+
+
+async def test_streaming_extraction_stops_after_enough_text():
+    page = (
+        "<html><head><script>track()</script></head><body><nav>Menu</nav>"
+        + "<p>FastAPI is a modern web framework.</p>" * 20_000
+        + "</body></html>"
+    ).encode()
+    response = _FakeResponse(page)
+
+    text = await web_search._extract_text_streaming(response)
+
+    assert text.startswith("FastAPI is a modern web framework.")
+    assert "track()" not in text and "Menu" not in text
+    assert len(text) == web_search.MAX_TEXT_LENGTH
+    assert response.content.read < len(page) / 10
+
+
+async def test_streaming_extraction_enforces_download_limit(monkeypatch):
+    monkeypatch.setattr(web_search.tool_settings, "web_fetch_max_bytes", 64 * 1024)
+    page = ("<html><body><script>" + "x" * 1_000_000 + "</script></body></html>").encode()
+    response = _FakeResponse(page)
+
+    assert await web_search._extract_text_streaming(response) == ""
+    assert response.content.read <= 64 * 1024
+
+
+@pytest.mark.parametrize("use_lxml", [True, False])
+@pytest.mark.parametrize(
+    "body", [b"<p>Hello world", b"Hello world", b"<html><body><p>Hello world</p></body></html>"]
+)
+async def test_streaming_extraction_keeps_trailing_text(monkeypatch, body, use_lxml):
+    if not use_lxml:
+        monkeypatch.setattr(web_search, "etree", None)
+
+    assert await web_search._extract_text_streaming(_FakeResponse(body)) == "Hello world"
+    assert web_search._clean_html(body.decode()) == "Hello world"
+
+
+async def test_streaming_extraction_keeps_text_buffered_at_the_download_limit(monkeypatch):
+    monkeypatch.setattr(web_search.tool_settings, "web_fetch_max_bytes", 16 * 1024)
+    page = ("<p>" + "word " * 10_000).encode()
+
+    text = await web_search._extract_text_streaming(_FakeResponse(page))
+
+    assert text.startswith("word word") and len(text) > 1000
+
+
+async def test_streaming_extraction_of_empty_pages():
+    assert await web_search._extract_text_streaming(_FakeResponse(b"")) == ""
+
+
+async def test_fetched_pages_are_cached_and_revalidated(monkeypatch):
+    requests = []
+
+    async def page(request):
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(
+            text="<html><body><p>Django docs</p></body></html>",
+            content_type="text/html",
+            headers={"ETag": '"v1"'},
+        )
+
+    app = web.Application()
+    app.router.add_get("/docs", page)
+    async with TestServer(app) as server, aiohttp.ClientSession() as session:
+        url = str(server.make_url("/docs"))
+        assert await web_search._fetch_url_content(session, url) == "Django docs"
+        assert await web_search._fetch_url_content(session, url) == "Django docs"
+        assert requests == [None]
+
+        monkeypatch.setattr(web_search.cache_settings, "web_cache_ttl", -1)
+        web_search._web_cache.cache_clear()
+        web_search._web_cache("web_pages").set(
+            url, '{"text": "Django docs", "etag": "\\"v1\\"", "last_modified": null}'
+        )
+        assert await web_search._fetch_url_content(session, url) == "Django docs"
+        assert requests == [None, '"v1"']
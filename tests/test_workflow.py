@@ -0,0 +1,70 @@
+"""Tests for the human review interrupts of the workflow."""
+
+import builtins
+
+from langgraph.types import Command
+
+from makeitreal.cli import _run_idea_session
+from makeitreal.graph.speculation import SpeculativeExecutor
+from makeitreal.state import Proposal
+
+
+async def test_interrupts_carry_only_the_reviewed_proposal(workflow):
+    state = await workflow.run("task app", "t")
+
+    (interrupt,) = state["__interrupt__"]
+    assert set(interrupt.value) == {"key", "proposal", "revision"}
+    assert interrupt.value["key"] == "features"
+    assert isinstance(interrupt.value["proposal"], Proposal)
+    assert interrupt.value["proposal"].proposed_items == ["features v1 of task app"]
+    assert interrupt.value["revision"] == interrupt.value["proposal"].revision == 1
+
+
+async def test_revision_increments_on_every_regeneration(workflow):
+    await workflow.run("task app", "t")
+
+    state = await workflow.invoke(Command(resume="Add sharing"), "t")
+    interrupt = state["__interrupt__"][0].value
+    assert (interrupt["key"], interrupt["revision"]) == ("features", 2)
+    assert interrupt["proposal"].proposed_items == ["features v2 of task app"]
+
+    state = await workflow.invoke(Command(resume=""), "t")
+    interrupt = state["__interrupt__"][0].value
+    assert (interrupt["key"], interrupt["revision"]) == ("tech_stack", 1)
+
+
+async def test_cli_session_answers_the_interrupts(workflow, monkeypatch, capsys):
+    answers = iter(["n", "Add sharing", "", "y", ""])
+    monkeypatch.setattr(builtins, "input", lambda prompt="": next(answers))
+
+    await _run_idea_session(workflow, "task app", verbose=False, resume=None)
+
+    assert next(answers, None) is None
+    assert workflow.generators["features"].calls == 2
+    assert workflow.generators["tasks"].calls == 1
+    output = capsys.readouterr().out
+    assert "features:\n  1. features v2 of task app" in output
+    (thread_id,) = workflow.state_store.threads()
+    assert workflow.state_store.export(thread_id)["tasks"]["proposed_items"] == [
+        "tasks v1 of task app"
+    ]
+
+
+async def test_change_requests_discard_the_speculative_next_stage(workflow, monkeypatch):
+    workflow.speculation = SpeculativeExecutor()
+    features = workflow.generators["features"]
+    generate = features.process
+    discarded = []
+
+    async def regenerate(state, on_item=None):
+        discarded.append(workflow.speculation.discarded)
+        return await generate(state, on_item)
+
+    monkeypatch.setattr(features, "process", regenerate)
+    await workflow.run("task app", "t")
+
+    await workflow.invoke(Command(resume="Add sharing"), "t")
+
+    # Discarded before the features are regenerated, not replaced once they are reviewed
+    assert discarded == [0, 1]
+    workflow.speculation.cancel_all()